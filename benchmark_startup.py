@@ -0,0 +1,96 @@
+"""
+Startup benchmark: time from process start to the ManagerAgent's first LLM call.
+
+Each measurement runs in a fresh interpreter (so module imports are really
+paid for) that follows launch_multiagent.py: import litellm and freephdlabor,
+build the agent system, then run the manager with a probe model that records
+the time of its first generate() call and exits. Lazy (default) and eager
+(--eager-agents) agent construction are compared:
+
+    python benchmark_startup.py --repeats 5
+
+Phoenix tracing setup is left out, and litellm uses its bundled model cost map
+instead of fetching it; both cost the same in either mode.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run_child(mode: str) -> None:
+    start = time.perf_counter()
+
+    import litellm  # noqa: F401  (imported at startup by launch_multiagent.py)
+    from smolagents.models import Model
+
+    from freephdlabor.interpreters import WorkspacePythonExecutor
+    from freephdlabor.utils import initialize_agent_system
+
+    imported = time.perf_counter()
+    timings = {"imports_s": imported - start}
+
+    class FirstCallProbe(Model):
+        """Stands in for the LLM: reports the timings on the first call and exits."""
+
+        context_limit = 128000
+
+        def generate(self, messages, **kwargs):
+            timings["first_llm_call_s"] = time.perf_counter() - start
+            print(json.dumps(timings), flush=True)
+            os._exit(0)
+
+    workspace_dir = tempfile.mkdtemp(prefix="startup_benchmark_")
+    essential_imports = ["json", "os", "pathlib"]
+    manager = initialize_agent_system(
+        model=FirstCallProbe(model_id="startup-probe"),
+        workspace_dir=workspace_dir,
+        workspace_interpreter=WorkspacePythonExecutor(
+            workspace_dir=workspace_dir, additional_authorized_imports=essential_imports
+        ),
+        essential_imports=essential_imports,
+        lazy_agents=(mode == "lazy"),
+    )
+    timings["initialize_agent_system_s"] = time.perf_counter() - imported
+    manager.run("Startup benchmark task")
+    raise SystemExit("the manager finished without calling the model")
+
+
+def measure(mode: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env={**os.environ, "LITELLM_LOCAL_MODEL_COST_MAP": "True"},
+    )
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"{mode} run failed:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--child", choices=["lazy", "eager"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.child)
+        return
+
+    keys = ["imports_s", "initialize_agent_system_s", "first_llm_call_s"]
+    print(f"median of {args.repeats} runs (seconds)")
+    print(f"{'mode':>6} " + " ".join(f"{k:>26}" for k in keys))
+    for mode in ("eager", "lazy"):
+        runs = [measure(mode) for _ in range(args.repeats)]
+        print(f"{mode:>6} " + " ".join(f"{statistics.median(r[k] for r in runs):26.2f}" for k in keys))
+
+
+if __name__ == "__main__":
+    main()
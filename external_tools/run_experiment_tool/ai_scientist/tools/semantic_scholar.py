@@ -9,6 +9,18 @@ import backoff
 from ai_scientist.tools.base_tool import BaseTool
 
 
+def _literature_search():
+    """freephdlabor's cached, rate-limited search service when running under it, else None."""
+    try:
+        from freephdlabor.toolkits.literature_search import get_literature_search
+        return get_literature_search()
+    except Exception as e:
+        # missing package, or its import/cache setup failed: query the APIs directly
+        if not isinstance(e, ImportError):
+            warnings.warn(f"Literature search service unavailable, querying APIs directly: {e}")
+        return None
+
+
 def on_backoff(details: Dict) -> None:
     print(
         f"Backing off {details['wait']:0.1f} seconds after {details['tries']} tries "
@@ -58,23 +70,28 @@ class SemanticScholarSearchTool(BaseTool):
         if not query:
             return None
         
-        headers = {}
-        if self.S2_API_KEY:
-            headers["X-API-KEY"] = self.S2_API_KEY
-        
-        rsp = requests.get(
-            "https://api.semanticscholar.org/graph/v1/paper/search",
-            headers=headers,
-            params={
-                "query": query,
-                "limit": self.max_results,
-                "fields": "title,authors,venue,year,abstract,citationCount",
-            },
-        )
-        print(f"Response Status Code: {rsp.status_code}")
-        print(f"Response Content: {rsp.text[:500]}")
-        rsp.raise_for_status()
-        results = rsp.json()
+        fields = "title,authors,venue,year,abstract,citationCount"
+        service = _literature_search()
+        if service is not None:
+            results = service.search_semantic_scholar(query, limit=self.max_results, fields=fields)
+        else:
+            headers = {}
+            if self.S2_API_KEY:
+                headers["X-API-KEY"] = self.S2_API_KEY
+
+            rsp = requests.get(
+                "https://api.semanticscholar.org/graph/v1/paper/search",
+                headers=headers,
+                params={
+                    "query": query,
+                    "limit": self.max_results,
+                    "fields": fields,
+                },
+            )
+            print(f"Response Status Code: {rsp.status_code}")
+            print(f"Response Content: {rsp.text[:500]}")
+            rsp.raise_for_status()
+            results = rsp.json()
         total = results.get("total", 0)
         if total == 0:
             return None
@@ -114,23 +131,29 @@ def search_for_papers(query, result_limit=10) -> Union[None, List[Dict]]:
     if not query:
         return None
     
-    rsp = requests.get(
-        "https://api.semanticscholar.org/graph/v1/paper/search",
-        headers=headers,
-        params={
-            "query": query,
-            "limit": result_limit,
-            "fields": "title,authors,venue,year,abstract,citationStyles,citationCount",
-        },
-    )
-    print(f"Response Status Code: {rsp.status_code}")
-    print(
-        f"Response Content: {rsp.text[:500]}"
-    )  # Print the first 500 characters of the response content
-    rsp.raise_for_status()
-    results = rsp.json()
+    fields = "title,authors,venue,year,abstract,citationStyles,citationCount"
+    service = _literature_search()
+    if service is not None:
+        # cached and rate-limited, shared with the freephdlabor agents
+        results = service.search_semantic_scholar(query, limit=result_limit, fields=fields)
+    else:
+        rsp = requests.get(
+            "https://api.semanticscholar.org/graph/v1/paper/search",
+            headers=headers,
+            params={
+                "query": query,
+                "limit": result_limit,
+                "fields": fields,
+            },
+        )
+        print(f"Response Status Code: {rsp.status_code}")
+        print(
+            f"Response Content: {rsp.text[:500]}"
+        )  # Print the first 500 characters of the response content
+        rsp.raise_for_status()
+        results = rsp.json()
+        time.sleep(1.0)
     total = results["total"]
-    time.sleep(1.0)
     if not total:
         return None
 
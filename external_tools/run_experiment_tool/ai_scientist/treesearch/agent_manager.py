@@ -1,4 +1,5 @@
 from typing import List, Optional, Dict, Callable, Any, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
 import pickle
 from dataclasses import dataclass
 from enum import Enum, auto
@@ -11,7 +12,7 @@ import re
 from .backend import query, FunctionSpec
 import json
 from rich import print
-from .utils.serialize import parse_markdown_to_dict
+from .utils.serialize import parse_markdown_to_dict, sync_journal_log
 from .utils.metric import WorstMetricValue
 
 
@@ -168,6 +169,19 @@ class AgentManager:
         # Extract end_stage from config
         self.end_stage = getattr(cfg, 'end_stage', 4)
         print(f"[cyan]AgentManager configured to run stages 1-{self.end_stage}[/cyan]")
+        # Finish a main stage (seed plot aggregation, step callback) in the background
+        # while the next stage starts drafting
+        self.overlap_stage_transitions = getattr(
+            cfg.agent, "overlap_stage_transitions", False
+        )
+        self._stage_finalizer = ThreadPoolExecutor(max_workers=1)
+        # stage name -> background finalization; these journals are still being
+        # appended to, so checkpoints keep their last consistent log entry
+        self._pending_finalizations: Dict[str, Future] = {}
+        self._journal_log_entries: Dict[str, Dict[str, Any]] = {}
+        # best node of each finalized stage, frozen before its journal gets the
+        # aggregation node so later stages can read it while aggregation runs
+        self._best_implementations: Dict[str, Node] = {}
         
         # Create initial stage
         self._create_initial_stage()
@@ -263,8 +277,23 @@ Your research idea:\n\n
             / stage_name
             / "checkpoint.pkl"
         )
+        # Journals are persisted incrementally to per-stage logs; the checkpoint only
+        # records how many records of each log it is consistent with, so a journal
+        # can be rebuilt with load_journal_log(path, num_nodes).
+        for name, journal in self.journals.items():
+            finalization = self._pending_finalizations.get(name)
+            if finalization is not None and not finalization.done():
+                continue
+            journal_log = sync_journal_log(
+                journal, Path(self.cfg.log_dir) / f"stage_{name}" / "journal.jsonl"
+            )
+            self._journal_log_entries[name] = {
+                "path": str(journal_log.path),
+                "num_nodes": journal_log.num_nodes,
+            }
+        journal_logs = dict(self._journal_log_entries)
         checkpoint = {
-            "journals": self.journals,
+            "journal_logs": journal_logs,
             "stage_history": self.stage_history,
             "task_desc": self.task_desc,
             "cfg": self.cfg,
@@ -541,6 +570,8 @@ Your research idea:\n\n
 
     def _get_best_implementation(self, stage_name: str) -> Optional[Node]:
         """Get the best implementation from a completed stage"""
+        if stage_name in self._best_implementations:
+            return copy.deepcopy(self._best_implementations[stage_name])
         if stage_name not in self.journals:
             return None
         best_node = self.journals[stage_name].get_best_node()
@@ -665,9 +696,7 @@ Your research idea:\n\n
             stage_number=current_substage.stage_number + 1,
         )
 
-    def _create_next_main_stage(
-        self, current_substage: Stage, journal: Journal
-    ) -> Optional[Stage]:
+    def _create_next_main_stage(self, current_substage: Stage) -> Optional[Stage]:
         (
             main_stage_num,
             main_stage_name,
@@ -739,6 +768,8 @@ Your research idea:\n\n
                             f"[cyan]Feedback from _check_stage_completion: {main_stage_feedback}[/cyan]"
                         )
                         if main_stage_complete:
+                            # Let nodes still running under async scheduling land first
+                            agent.drain()
                             # After main stage completion, run multi-seed eval on the best node
                             if current_substage.stage_number in [1, 2, 3, 4]:
                                 best_node = self._get_best_implementation(
@@ -748,20 +779,43 @@ Your research idea:\n\n
                                     seed_nodes = agent._run_multi_seed_evaluation(
                                         best_node
                                     )
-                                    if step_callback:
-                                        step_callback(
-                                            current_substage,
-                                            self.journals[current_substage.name],
+                                    if self.overlap_stage_transitions:
+                                        self._best_implementations[
+                                            current_substage.name
+                                        ] = self._get_best_implementation(
+                                            current_substage.name
                                         )
-                                    agent._run_plot_aggregation(best_node, seed_nodes)
-                                    if step_callback:
-                                        step_callback(
+                                        finalization = self._stage_finalizer.submit(
+                                            self._finalize_main_stage,
+                                            agent,
                                             current_substage,
-                                            self.journals[current_substage.name],
+                                            best_node,
+                                            seed_nodes,
+                                            step_callback,
+                                        )
+                                        self._pending_finalizations[
+                                            current_substage.name
+                                        ] = finalization
+                                        # the finalization still uses the agent's workers
+                                        agent.cleanup_after(finalization)
+                                        print(
+                                            f"Stage {current_substage.name} multi-seed eval done, aggregating in the background."
+                                        )
+                                    else:
+                                        if step_callback:
+                                            step_callback(
+                                                current_substage,
+                                                self.journals[current_substage.name],
+                                            )
+                                        agent._run_plot_aggregation(best_node, seed_nodes)
+                                        if step_callback:
+                                            step_callback(
+                                                current_substage,
+                                                self.journals[current_substage.name],
+                                            )
+                                        print(
+                                            f"Stage {current_substage.name} multi-seed eval done."
                                         )
-                                    print(
-                                        f"Stage {current_substage.name} multi-seed eval done."
-                                    )
                                 else:
                                     logger.error(
                                         f"No best node found for {current_substage.name} during multi-seed eval, something went wrong so finishing the experiment..."
@@ -782,6 +836,7 @@ Your research idea:\n\n
                         )
 
                         if substage_complete:
+                            agent.drain()
                             # Create next sub-stage
                             next_substage = self._create_next_substage(
                                 current_substage,
@@ -807,12 +862,12 @@ Your research idea:\n\n
                                 # If no next sub-stage could be created, end this main stage
                                 current_substage = None
                             break
+            self._wait_for_stage_finalizations(block=False)
             self._save_checkpoint()
             # Main stage complete - create next main stage
             if self.current_stage:
-                next_main_stage = self._create_next_main_stage(
-                    self.stages[-1], self.journals[self.stages[-1].name]
-                )
+                # the finished stage's journal may still be finalizing; don't read it
+                next_main_stage = self._create_next_main_stage(self.stages[-1])
                 if next_main_stage:
                     # Record main stage transition
                     self.stage_history.append(
@@ -833,6 +888,32 @@ Your research idea:\n\n
                     logger.info("No more stages to run -- exiting the loop...")
                     self.current_stage = None
 
+        if self._pending_finalizations:
+            self._wait_for_stage_finalizations(block=True)
+            self._save_checkpoint()
+
+    def _finalize_main_stage(
+        self, agent, stage: Stage, best_node: Node, seed_nodes, step_callback=None
+    ) -> None:
+        """Aggregate seed results and report the final state of a main stage"""
+        agent._run_plot_aggregation(best_node, seed_nodes)
+        if step_callback:
+            step_callback(stage, self.journals[stage.name])
+        print(f"Stage {stage.name} multi-seed eval done.")
+
+    def _wait_for_stage_finalizations(self, block: bool) -> None:
+        """Collect finished background stage finalizations (all of them if block)"""
+        still_running = {}
+        for stage_name, future in self._pending_finalizations.items():
+            if not block and not future.done():
+                still_running[stage_name] = future
+                continue
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Error finalizing stage {stage_name} in the background: {e}")
+        self._pending_finalizations = still_running
+
     def _create_stage_analysis_prompt(
         self,
         previous_stages: List[Stage],
@@ -1,5 +1,6 @@
 import os
 from . import backend_anthropic, backend_openai
+from .cache import get_response_cache
 from .utils import FunctionSpec, OutputType, PromptType, compile_prompt_to_md
 
 
@@ -59,12 +60,27 @@ def query(
     else:
         model_kwargs["max_tokens"] = max_tokens
 
+    compiled_system = compile_prompt_to_md(system_message) if system_message else None
+    compiled_user = compile_prompt_to_md(user_message) if user_message else None
+
+    # Opt-in response cache (RUN_EXPERIMENT_LLM_CACHE_DIR), see backend/cache.py
+    cache = get_response_cache()
+    cache_key = None
+    if cache is not None and cache.is_cacheable(model_kwargs):
+        cache_key = cache.make_key(compiled_system, compiled_user, func_spec, model_kwargs)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     query_func = backend_anthropic.query if "claude-" in model else backend_openai.query
     output, req_time, in_tok_count, out_tok_count, info = query_func(
-        system_message=compile_prompt_to_md(system_message) if system_message else None,
-        user_message=compile_prompt_to_md(user_message) if user_message else None,
+        system_message=compiled_system,
+        user_message=compiled_user,
         func_spec=func_spec,
         **model_kwargs,
     )
 
+    if cache_key is not None:
+        cache.put(cache_key, output)
+
     return output
@@ -0,0 +1,132 @@
+"""
+Opt-in, content-addressed on-disk cache for backend.query responses.
+
+Enabled by setting RUN_EXPERIMENT_LLM_CACHE_DIR. Entries are keyed by a hash of the
+model, the compiled messages, the function spec and all sampling parameters, so only
+byte-identical requests can hit. By default ("deterministic" mode) only requests made
+at temperature 0 are cached; "replay" mode (RUN_EXPERIMENT_LLM_CACHE_MODE=replay)
+reuses responses regardless of temperature, e.g. to replay a run from a checkpoint or
+in regression tests. The cache directory is kept under RUN_EXPERIMENT_LLM_CACHE_MAX_MB
+(default 512) by evicting least recently used entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from .utils import FunctionSpec, OutputType
+
+logger = logging.getLogger("ai-scientist")
+
+CACHE_MODES = ("deterministic", "replay")
+
+
+class ResponseCache:
+    def __init__(self, cache_dir: Path | str, mode: str = "deterministic", max_mb: float = 512):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"LLM cache mode must be one of {CACHE_MODES}, got {mode!r}")
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self):
+        return self.cache_dir.glob("*/*.json")
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def is_cacheable(self, model_kwargs: dict) -> bool:
+        """Only reuse responses that a fresh call could have produced identically."""
+        return self.mode == "replay" or model_kwargs.get("temperature") == 0
+
+    @staticmethod
+    def make_key(
+        system_message,
+        user_message,
+        func_spec: FunctionSpec | None,
+        model_kwargs: dict,
+    ) -> str:
+        payload = {
+            "system_message": system_message,
+            "user_message": user_message,
+            "func_spec": func_spec.to_dict() if func_spec is not None else None,
+            "model_kwargs": model_kwargs,
+        }
+        blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> OutputType | None:
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                output = json.load(f)["output"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            self.misses += 1
+            return None
+        os.utime(path)  # mark as recently used for LRU eviction
+        self.hits += 1
+        return output
+
+    def put(self, key: str, output: OutputType) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"output": output})
+        # write atomically so concurrent workers never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._total_bytes += len(data)
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is at 90% of its budget."""
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue  # evicted by another worker
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
+        logger.info(f"LLM response cache evicted down to {total} bytes")
+
+
+_cache: ResponseCache | None = None
+_cache_config: tuple | None = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the process-wide cache configured through the environment, if enabled."""
+    global _cache, _cache_config
+    cache_dir = os.environ.get("RUN_EXPERIMENT_LLM_CACHE_DIR")
+    if not cache_dir:
+        return None
+    config = (
+        cache_dir,
+        os.environ.get("RUN_EXPERIMENT_LLM_CACHE_MODE", "deterministic"),
+        float(os.environ.get("RUN_EXPERIMENT_LLM_CACHE_MAX_MB", "512")),
+    )
+    if _cache is None or config != _cache_config:
+        _cache = ResponseCache(*config)
+        _cache_config = config
+    return _cache
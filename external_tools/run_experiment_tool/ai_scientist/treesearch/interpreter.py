@@ -4,17 +4,26 @@ Supports:
 - captures stdout and stderr
 - captures exceptions and stack traces
 - limits execution time
+- optional warm start: children are forked from a forkserver that has already
+  imported heavy modules, and the next child is pre-forked while code runs. The
+  forkserver is shared by the whole process; a closed Interpreter's pre-forked child
+  is handed to the next Interpreter started with the same settings
 """
 
 import logging
+import multiprocessing
 import os
 import queue
 import signal
 import sys
+import tempfile
+import threading
 import time
 import traceback
 from dataclasses import dataclass
 from multiprocessing import Process, Queue
+from multiprocessing.util import Finalize
+from multiprocessing.context import BaseContext
 from pathlib import Path
 
 import humanize
@@ -35,6 +44,8 @@ class ExecutionResult(DataClassJsonMixin):
     exc_type: str | None
     exc_info: dict | None = None
     exc_stack: list[tuple] | None = None
+    # time from the run request until the child was ready to execute (process start-up)
+    spawn_time: float | None = None
 
 
 def exception_summary(e, working_dir, exec_file_name, format_tb_ipython):
@@ -67,17 +78,108 @@ def exception_summary(e, working_dir, exec_file_name, format_tb_ipython):
     return tb_str, e.__class__.__name__, exc_info, exc_stack
 
 
-class RedirectQueue:
-    def __init__(self, queue):
-        self.queue = queue
+# the child writes stdout/stderr through a buffer of this size to a temp file
+OUTPUT_BUFFER_SIZE = 64 * 1024
+# the parent keeps at most this many bytes from each end of a run's output
+OUTPUT_HEAD_TAIL_BYTES = 256 * 1024
 
-    def write(self, msg):
-        self.queue.put(msg)
 
-    def flush(self):
+def read_output_file(
+    path: str, offset: int, head_tail_bytes: int = OUTPUT_HEAD_TAIL_BYTES
+) -> tuple[list[str], int]:
+    """
+    Read everything written to `path` after byte `offset` in bulk. Output longer than
+    2 * head_tail_bytes is truncated to its head and tail so a chatty script can't
+    blow up the parent's memory. Returns the output chunks and the new offset.
+    """
+    with open(path, "rb") as f:
+        end = f.seek(0, os.SEEK_END)
+        size = end - offset
+        if size <= 0:
+            return [], end
+        f.seek(offset)
+        if size <= 2 * head_tail_bytes:
+            chunks = [f.read(size).decode("utf-8", errors="replace")]
+        else:
+            head = f.read(head_tail_bytes).decode("utf-8", errors="replace")
+            f.seek(end - head_tail_bytes)
+            tail = f.read(head_tail_bytes).decode("utf-8", errors="replace")
+            truncated = size - 2 * head_tail_bytes
+            chunks = [head, f"\n ... [{truncated} bytes of output truncated] ... \n", tail]
+    return chunks, end
+
+
+def _remove_file(path: str | None) -> None:
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
         pass
 
 
+DEFAULT_PRELOAD_MODULES = ["shutup", "numpy", "torch", "matplotlib.pyplot"]
+
+
+def _get_warm_context(preload_modules: list[str]) -> BaseContext:
+    """forkserver context whose server imports `preload_modules` once when it starts."""
+    ctx = multiprocessing.get_context("forkserver")
+    # only takes effect before the forkserver is started (i.e. on first use per process)
+    ctx.set_forkserver_preload(list(preload_modules))
+    return ctx
+
+
+# standby children of closed Interpreters, by the settings they were started with
+# (Interpreter._standby_key); at most one per key, reused by the next Interpreter
+# with the same key, e.g. the one created for a worker's next task
+_parked_standbys: dict[tuple, tuple] = {}
+_parked_standbys_lock = threading.Lock()
+_parked_standbys_finalizer_pid: int | None = None
+
+
+def _kill_standby(standby) -> None:
+    process, output_path = standby[0], standby[3]
+    process.kill()
+    process.join(timeout=2)
+    process.close()
+    _remove_file(output_path)
+
+
+def _park_standby(key: tuple, standby) -> bool:
+    """Keep `standby` for reuse; False if one with the same key is already parked."""
+    global _parked_standbys_finalizer_pid
+    with _parked_standbys_lock:
+        if key in _parked_standbys:
+            return False
+        if _parked_standbys_finalizer_pid != os.getpid():
+            # parked children wait for code forever, and multiprocessing joins a
+            # process's live children when it exits (after running finalizers, which a
+            # forked child doesn't inherit): kill them first
+            Finalize(None, _kill_parked_standbys, exitpriority=10)
+            _parked_standbys_finalizer_pid = os.getpid()
+        _parked_standbys[key] = standby
+        return True
+
+
+def _kill_parked_standbys() -> None:
+    with _parked_standbys_lock:
+        parked = list(_parked_standbys.values())
+        _parked_standbys.clear()
+    for standby in parked:
+        _kill_standby(standby)
+
+
+def _forget_parked_standbys() -> None:
+    # a forked child doesn't own its parent's standby children
+    global _parked_standbys_lock
+    _parked_standbys_lock = threading.Lock()
+    _parked_standbys.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_parked_standbys)
+
+
 class Interpreter:
     def __init__(
         self,
@@ -86,6 +188,8 @@ class Interpreter:
         format_tb_ipython: bool = False,
         agent_file_name: str = "runfile.py",
         env_vars: dict[str, str] = {},
+        warm_start: bool = False,
+        preload_modules: list[str] | None = None,
     ):
         """
         Simulates a standalone Python REPL with an execution time limit.
@@ -96,6 +200,8 @@ class Interpreter:
             format_tb_ipython (bool, optional): Whether to use IPython or default python REPL formatting for exceptions. Defaults to False.
             agent_file_name (str, optional): The name for the agent's code file. Defaults to "runfile.py".
             env_vars (dict[str, str], optional): Environment variables to set in the child process. Defaults to {}.
+            warm_start (bool, optional): Fork children from a forkserver with `preload_modules` already imported and keep one pre-forked child on standby, which close() hands on to the next Interpreter in this process with the same settings. Every run still gets a fresh process. Defaults to False.
+            preload_modules (list[str] | None, optional): Modules the forkserver imports when warm_start is set. Defaults to DEFAULT_PRELOAD_MODULES.
         """
         # this really needs to be a path, otherwise causes issues that don't raise exc
         self.working_dir = Path(working_dir).resolve()
@@ -107,13 +213,70 @@ class Interpreter:
         self.agent_file_name = agent_file_name
         self.process: Process = None  # type: ignore
         self.env_vars = env_vars
+        self.warm_start = warm_start
+        if warm_start:
+            self._mp_context = _get_warm_context(
+                DEFAULT_PRELOAD_MODULES if preload_modules is None else preload_modules
+            )
+        else:
+            self._mp_context = multiprocessing.get_context()
+        # pre-forked (process, code_inq, event_outq, output_path) for the next reset,
+        # and the _standby_key it was started with
+        self._standby = None
+        self._standby_started_with: tuple | None = None
+        self.output_path: str | None = None
+        self._output_offset = 0
+
+    def __getstate__(self):
+        # forkserver/spawn children receive the interpreter by pickling; live process
+        # handles and queues can't (and needn't) travel with it
+        state = self.__dict__.copy()
+        for key in ("process", "code_inq", "event_outq", "_standby"):
+            state.pop(key, None)
+        state.pop("_mp_context", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.process = None  # type: ignore
+        self._standby = None
+        self._standby_started_with = None
+
+    def _standby_key(self) -> tuple:
+        """Everything a child started now depends on: a parked standby is only
+        reused if it was started with the same settings, environment and CPU set."""
+        return (
+            str(self.working_dir),
+            self.format_tb_ipython,
+            self.agent_file_name,
+            tuple(sorted((k, str(v)) for k, v in self.env_vars.items())),
+            tuple(sorted(os.environ.items())),
+            tuple(sorted(os.sched_getaffinity(0))) if hasattr(os, "sched_getaffinity") else None,
+        )
 
-    def child_proc_setup(self, result_outq: Queue) -> None:
+    def child_proc_setup(
+        self,
+        output_path: str,
+        environ: dict | None = None,
+        cpu_affinity: list[int] | None = None,
+    ) -> None:
         # disable all warnings (before importing anything)
         import shutup
 
         shutup.mute_warnings()
 
+        if environ is not None:
+            # forkserver children inherit the server's environment and CPU affinity,
+            # not the parent's current ones (e.g. CUDA_VISIBLE_DEVICES, CPU set and
+            # thread counts set per worker task)
+            os.environ.clear()
+            os.environ.update(environ)
+            if cpu_affinity and hasattr(os, "sched_setaffinity"):
+                os.sched_setaffinity(0, cpu_affinity)
+            if "torch" in sys.modules and os.environ.get("OMP_NUM_THREADS"):
+                # a preloaded torch sized its thread pool before the env was forwarded
+                sys.modules["torch"].set_num_threads(int(os.environ["OMP_NUM_THREADS"]))
+
         for key, value in self.env_vars.items():
             os.environ[key] = value
 
@@ -123,14 +286,26 @@ class Interpreter:
         # a .py file should be able to import modules from the cwd anyway
         sys.path.append(str(self.working_dir))
 
-        # capture stdout and stderr
+        # capture stdout and stderr into a buffered file; the parent reads it in bulk
+        # once the run has finished instead of receiving one IPC message per write
         # trunk-ignore(mypy/assignment)
-        sys.stdout = sys.stderr = RedirectQueue(result_outq)
+        sys.stdout = sys.stderr = open(
+            output_path,
+            "a",
+            buffering=OUTPUT_BUFFER_SIZE,
+            encoding="utf-8",
+            errors="backslashreplace",
+        )
 
     def _run_session(
-        self, code_inq: Queue, result_outq: Queue, event_outq: Queue
+        self,
+        code_inq: Queue,
+        event_outq: Queue,
+        output_path: str,
+        environ: dict | None = None,
+        cpu_affinity: list[int] | None = None,
     ) -> None:
-        self.child_proc_setup(result_outq)
+        self.child_proc_setup(output_path, environ, cpu_affinity)
 
         global_scope: dict = {}
         while True:
@@ -149,38 +324,85 @@ class Interpreter:
                     self.agent_file_name,
                     self.format_tb_ipython,
                 )
-                result_outq.put(tb_str)
+                sys.stdout.write(tb_str)
                 if e_cls_name == "KeyboardInterrupt":
                     e_cls_name = "TimeoutError"
-
-                event_outq.put(("state:finished", e_cls_name, exc_info, exc_stack))
+                state = ("state:finished", e_cls_name, exc_info, exc_stack)
             else:
-                event_outq.put(("state:finished", None, None, None))
+                state = ("state:finished", None, None, None)
 
-            # put EOF marker to indicate that we're done
-            result_outq.put("<|EOF|>")
+            # all output must be on disk before the parent is told we're done
+            sys.stdout.flush()
+            event_outq.put(state)
 
-    def create_process(self) -> None:
-        # we use three queues to communicate with the child process:
+    def _start_child(self):
+        # we use two queues and a file to communicate with the child process:
         # - code_inq: send code to child to execute
-        # - result_outq: receive stdout/stderr from child
         # - event_outq: receive events from child (e.g. state:ready, state:finished)
-        # trunk-ignore(mypy/var-annotated)
-        self.code_inq, self.result_outq, self.event_outq = Queue(), Queue(), Queue()
-        self.process = Process(
+        # - output_path: temp file the child writes stdout/stderr to
+        ctx = self._mp_context
+        code_inq, event_outq = ctx.Queue(), ctx.Queue()
+        fd, output_path = tempfile.mkstemp(prefix="repl_output_", suffix=".log")
+        os.close(fd)
+        environ = dict(os.environ) if self.warm_start else None
+        cpu_affinity = (
+            sorted(os.sched_getaffinity(0))
+            if self.warm_start and hasattr(os, "sched_getaffinity")
+            else None
+        )
+        process = ctx.Process(
             target=self._run_session,
-            args=(self.code_inq, self.result_outq, self.event_outq),
+            args=(code_inq, event_outq, output_path, environ, cpu_affinity),
         )
-        self.process.start()
+        process.start()
+        return process, code_inq, event_outq, output_path
+
+    def create_process(self) -> None:
+        if self.warm_start and self._standby is None:
+            with _parked_standbys_lock:
+                self._standby = _parked_standbys.pop(self._standby_key(), None)
+        if self._standby is not None:
+            standby, self._standby = self._standby, None
+            if standby[0].is_alive():
+                self.process, self.code_inq, self.event_outq, self.output_path = standby
+                self._output_offset = 0
+                return
+            standby[0].join(timeout=2)
+            _remove_file(standby[3])
+        # trunk-ignore(mypy/var-annotated)
+        (
+            self.process,
+            self.code_inq,
+            self.event_outq,
+            self.output_path,
+        ) = self._start_child()
+        self._output_offset = 0
+
+    def close(self) -> None:
+        """Clean up the current session, and park the pre-forked standby child for the
+        next Interpreter in this process started with the same settings."""
+        self.cleanup_session()
+        if self._standby is not None:
+            standby, self._standby = self._standby, None
+            if standby[0].is_alive() and _park_standby(self._standby_started_with, standby):
+                return
+            _kill_standby(standby)
+
+    def _read_output(self) -> list[str]:
+        """Read the current session's output written since the last read."""
+        if self.output_path is None:
+            return []
+        try:
+            output, self._output_offset = read_output_file(
+                self.output_path, self._output_offset
+            )
+        except OSError as e:
+            logger.error(f"Failed to read REPL output file {self.output_path}: {e}")
+            return []
+        return output
 
     def _drain_queues(self):
         """Quickly drain all in-flight messages to prevent blocking."""
-        while not self.result_outq.empty():
-            try:
-                self.result_outq.get_nowait()
-            except Exception:
-                break
-
         while not self.event_outq.empty():
             try:
                 self.event_outq.get_nowait()
@@ -209,6 +431,8 @@ class Interpreter:
         # don't wait for gc, clean up immediately
         self.process.close()
         self.process = None  # type: ignore
+        _remove_file(self.output_path)
+        self.output_path = None
 
     def run(self, code: str, reset_session=True) -> ExecutionResult:
         """
@@ -225,6 +449,7 @@ class Interpreter:
 
         logger.debug(f"REPL is executing code (reset_session={reset_session})")
 
+        request_time = time.time()
         if reset_session:
             if self.process is not None:
                 # terminate and clean up previous process
@@ -244,11 +469,18 @@ class Interpreter:
         except queue.Empty:
             msg = "REPL child process failed to start execution"
             logger.critical(msg)
-            while not self.result_outq.empty():
-                logger.error(f"REPL output queue dump: {self.result_outq.get()}")
+            logger.error(f"REPL output dump: {''.join(self._read_output())}")
             raise RuntimeError(msg) from None
         assert state[0] == "state:ready", state
         start_time = time.time()
+        spawn_time = start_time - request_time
+
+        if self.warm_start and reset_session and self._standby is None:
+            # fork the next child while this one runs so the next reset is instant
+            self._standby_started_with = self._standby_key()
+            self._standby = self._start_child()
+
+        output: list[str] | None = None
 
         # this flag indicates that the child ahs exceeded the time limit and an interrupt was sent
         # if the child process dies without this flag being set, it's an unexpected termination
@@ -266,10 +498,7 @@ class Interpreter:
                 if not child_in_overtime and not self.process.is_alive():
                     msg = "REPL child process died unexpectedly"
                     logger.critical(msg)
-                    while not self.result_outq.empty():
-                        logger.error(
-                            f"REPL output queue dump: {self.result_outq.get()}"
-                        )
+                    logger.error(f"REPL output dump: {''.join(self._read_output())}")
                     raise RuntimeError(msg) from None
 
                 # child is alive and still executing -> check if we should sigint..
@@ -286,19 +515,18 @@ class Interpreter:
                     # terminate if we're overtime by more than a minute
                     if running_time > self.timeout + 60:
                         logger.warning("Child failed to terminate, killing it..")
+                        # collect what it wrote before the output file goes away
+                        output = self._read_output()
                         self.cleanup_session()
 
                         state = (None, "TimeoutError", {}, [])
                         exec_time = self.timeout
                         break
 
-        output: list[str] = []
-        # read all stdout/stderr from child up to the EOF marker
-        # waiting until the queue is empty is not enough since
-        # the feeder thread in child might still be adding to the queue
-        while not self.result_outq.empty() or not output or output[-1] != "<|EOF|>":
-            output.append(self.result_outq.get())
-        output.pop()  # remove the EOF marker
+        if output is None:
+            # the child flushes its output file before reporting state:finished,
+            # so everything from this run is on disk now
+            output = self._read_output()
 
         e_cls_name, exc_info, exc_stack = state[1:]
 
@@ -310,4 +538,9 @@ class Interpreter:
             output.append(
                 f"Execution time: {humanize.naturaldelta(exec_time)} seconds (time limit is {humanize.naturaldelta(self.timeout)})."
             )
-        return ExecutionResult(output, exec_time, e_cls_name, exc_info, exc_stack)
+        logger.info(
+            f"REPL run timings: spawn {spawn_time:.3f}s, exec {exec_time:.3f}s (warm_start={self.warm_start})"
+        )
+        return ExecutionResult(
+            output, exec_time, e_cls_name, exc_info, exc_stack, spawn_time
+        )
@@ -1,7 +1,8 @@
 from __future__ import annotations
+import bisect
 import time
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Literal, Optional
 import copy
 import os
@@ -9,12 +10,11 @@ import json
 
 from dataclasses_json import DataClassJsonMixin
 from .interpreter import ExecutionResult
+from .utils.blob_store import BLOB_MIN_BYTES, get_blob_store, load_blob, put_blob
 from .utils.metric import MetricValue, WorstMetricValue
 from .utils.response import trim_long_string
 from .backend import FunctionSpec, query
 
-from rich import print
-
 import logging
 from pathlib import Path
 
@@ -40,7 +40,61 @@ node_selection_spec = FunctionSpec(
 )
 
 
-@dataclass(eq=False)
+class BlobRef:
+    """Reference to a node payload kept in a BlobStore instead of in memory"""
+
+    __slots__ = ("root", "digest")
+
+    def __init__(self, root: str, digest: str):
+        self.root = root
+        self.digest = digest
+
+    def __deepcopy__(self, memo):
+        return self  # immutable
+
+    def __getstate__(self):
+        return (self.root, self.digest)
+
+    def __setstate__(self, state):
+        self.root, self.digest = state
+
+    def to_dict(self) -> dict:
+        return {"__blob__": self.digest, "root": self.root}
+
+
+class _BlobField:
+    """Node attribute whose large values are moved to the active blob store on
+    assignment and loaded back on access. Wraps the slot that holds the value."""
+
+    def __init__(self, name: str, slot):
+        self.name = name
+        self.slot = slot
+
+    def raw(self, obj):
+        """The stored value, without loading it: a BlobRef if offloaded"""
+        return self.slot.__get__(obj, type(obj))
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = self.raw(obj)
+        if isinstance(value, BlobRef):
+            return load_blob(value.root, value.digest)
+        return value
+
+    def __set__(self, obj, value):
+        if isinstance(value, dict) and "__blob__" in value:
+            value = BlobRef(value["root"], value["__blob__"])
+        elif value is not None and not isinstance(value, BlobRef):
+            store = get_blob_store()
+            if store is not None:
+                text = json.dumps(value, default=str)
+                if len(text) >= BLOB_MIN_BYTES:
+                    value = BlobRef(str(store.root), store.put_text(text))
+        self.slot.__set__(obj, value)
+
+
+@dataclass(eq=False, slots=True)
 class Node(DataClassJsonMixin):
     """A single node in the solution tree. Contains code, execution results, and evaluation information."""
 
@@ -132,7 +186,7 @@ class Node(DataClassJsonMixin):
         memo[id(self)] = result
 
         # Copy all attributes except parent and children to avoid circular references
-        for k, v in self.__dict__.items():
+        for k, v in self._state().items():
             if k not in ("parent", "children"):
                 setattr(result, k, copy.deepcopy(v, memo))
 
@@ -142,18 +196,24 @@ class Node(DataClassJsonMixin):
 
         return result
 
+    def _state(self) -> dict:
+        """Field values as stored (offloaded payloads stay BlobRefs), plus any extra attributes"""
+        state = {f.name: self._raw(f.name) for f in fields(self)}
+        state.update(getattr(self, "__dict__", {}))
+        return state
+
+    def _raw(self, name: str):
+        attr = getattr(type(self), name)
+        return attr.raw(self) if isinstance(attr, _BlobField) else getattr(self, name)
+
     def __getstate__(self):
         """Return state for pickling"""
-        state = self.__dict__.copy()
-        # Ensure id is included in the state
-        if hasattr(self, "id"):
-            state["id"] = self.id
-        return state
+        return self._state()
 
     def __setstate__(self, state):
         """Set state during unpickling"""
-        # Ensure all required attributes are present
-        self.__dict__.update(state)
+        for k, v in state.items():
+            setattr(self, k, v)
 
     @property
     def stage_name(self) -> Literal["draft", "debug", "improve"]:
@@ -211,30 +271,62 @@ class Node(DataClassJsonMixin):
             return 0
         return self.parent.debug_depth + 1  # type: ignore
 
-    def to_dict(self) -> Dict:
-        """Convert node to dictionary for serialization"""
+    def _payload(self, name: str, inline_blobs: bool):
+        """Value of an offloaded field, or its blob reference if not inlining"""
+        value = self._raw(name)
+        if not inline_blobs and isinstance(value, BlobRef):
+            return value.to_dict()
+        return getattr(self, name)
+
+    def to_dict(self, inline_blobs: bool = True) -> Dict:
+        """Convert node to dictionary for serialization
+
+        With inline_blobs=False, payloads offloaded to the blob store are emitted as
+        references, which keeps the dict small for shipping between processes.
+        """
+        plot_analyses = self.plot_analyses
+        if isinstance(plot_analyses, list):
+            plot_analyses = [
+                {
+                    **analysis,
+                    "plot_path": (
+                        str(
+                            Path(analysis["plot_path"])
+                            .resolve()
+                            .relative_to(os.getcwd())
+                        )
+                        if analysis.get("plot_path")
+                        else None
+                    ),
+                }
+                for analysis in plot_analyses
+            ]
+            ref = self._raw("plot_analyses")
+            if not inline_blobs and isinstance(ref, BlobRef):
+                # stays offloaded, with the paths already converted
+                plot_analyses = BlobRef(ref.root, put_blob(ref.root, plot_analyses)).to_dict()
         return {
-            "code": self.code,
+            "code": self._payload("code", inline_blobs),
             "plan": self.plan,
             "overall_plan": (
                 self.overall_plan if hasattr(self, "overall_plan") else None
             ),
-            "plot_code": self.plot_code,
+            "plot_code": self._payload("plot_code", inline_blobs),
             "plot_plan": self.plot_plan,
             "step": self.step,
             "id": self.id,
             "ctime": self.ctime,
-            "_term_out": self._term_out,
+            "_term_out": self._payload("_term_out", inline_blobs),
             "parse_metrics_plan": self.parse_metrics_plan,
             "parse_metrics_code": self.parse_metrics_code,
-            "parse_term_out": self.parse_term_out,
+            "parse_term_out": self._payload("parse_term_out", inline_blobs),
             "parse_exc_type": self.parse_exc_type,
             "parse_exc_info": self.parse_exc_info,
             "parse_exc_stack": self.parse_exc_stack,
             "exec_time": self.exec_time,
             "exc_type": self.exc_type,
             "exc_info": self.exc_info,
-            "exc_stack": self.exc_stack,
+            "exc_stack": self._payload("exc_stack", inline_blobs),
             "analysis": self.analysis,
             "exp_results_dir": (
                 str(Path(self.exp_results_dir).resolve().relative_to(os.getcwd()))
@@ -266,22 +358,8 @@ class Node(DataClassJsonMixin):
                 if self.plot_paths
                 else []
             ),
-            "plot_analyses": [
-                {
-                    **analysis,
-                    "plot_path": (
-                        str(
-                            Path(analysis["plot_path"])
-                            .resolve()
-                            .relative_to(os.getcwd())
-                        )
-                        if analysis.get("plot_path")
-                        else None
-                    ),
-                }
-                for analysis in self.plot_analyses
-            ],
-            "vlm_feedback_summary": self.vlm_feedback_summary,
+            "plot_analyses": plot_analyses,
+            "vlm_feedback_summary": self._payload("vlm_feedback_summary", inline_blobs),
             "datasets_successfully_tested": self.datasets_successfully_tested,
             "ablation_name": self.ablation_name,
             "hyperparam_name": self.hyperparam_name,
@@ -328,6 +406,23 @@ class Node(DataClassJsonMixin):
         return node
 
 
+# large text payloads that move to the blob store when one is active (see
+# utils/blob_store.py); scheduling fields (id, parent, metric, flags, step) stay inline
+OFFLOADED_NODE_FIELDS = (
+    "code",
+    "plot_code",
+    "_term_out",
+    "exc_stack",
+    "parse_term_out",
+    "plot_term_out",
+    "plot_exc_stack",
+    "plot_analyses",
+    "vlm_feedback_summary",
+)
+for _name in OFFLOADED_NODE_FIELDS:
+    setattr(Node, _name, _BlobField(_name, Node.__dict__[_name]))
+
+
 @dataclass
 class InteractiveSession(DataClassJsonMixin):
     """
@@ -363,6 +458,45 @@ class Journal:
     """A collection of nodes representing the solution tree."""
 
     nodes: list[Node] = field(default_factory=list)
+    # memoized LLM best-node selections: (only_good, candidate ids + metrics) -> node id
+    _best_node_cache: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    best_node_cache_stats: dict = field(
+        default_factory=lambda: {"hits": 0, "misses": 0},
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    # ---- indexes, maintained incrementally on append ----
+    # ordered id -> node maps stand in for insertion-ordered sets
+    _node_by_id: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _drafts: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _buggy: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _good: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _root_of: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    _debug_depth: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    # root id -> {leaf id -> leaf node}
+    _leaves: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    # good nodes sorted best-first as (-metric rank, insertion order, node id), overall
+    # and per tree (root id -> list)
+    _good_ranked: list = field(default_factory=list, init=False, repr=False, compare=False)
+    _good_ranked_by_root: dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    # ---- rolling research summary, updated with only the nodes added since ----
+    memory_summary: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _summarized_ids: set = field(default_factory=set, init=False, repr=False, compare=False)
+    # bumped on every commit, so results computed from an older summary can be told apart
+    _summary_version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.reindex()
 
     def __getitem__(self, idx: int) -> Node:
         return self.nodes[idx]
@@ -371,47 +505,151 @@ class Journal:
         """Return the number of nodes in the journal."""
         return len(self.nodes)
 
+    def __setstate__(self, state):
+        """Set state during unpickling (older checkpoints predate the caches and indexes)"""
+        state.setdefault("_best_node_cache", {})
+        state.setdefault("best_node_cache_stats", {"hits": 0, "misses": 0})
+        state.setdefault("memory_summary", None)
+        state.setdefault("_summarized_ids", set())
+        state.setdefault("_summary_version", 0)
+        self.__dict__.update(state)
+        if "_node_by_id" not in state or "_good_ranked" not in state:
+            self.reindex()
+
     def append(self, node: Node) -> None:
         """Append a new node to the journal."""
+        self._sync_index()
         node.step = len(self.nodes)
         self.nodes.append(node)
+        self._index_node(node)
+        self._indexed_count = len(self.nodes)
+        self._best_node_cache.clear()
+
+    def reindex(self) -> None:
+        """Rebuild all node indexes from `self.nodes` (e.g. after relinking parents)."""
+        self._node_by_id = {}
+        self._drafts = {}
+        self._buggy = {}
+        self._good = {}
+        self._root_of = {}
+        self._debug_depth = {}
+        self._leaves = {}
+        self._good_ranked = []
+        self._good_ranked_by_root = {}
+        for node in self.nodes:
+            self._index_node(node)
+        self._indexed_count = len(self.nodes)
+        self._best_node_cache.clear()
+
+    def _sync_index(self) -> None:
+        """Pick up nodes that were added to `self.nodes` directly instead of via append."""
+        if self._indexed_count == len(self.nodes):
+            return
+        if self._indexed_count > len(self.nodes):
+            self.reindex()
+            return
+        for node in self.nodes[self._indexed_count :]:
+            self._index_node(node)
+        self._indexed_count = len(self.nodes)
+        self._best_node_cache.clear()
+
+    def _index_node(self, node: Node) -> None:
+        self._node_by_id[node.id] = node
+        parent = node.parent if isinstance(node.parent, Node) else None
+
+        if parent is None:
+            root = node
+            self._drafts[node.id] = node
+            self._debug_depth[node.id] = 0
+        elif parent.id in self._node_by_id:
+            root = self._root_of[parent.id]
+            self._leaves.get(root.id, {}).pop(parent.id, None)
+            self._debug_depth[node.id] = (
+                self._debug_depth[parent.id] + 1 if parent.is_buggy else 0
+            )
+        else:
+            # parent lives outside this journal; fall back to walking the links
+            root = parent
+            while isinstance(root.parent, Node):
+                root = root.parent
+            self._debug_depth[node.id] = node.debug_depth
+        self._root_of[node.id] = root
+
+        if not any(child.id in self._node_by_id for child in node.children):
+            self._leaves.setdefault(root.id, {})[node.id] = node
+
+        if node.is_buggy:
+            self._buggy[node.id] = node
+        if node.is_buggy is False and node.is_buggy_plots is False:
+            self._good[node.id] = node
+            rank = node.metric.rank_key() if node.metric is not None else float("-inf")
+            entry = (-rank, len(self._node_by_id), node.id)
+            bisect.insort(self._good_ranked, entry)
+            bisect.insort(self._good_ranked_by_root.setdefault(root.id, []), entry)
 
     @property
     def draft_nodes(self) -> list[Node]:
         """Return a list of nodes representing intial coding drafts"""
-        return [n for n in self.nodes if n.parent is None]
+        self._sync_index()
+        return list(self._drafts.values())
 
     @property
     def buggy_nodes(self) -> list[Node]:
         """Return a list of nodes that are considered buggy by the agent."""
-        return [n for n in self.nodes if n.is_buggy]
+        self._sync_index()
+        return list(self._buggy.values())
 
     @property
     def good_nodes(self) -> list[Node]:
         """Return a list of nodes that are not considered buggy by the agent."""
-        list_of_nodes = [
-            [
-                n.step,
-                n.parent.step if n.parent else None,
-                n.id,
-                n.is_buggy,
-                n.is_buggy_plots,
-            ]
-            for n in self.nodes
-        ]
-        print(
-            f"[purple]all nodes ID and is_buggy/is_buggy_plots flags: {list_of_nodes}[/purple]"
-        )
-        return [
-            n for n in self.nodes if n.is_buggy is False and n.is_buggy_plots is False
-        ]
+        self._sync_index()
+        return list(self._good.values())
 
     def get_node_by_id(self, node_id: str) -> Optional[Node]:
         """Get a node by its ID."""
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        return None
+        self._sync_index()
+        return self._node_by_id.get(node_id)
+
+    def get_root(self, node: Node) -> Node:
+        """Get the draft node at the root of the tree containing `node`."""
+        self._sync_index()
+        root = self._root_of.get(node.id)
+        if root is None:
+            root = node
+            while root.parent:
+                root = root.parent
+        return root
+
+    def get_leaves(self, root: Node) -> list[Node]:
+        """Get all leaf nodes in the tree rooted at the draft node `root`."""
+        self._sync_index()
+        return list(self._leaves.get(root.id, {}).values())
+
+    def get_debug_depth(self, node: Node) -> int:
+        """Cached equivalent of `node.debug_depth` for nodes in this journal."""
+        self._sync_index()
+        depth = self._debug_depth.get(node.id)
+        return node.debug_depth if depth is None else depth
+
+    def top_good_nodes(
+        self, k: Optional[int] = None, root: Optional[Node] = None
+    ) -> list[Node]:
+        """Good nodes ordered best-first by metric, optionally only the `k` best and
+        only those in the tree rooted at the draft node `root`."""
+        self._sync_index()
+        ranked = (
+            self._good_ranked
+            if root is None
+            else self._good_ranked_by_root.get(root.id, [])
+        )
+        if k is not None:
+            ranked = ranked[:k]
+        return [self._node_by_id[node_id] for _, _, node_id in ranked]
+
+    def _best_by_metric(self, only_good: bool) -> Node:
+        if only_good:
+            return self.top_good_nodes(k=1)[0]
+        return max(self.nodes, key=lambda n: n.metric)
 
     def get_metric_history(self) -> list[MetricValue]:
         """Return a list of all metric values in the journal."""
@@ -427,11 +665,25 @@ class Journal:
             nodes = self.nodes
 
         if use_val_metric_only:
-            return max(nodes, key=lambda n: n.metric)
+            return self._best_by_metric(only_good)
 
         if len(nodes) == 1:
             return nodes[0]
 
+        # The LLM only sees candidate ids and metrics, so an unchanged candidate set
+        # gets the same answer; reuse it instead of paying for another round-trip.
+        cache_key = (
+            only_good,
+            tuple(sorted((n.id, str(n.metric)) for n in nodes)),
+        )
+        cached_id = self._best_node_cache.get(cache_key)
+        if cached_id is not None:
+            cached_node = next((n for n in nodes if n.id == cached_id), None)
+            if cached_node is not None:
+                self.best_node_cache_stats["hits"] += 1
+                return cached_node
+        self.best_node_cache_stats["misses"] += 1
+
         # Create evaluation prompt for LLM
         prompt = {
             "Introduction": (
@@ -485,49 +737,76 @@ class Journal:
                     f"Selected node {selected_node.id} as best implementation"
                 )
                 logger.warning(f"Reasoning: {selection['reasoning']}")
+                self._best_node_cache[cache_key] = selected_node.id
                 return selected_node
             else:
                 logger.warning("Falling back to metric-based selection")
-                return max(nodes, key=lambda n: n.metric)
+                selected_node = self._best_by_metric(only_good)
+                self._best_node_cache[cache_key] = selected_node.id
+                return selected_node
 
         except Exception as e:
             logger.error(f"Error in LLM selection process: {e}")
             logger.warning("Falling back to metric-based selection")
-            return max(nodes, key=lambda n: n.metric)
+            return self._best_by_metric(only_good)
 
-    def generate_summary(self, include_code: bool = False) -> str:
-        """Generate a summary of the research progress using LLM, including both successes and failures."""
-        if not self.nodes:
-            return "No experiments conducted yet."
+    def pending_summary_digests(self, include_code: bool = False) -> dict:
+        """Collect per-node digests for the nodes not yet folded into `memory_summary`.
 
+        Cheap and side-effect free, so it can run on the scheduler thread while the
+        LLM call in `summarize_digests` runs elsewhere.
+        """
+        self._sync_index()
+        pending = {
+            "node_ids": [],
+            "successes": [],
+            "failures": [],
+            "base_version": self._summary_version,
+        }
+        for node in self.nodes:
+            if node.id in self._summarized_ids:
+                continue
+            pending["node_ids"].append(node.id)
+            if node.id in self._good:
+                exp_info = f"Design: {node.plan}\n  "
+                exp_info += f"Results: {node.analysis}\n"
+                exp_info += f"Metric: {str(node.metric)}\n"
+                if include_code:
+                    exp_info += f"Code: {node.code}\n"
+                pending["successes"].append(exp_info)
+            elif node.id in self._buggy:
+                failure_info = f"Design: {node.plan}\n  "
+                failure_info += f"Error Analysis: {node.analysis}\n"
+                failure_info += f"Error Type: {node.exc_type if hasattr(node, 'exc_type') else 'Unknown'}\n"
+                failure_info += f"Debug Depth: {self.get_debug_depth(node)}\n"
+                if include_code:
+                    failure_info += f"Code: {node.code}\n"
+                pending["failures"].append(failure_info)
+        return pending
+
+    @staticmethod
+    def summarize_digests(pending: dict, previous_summary: Optional[str] = None) -> str:
+        """Fold new node digests into the previous summary (or start one) using LLM."""
         prompt = {
             "Introduction": (
                 "You are an AI researcher summarizing experimental progress. "
                 "Please analyze both successful and failed experiments to provide insights "
                 "for future improvements."
             ),
-            "Successful Experiments": "",
-            "Failed Experiments": "",
         }
+        if previous_summary:
+            prompt["Introduction"] += (
+                " A summary of earlier experiments is given; update it with the new "
+                "experiments rather than repeating them one by one."
+            )
+            prompt["Summary of Earlier Experiments"] = previous_summary
+            prompt["New Successful Experiments"] = "".join(pending["successes"])
+            prompt["New Failed Experiments"] = "".join(pending["failures"])
+        else:
+            prompt["Successful Experiments"] = "".join(pending["successes"])
+            prompt["Failed Experiments"] = "".join(pending["failures"])
 
-        for node in self.good_nodes:
-            exp_info = f"Design: {node.plan}\n  "
-            exp_info += f"Results: {node.analysis}\n"
-            exp_info += f"Metric: {str(node.metric)}\n"
-            if include_code:
-                exp_info += f"Code: {node.code}\n"
-            prompt["Successful Experiments"] += exp_info
-
-        for node in self.buggy_nodes:
-            failure_info = f"Design: {node.plan}\n  "
-            failure_info += f"Error Analysis: {node.analysis}\n"
-            failure_info += f"Error Type: {node.exc_type if hasattr(node, 'exc_type') else 'Unknown'}\n"
-            failure_info += f"Debug Depth: {node.debug_depth}\n"
-            if include_code:
-                failure_info += f"Code: {node.code}\n"
-            prompt["Failed Experiments"] += failure_info
-
-        summary = query(
+        return query(
             system_message=prompt,
             user_message=(
                 "Please provide a comprehensive summary of the experimental progress that includes:\n"
@@ -539,6 +818,38 @@ class Journal:
             temperature=0.3,
         )
 
+    def commit_summary(self, pending: dict, summary: str) -> bool:
+        """Record `summary` as covering the nodes in `pending`.
+
+        Returns False (and keeps the current summary) if another summary was
+        committed after `pending` was collected, since `summary` would drop it.
+        """
+        if pending.get("base_version", self._summary_version) != self._summary_version:
+            return False
+        self.memory_summary = summary
+        self._summarized_ids.update(pending["node_ids"])
+        self._summary_version += 1
+        return True
+
+    def generate_summary(self, include_code: bool = False) -> str:
+        """Generate a summary of the research progress using LLM, including both successes and failures.
+
+        The summary is maintained incrementally: only nodes added since the last call
+        are sent to the LLM, together with the previous summary.
+        """
+        if not self.nodes:
+            return "No experiments conducted yet."
+
+        pending = self.pending_summary_digests(include_code=include_code)
+        if not pending["node_ids"] and self.memory_summary is not None:
+            return self.memory_summary
+        if not pending["successes"] and not pending["failures"] and self.memory_summary:
+            # nothing new worth summarizing (e.g. only nodes with buggy plots)
+            self.commit_summary(pending, self.memory_summary)
+            return self.memory_summary
+
+        summary = self.summarize_digests(pending, self.memory_summary)
+        self.commit_summary(pending, summary)
         return summary
 
     def generate_summary_old(self, include_code: bool = False) -> str:
@@ -360,6 +360,8 @@ def overall_summarize(journals):
 
 
 if __name__ == "__main__":
+    from .utils.serialize import load_journal_log
+
     # Test
     example_path = "logs/247-run"
 
@@ -409,13 +411,18 @@ if __name__ == "__main__":
         print(f"Stage {index}: {folder}")
         stage_name = os.path.basename(folder)
         journal_path = os.path.join(folder, "journal.json")
-        if os.path.exists(journal_path):
-            with open(journal_path, "r") as file:
-                journal_data = json.load(file)
-                print(f"Loaded journal.json for Stage {index}")
+        journal_log_path = os.path.join(folder, "journal.jsonl")
+        if os.path.exists(journal_log_path):
+            journal = load_journal_log(journal_log_path)
+            print(f"Loaded journal.jsonl for Stage {index}")
         else:
-            print(f"No journal.json found for Stage {index}")
-        journal = reconstruct_journal(journal_data)
+            if os.path.exists(journal_path):
+                with open(journal_path, "r") as file:
+                    journal_data = json.load(file)
+                    print(f"Loaded journal.json for Stage {index}")
+            else:
+                print(f"No journal.json found for Stage {index}")
+            journal = reconstruct_journal(journal_data)
         journals.append((stage_name, journal))
 
     # Convert manager journals to list of (stage_name, journal) tuples
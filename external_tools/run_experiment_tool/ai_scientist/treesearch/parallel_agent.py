@@ -1,5 +1,11 @@
-from concurrent.futures import ProcessPoolExecutor
-from typing import List, Optional, Set, Any, Callable, cast, Dict, Tuple
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import List, Optional, Any, Callable, cast, Dict, Tuple
 import random
 import subprocess
 import os
@@ -10,11 +16,12 @@ from .backend import FunctionSpec, compile_prompt_to_md, query
 from .interpreter import ExecutionResult
 from .journal import Journal, Node
 from .utils import data_preview
+from .utils.blob_store import set_blob_store
 from .utils.config import Config
 from .utils.metric import MetricValue, WorstMetricValue
+from .utils.resources import ResourceScheduler, ResourceSlot
 from .utils.response import extract_code, extract_text_up_to_code, wrap_code
 import copy
-import pickle
 from dataclasses import asdict
 from omegaconf import OmegaConf
 
@@ -28,14 +35,16 @@ logger = logging.getLogger("ai-scientist")
 ExecCallbackType = Callable[[str, bool], ExecutionResult]
 
 
-def _safe_pickle_test(obj, name="object"):
-    """Test if an object can be pickled"""
-    try:
-        pickle.dumps(obj)
-        return True
-    except Exception as e:
-        logger.error(f"Cannot pickle {name}: {str(e)}")
-        return False
+# Immutable per-agent context (cfg, task description, metric definition, best-stage
+# plot code), installed once in each worker process by the pool initializer so that
+# individual tasks only carry the node and the ideas that change per submission.
+_worker_context: Dict[str, Any] = {}
+
+
+def _init_worker_context(context: Dict[str, Any]) -> None:
+    """ProcessPoolExecutor initializer: keep the shared context in the worker"""
+    _worker_context.clear()
+    _worker_context.update(context)
 
 
 def _parse_keyword_prefix_response(
@@ -1088,35 +1097,6 @@ class MinimalAgent:
         )
 
 
-class GPUManager:
-    """Manages GPU allocation across processes"""
-
-    def __init__(self, num_gpus: int):
-        self.num_gpus = num_gpus
-        self.available_gpus: Set[int] = set(range(num_gpus))
-        self.gpu_assignments: Dict[str, int] = {}  # process_id -> gpu_id
-
-    def acquire_gpu(self, process_id: str) -> int:
-        """Assigns a GPU to a process"""
-        if not self.available_gpus:
-            raise RuntimeError("No GPUs available")
-        print(f"Available GPUs: {self.available_gpus}")
-        print(f"Process ID: {process_id}")
-        gpu_id = min(self.available_gpus)
-        print(f"Acquiring GPU {gpu_id} for process {process_id}")
-        self.available_gpus.remove(gpu_id)
-        self.gpu_assignments[process_id] = gpu_id
-        print(f"GPU assignments: {self.gpu_assignments}")
-        return gpu_id
-
-    def release_gpu(self, process_id: str):
-        """Releases GPU assigned to a process"""
-        if process_id in self.gpu_assignments:
-            gpu_id = self.gpu_assignments[process_id]
-            self.available_gpus.add(gpu_id)
-            del self.gpu_assignments[process_id]
-
-
 def get_gpu_count() -> int:
     """Get number of available NVIDIA GPUs without using torch"""
     try:
@@ -1173,17 +1153,57 @@ class ParallelAgent:
         else:
             print(f"Detected {self.num_gpus} GPUs")
 
-        self.gpu_manager = GPUManager(self.num_gpus) if self.num_gpus > 0 else None
+        # each worker task gets its own CPU set, memory budget and GPU (if any)
+        self.resources = ResourceScheduler(
+            num_workers=self.num_workers,
+            num_gpus=self.num_gpus,
+            cpus_per_worker=getattr(cfg.exec, "cpus_per_worker", None),
+            mem_per_worker_mb=getattr(cfg.exec, "mem_per_worker_mb", None),
+            pin_cpus=getattr(cfg.exec, "pin_cpus", True),
+        )
+        if self.resources.capacity < self.num_workers:
+            self.num_workers = self.resources.capacity
+            logger.info(
+                f"Limiting workers to {self.num_workers} to match available resources"
+            )
+        print(
+            f"Each worker gets {self.resources.cpus_per_worker} CPU(s)"
+            + (f" and {self.resources.mem_per_worker_mb} MB" if self.resources.mem_per_worker_mb else "")
+        )
 
-        if self.num_gpus > 0:
-            self.num_workers = min(self.num_workers, self.num_gpus)
-            logger.info(f"Limiting workers to {self.num_workers} to match GPU count")
+        # keep large node payloads (code, terminal output, ...) in a content-addressed
+        # store under the log dir; nodes and worker messages then carry only digests.
+        # Must be set before the pool starts so workers inherit it.
+        if getattr(cfg.exec, "offload_node_payloads", False):
+            set_blob_store(Path(cfg.log_dir) / "blobs")
 
         self.timeout = self.cfg.exec.timeout
-        self.executor = ProcessPoolExecutor(max_workers=self.num_workers)
         self._is_shutdown = False
+        # "batch" waits for every worker each step, "async" refills a worker slot
+        # as soon as its node finishes
+        self.scheduling = getattr(cfg.agent, "scheduling", "batch")
+        self._inflight: Dict[Future, str] = {}  # future -> process_id
+        # parent of each in-flight node (None for drafts), so selection skips them
+        self._inflight_parents: Dict[Future, Optional[Node]] = {}
+        # timed-out nodes whose worker is still running; they keep their resource
+        # slot and worker until the process actually finishes
+        self._abandoned: Dict[Future, str] = {}
+        self._submission_count = 0
+        # memory summary is refreshed in a background thread; steps use the
+        # latest finished summary instead of waiting on the LLM call
+        self._summary_executor = ThreadPoolExecutor(max_workers=1)
+        self._summary_future: Optional[Future] = None
+        self._summary_pending: Optional[dict] = None
+        # set when background work still needs the workers after the `with` block
+        self._cleanup_after: Optional[Future] = None
         # Define the metric once at initialization
         self.evaluation_metrics = self._define_global_metrics()
+        # the pool is created after everything in the shared worker context is known
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            initializer=_init_worker_context,
+            initargs=(self._worker_context(),),
+        )
         self._ablation_state = {  # store ablation names
             "completed_ablations": set(),
         }
@@ -1191,6 +1211,21 @@ class ParallelAgent:
             "tried_hyperparams": set(),
         }
 
+    def _worker_context(self) -> Dict[str, Any]:
+        """Task-independent inputs of _process_node_wrapper, sent once per worker"""
+        return {
+            "task_desc": self.task_desc,
+            "cfg": self.cfg,
+            "evaluation_metrics": self.evaluation_metrics,
+            "stage_name": self.stage_name,
+            "best_stage1_plot_code": (
+                self.best_stage1_node.plot_code if self.best_stage1_node else None
+            ),
+            "best_stage2_plot_code": (
+                self.best_stage2_node.plot_code if self.best_stage2_node else None
+            ),
+        }
+
     def _define_global_metrics(self) -> str:
         """Define eval metric to be used across all experiments"""
         prompt = {
@@ -1260,72 +1295,74 @@ class ParallelAgent:
 
     def _run_multi_seed_evaluation(self, node: Node) -> List[Node]:
         """Run multiple seeds of the same node to get statistical metrics.
-        Returns a list of nodes with different random seeds."""
+        Returns a list of nodes with different random seeds.
 
-        # Convert node to dict for parallel processing
-        node_data = node.to_dict()
-        node_code = node.code
+        Seed runs are added to the journal in the order they finish; seeds that
+        don't fit into the free resource slots are queued until one frees up."""
 
-        # Submit parallel jobs for different seeds
+        node_code = node.code
+        pending_seeds = list(range(self.cfg.agent.multi_seed_eval.num_seeds))
+        running: Dict[Future, str] = {}  # future -> process_id
         seed_nodes = []
-        futures = []
-        for seed in range(self.cfg.agent.multi_seed_eval.num_seeds):
-            gpu_id = None
-            if self.gpu_manager is not None:
-                try:
-                    process_id = f"seed_{seed}_worker"
-                    gpu_id = self.gpu_manager.acquire_gpu(process_id)
-                    logger.info(f"Assigned GPU {gpu_id} to seed {seed}")
-                except RuntimeError as e:
-                    logger.warning(
-                        f"Could not acquire GPU for seed {seed}: {e}. Running on CPU"
-                    )
-
-            # Add seed to node code
-            node_data["code"] = (
-                f"# Set random seed\nimport random\nimport numpy as np\nimport torch\n\nseed = {seed}\nrandom.seed(seed)\nnp.random.seed(seed)\ntorch.manual_seed(seed)\nif torch.cuda.is_available():\n    torch.cuda.manual_seed(seed)\n\n"
-                + node_code
-            )
+        print("[yellow]Starting multi-seed eval...[/yellow]")
+
+        while pending_seeds or running:
+            self._reap_abandoned()
+            # Submit as many seeds as there are free resource slots
+            while pending_seeds:
+                # unique per submission: a timed-out seed may still hold its slot
+                process_id = f"seed_{pending_seeds[0]}_worker_{self._submission_count}"
+                resource_slot = self.resources.acquire(process_id)
+                if resource_slot is None:
+                    break
+                seed = pending_seeds.pop(0)
+
+                # Fresh dict per seed: the pool pickles arguments lazily
+                node_data = node.to_dict(inline_blobs=False)
+                # Add seed to node code
+                node_data["code"] = (
+                    f"# Set random seed\nimport random\nimport numpy as np\nimport torch\n\nseed = {seed}\nrandom.seed(seed)\nnp.random.seed(seed)\ntorch.manual_seed(seed)\nif torch.cuda.is_available():\n    torch.cuda.manual_seed(seed)\n\n"
+                    + node_code
+                )
 
-            new_ablation_idea = None
-            new_hyperparam_idea = None
-            best_stage1_plot_code = None
-            best_stage2_plot_code = None
-            best_stage3_plot_code = None
-            seed_eval = True
-            memory_summary = ""
-            print("[yellow]Starting multi-seed eval...[/yellow]")
-            futures.append(
-                self.executor.submit(
+                future = self.executor.submit(
                     self._process_node_wrapper,
                     node_data,
-                    self.task_desc,
-                    self.cfg,
-                    gpu_id,
-                    memory_summary,
-                    self.evaluation_metrics,
-                    self.stage_name,
-                    new_ablation_idea,
-                    new_hyperparam_idea,
-                    best_stage1_plot_code,
-                    best_stage2_plot_code,
-                    best_stage3_plot_code,
-                    seed_eval,
+                    resource_slot,
+                    memory_summary="",
+                    seed_eval=True,
                 )
-            )
+                self._submission_count += 1
+                running[future] = process_id
 
-        for future in futures:
-            try:
-                result_data = future.result(timeout=self.timeout)
-                result_node = Node.from_dict(result_data, self.journal)
-                print(f"Parent node id: {result_node.parent.id}")
-                print(f"Sanity check: actual parent node id: {node.id}")
-                # Add node to journal's list and assign its step number
-                self.journal.append(result_node)
-                seed_nodes.append(self.journal.get_node_by_id(result_node.id))
-                print("Added result node to journal")
-            except Exception as e:
-                logger.error(f"Error in multi-seed evaluation: {str(e)}")
+            if not running:
+                logger.error(
+                    f"No resources for seeds {pending_seeds} in multi-seed evaluation"
+                )
+                break
+
+            done, _ = wait(running, timeout=self.timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.error("Multi-seed evaluation timed out, dropping remaining seeds")
+                # running seeds keep their slots (and GPUs) until their worker exits
+                for future, process_id in running.items():
+                    self._abandon(future, process_id)
+                break
+
+            for future in done:
+                process_id = running.pop(future)
+                self.resources.release(process_id)
+                try:
+                    result_data = future.result()
+                    result_node = Node.from_dict(result_data, self.journal)
+                    print(f"Parent node id: {result_node.parent.id}")
+                    print(f"Sanity check: actual parent node id: {node.id}")
+                    # Add node to journal's list and assign its step number
+                    self.journal.append(result_node)
+                    seed_nodes.append(self.journal.get_node_by_id(result_node.id))
+                    print(f"Added result node of {process_id} to journal")
+                except Exception as e:
+                    logger.error(f"Error in multi-seed evaluation: {str(e)}")
 
         return seed_nodes
 
@@ -1393,7 +1430,7 @@ class ParallelAgent:
 
                     agg_node.is_buggy = False
                     agg_node.exp_results_dir = exp_results_dir
-                    agg_node_dict = agg_node.to_dict()
+                    agg_node_dict = agg_node.to_dict(inline_blobs=False)
                     agg_node_new = Node.from_dict(
                         agg_node_dict, self.journal
                     )  # to update the parent-child relationship in the journal
@@ -1401,7 +1438,7 @@ class ParallelAgent:
                     self.journal.append(agg_node_new)
                 finally:
                     if process_interpreter:
-                        process_interpreter.cleanup_session()
+                        process_interpreter.close()
 
             except Exception as e:
                 print(f"Error in seed result aggregation: {str(e)}")
@@ -1409,20 +1446,17 @@ class ParallelAgent:
     @staticmethod
     def _process_node_wrapper(
         node_data,
-        task_desc,
-        cfg,
-        gpu_id: int = None,
+        resource_slot: ResourceSlot = None,
         memory_summary: str = None,
-        evaluation_metrics=None,
-        stage_name=None,
         new_ablation_idea=None,
         new_hyperparam_idea=None,
-        best_stage3_plot_code=None,
-        best_stage2_plot_code=None,
-        best_stage1_plot_code=None,
         seed_eval=False,
     ):
-        """Wrapper function that creates a fresh environment for each process"""
+        """Wrapper function that creates a fresh environment for each process
+
+        Task-independent inputs (cfg, task description, metric, best-stage plot code)
+        come from the worker context installed by the pool initializer.
+        """
         from .interpreter import Interpreter
         from .journal import Node, Journal
         from copy import deepcopy
@@ -1430,6 +1464,14 @@ class ParallelAgent:
         import multiprocessing
 
         print("Starting _process_node_wrapper")
+        task_desc = _worker_context["task_desc"]
+        cfg = _worker_context["cfg"]
+        evaluation_metrics = _worker_context["evaluation_metrics"]
+        stage_name = _worker_context["stage_name"]
+        best_stage2_plot_code = _worker_context["best_stage2_plot_code"]
+        # The wrapper used to take these positionally and was always passed the
+        # stage-1 plot code in this slot, so stage 4 builds on the stage-1 plots
+        best_stage3_plot_code = _worker_context["best_stage1_plot_code"]
 
         # Create process-specific workspace
         process_id = multiprocessing.current_process().name
@@ -1440,9 +1482,13 @@ class ParallelAgent:
         working_dir = os.path.join(workspace, "working")
         os.makedirs(working_dir, exist_ok=True)
 
-        if gpu_id is not None:
-            os.environ["CUDA_VISIBLE_DEVICES"] = str(gpu_id)
-            logger.info(f"Process {process_id} assigned to GPU {gpu_id}")
+        if resource_slot is not None:
+            # pin this worker (and the interpreter it spawns) to its CPU set, GPU and
+            # thread counts so concurrent workers don't oversubscribe the machine
+            resource_slot.apply()
+            logger.info(
+                f"Process {process_id} assigned CPUs {resource_slot.cpus}, GPU {resource_slot.gpu_id}"
+            )
         else:
             os.environ["CUDA_VISIBLE_DEVICES"] = ""
             logger.info(f"Process {process_id} running on CPU")
@@ -1463,6 +1509,12 @@ class ParallelAgent:
             timeout=cfg.exec.timeout,
             format_tb_ipython=cfg.exec.format_tb_ipython,
             agent_file_name=cfg.exec.agent_file_name,
+            warm_start=getattr(cfg.exec, "warm_start", False),
+            preload_modules=(
+                list(cfg.exec.preload_modules)
+                if getattr(cfg.exec, "preload_modules", None) is not None
+                else None
+            ),
         )
 
         try:
@@ -1782,7 +1834,7 @@ class ParallelAgent:
 
             # Convert result node to dict
             print("Converting result to dict")
-            result_data = child_node.to_dict()
+            result_data = child_node.to_dict(inline_blobs=False)
             print(f"Result data keys: {result_data.keys()}")
             print(f"Result data size: {len(str(result_data))} chars")
             print("Returning result")
@@ -1794,6 +1846,8 @@ class ParallelAgent:
 
             traceback.print_exc()
             raise
+        finally:
+            process_interpreter.close()
 
     def _generate_hyperparam_tuning_idea(self) -> Optional[HyperparamTuningIdea]:
         """Generate the next hyperparam tuning idea based on what's been done.
@@ -1919,17 +1973,13 @@ class ParallelAgent:
         return AblationIdea(name="add one more layer", description="add one more layer")
 
     def _get_leaves(self, node: Node) -> List[Node]:
-        """Get all leaf nodes in the subtree rooted at node."""
-        if not node.children:
-            return [node]
-
-        leaves = []
-        for child in node.children:
-            leaves.extend(self._get_leaves(child))
-        return leaves
+        """Get all leaf nodes in the tree rooted at the draft node `node`."""
+        return self.journal.get_leaves(node)
 
-    def _select_parallel_nodes(self) -> List[Optional[Node]]:
-        """Select N nodes to process in parallel,
+    def _select_parallel_nodes(
+        self, num_nodes: Optional[int] = None
+    ) -> List[Optional[Node]]:
+        """Select N nodes to process in parallel (num_workers by default),
         balancing between tree exploration and exploitation.
         Note:
         - This function runs in the main process.
@@ -1940,16 +1990,33 @@ class ParallelAgent:
         - For Stage 1 and 3, we generate nodes in worker processes.
         """
         nodes_to_process = []
-        processed_trees = set()
         search_cfg = self.cfg.agent.search
+        if num_nodes is None:
+            num_nodes = self.num_workers
         print(f"[cyan]self.num_workers: {self.num_workers}, [/cyan]")
 
-        while len(nodes_to_process) < self.num_workers:
+        # Nodes still running (async scheduling) count as taken: their drafts
+        # towards num_drafts, their parents and trees as already being expanded
+        inflight_parents = list(self._inflight_parents.values())
+        num_pending_drafts = sum(1 for parent in inflight_parents if parent is None)
+        busy_parent_ids = {parent.id for parent in inflight_parents if parent is not None}
+        processed_trees = {
+            id(self.journal.get_root(parent))
+            for parent in inflight_parents
+            if parent is not None
+        }
+
+        while len(nodes_to_process) < num_nodes:
             # Initial drafting phase, creating root nodes
             print(
                 f"Checking draft nodes... num of journal.draft_nodes: {len(self.journal.draft_nodes)}, search_cfg.num_drafts: {search_cfg.num_drafts}"
             )
-            if len(self.journal.draft_nodes) < search_cfg.num_drafts:
+            num_drafts = (
+                len(self.journal.draft_nodes)
+                + num_pending_drafts
+                + nodes_to_process.count(None)
+            )
+            if num_drafts < search_cfg.num_drafts:
                 nodes_to_process.append(None)
                 continue
 
@@ -1983,7 +2050,9 @@ class ParallelAgent:
                         if (
                             isinstance(n, Node)
                             and n.is_leaf
-                            and n.debug_depth <= search_cfg.max_debug_depth
+                            and n.id not in busy_parent_ids
+                            and self.journal.get_debug_depth(n)
+                            <= search_cfg.max_debug_depth
                         )
                     ]
                 except Exception as e:
@@ -1991,15 +2060,14 @@ class ParallelAgent:
                 if debuggable_nodes:
                     print("Found debuggable nodes")
                     node = random.choice(debuggable_nodes)
-                    tree_root = node
-                    while tree_root.parent:
-                        tree_root = tree_root.parent
+                    tree_root = self.journal.get_root(node)
 
                     tree_id = id(tree_root)
                     if tree_id not in processed_trees or len(processed_trees) >= len(
                         viable_trees
                     ):
                         nodes_to_process.append(node)
+                        busy_parent_ids.add(node.id)
                         processed_trees.add(tree_id)
                         continue
 
@@ -2023,146 +2091,85 @@ class ParallelAgent:
 
                 # Get best node from unprocessed tree if possible
                 best_node = self.journal.get_best_node()
-                tree_root = best_node
-                while tree_root.parent:
-                    tree_root = tree_root.parent
+                tree_root = self.journal.get_root(best_node)
 
                 tree_id = id(tree_root)
-                if tree_id not in processed_trees or len(processed_trees) >= len(
-                    viable_trees
+                if best_node.id not in busy_parent_ids and (
+                    tree_id not in processed_trees
+                    or len(processed_trees) >= len(viable_trees)
                 ):
                     nodes_to_process.append(best_node)
+                    busy_parent_ids.add(best_node.id)
                     processed_trees.add(tree_id)
                     continue
 
                 # If we can't use best node (tree already processed), try next best nodes
-                for node in sorted(good_nodes, key=lambda n: n.metric, reverse=True):
-                    tree_root = node
-                    while tree_root.parent:
-                        tree_root = tree_root.parent
+                for node in self.journal.top_good_nodes():
+                    if node.id in busy_parent_ids:
+                        continue
+                    tree_root = self.journal.get_root(node)
                     tree_id = id(tree_root)
                     if tree_id not in processed_trees or len(processed_trees) >= len(
                         viable_trees
                     ):
                         nodes_to_process.append(node)
+                        busy_parent_ids.add(node.id)
                         processed_trees.add(tree_id)
                         break
+                else:
+                    # no free tree left: take the best good node not already being
+                    # improved, or the best node again if every one of them is
+                    idle = [
+                        n for n in self.journal.top_good_nodes()
+                        if n.id not in busy_parent_ids
+                    ]
+                    node = idle[0] if idle else best_node
+                    nodes_to_process.append(node)
+                    busy_parent_ids.add(node.id)
 
         return nodes_to_process
 
     def step(self, exec_callback: ExecCallbackType):
+        if self.scheduling == "async":
+            return self._step_async()
+
+        self._reap_abandoned()
+        free_slots = min(self.num_workers - len(self._abandoned), self.resources.free_slots)
+        if free_slots <= 0:
+            # every worker is held by a timed-out node that has not exited yet
+            wait(self._abandoned, timeout=self.timeout, return_when=FIRST_COMPLETED)
+            return
+
         print("Selecting nodes to process")
-        nodes_to_process = self._select_parallel_nodes()
+        nodes_to_process = self._select_parallel_nodes(num_nodes=free_slots)
         print(f"Selected nodes: {[n.id if n else None for n in nodes_to_process]}")
 
-        # Convert nodes to dicts
-        node_data_list = []
-        for node in nodes_to_process:
-            if node:
-                try:
-                    node_data = node.to_dict()
-                    _safe_pickle_test(node_data, f"node {node.id} data")
-                    node_data_list.append(node_data)
-                except Exception as e:
-                    logger.error(f"Error preparing node {node.id}: {str(e)}")
-                    raise
-            else:
-                node_data_list.append(None)  # None means new draft
-
-        memory_summary = self.journal.generate_summary(include_code=False)
+        node_data_list = self._prepare_node_data(nodes_to_process)
+        memory_summary = self._get_memory_summary()
 
         print("Submitting tasks to process pool")
         futures = []
         for node_data in node_data_list:
-            gpu_id = None
-            if self.gpu_manager is not None:
-                try:
-                    # Get current process ID for GPU assignment
-                    process_id = f"worker_{len(futures)}"
-                    gpu_id = self.gpu_manager.acquire_gpu(process_id)
-                    logger.info(f"Assigned GPU {gpu_id} to process {process_id}")
-                except RuntimeError as e:
-                    logger.warning(f"Could not acquire GPU: {e}. Running on CPU")
-
-            if (
-                self.stage_name
-                and self.stage_name.startswith("2_")
-                and node_data["is_buggy"] is False
-            ):
-                new_hyperparam_idea = self._generate_hyperparam_tuning_idea()
-                self._hyperparam_tuning_state["tried_hyperparams"].add(
-                    new_hyperparam_idea.name
-                )
-                new_ablation_idea = None
-            elif (
-                self.stage_name
-                and self.stage_name.startswith("4_")
-                and node_data["is_buggy"] is False
-            ):
-                new_ablation_idea = self._generate_ablation_idea()
-                self._ablation_state["completed_ablations"].add(new_ablation_idea.name)
-                new_hyperparam_idea = None
-            else:
-                new_ablation_idea = None
-                new_hyperparam_idea = None
-
-            best_stage1_plot_code = (
-                self.best_stage1_node.plot_code if self.best_stage1_node else None
-            )
-            best_stage2_plot_code = (
-                self.best_stage2_node.plot_code if self.best_stage2_node else None
-            )
-            best_stage3_plot_code = (
-                self.best_stage3_node.plot_code if self.best_stage3_node else None
-            )
-            seed_eval = False
-            futures.append(
-                self.executor.submit(
-                    self._process_node_wrapper,
-                    node_data,
-                    self.task_desc,
-                    self.cfg,
-                    gpu_id,
-                    memory_summary,
-                    self.evaluation_metrics,
-                    self.stage_name,
-                    new_ablation_idea,
-                    new_hyperparam_idea,
-                    best_stage1_plot_code,
-                    best_stage2_plot_code,
-                    best_stage3_plot_code,
-                    seed_eval,
-                )
-            )
+            # Get current process ID for GPU assignment; ids are never reused, since
+            # a timed-out worker keeps its slot until it exits
+            process_id = f"worker_{self._submission_count}"
+            self._submission_count += 1
+            futures.append((self._submit_node(node_data, memory_summary, process_id), process_id))
 
         # Add results to journal
         print("Waiting for results")
-        for i, future in enumerate(futures):
+        for future, process_id in futures:
+            timed_out = False
             try:
                 print("About to get result from future")
                 result_data = future.result(timeout=self.timeout)
-                if "metric" in result_data:
-                    print(f"metric type: {type(result_data['metric'])}")
-                    print(f"metric contents: {result_data['metric']}")
-
-                # Create node and restore relationships using journal.
-                # Journal acts as a database to look up a parent node,
-                # and add the result node as a child.
-                result_node = Node.from_dict(result_data, self.journal)
-                print("[red]Investigating if result node has metric[/red]", flush=True)
-                print(result_node.metric)
-                # Update hyperparam tuning state if in Stage 2
-                self._update_hyperparam_tuning_state(result_node)
-                # Update ablation state if in Stage 4
-                self._update_ablation_state(result_node)
-
-                # Add node to journal's list and assign its step number
-                self.journal.append(result_node)
-                print("Added result node to journal")
+                self._add_result_to_journal(result_data)
 
             except TimeoutError:
                 print("Worker process timed out, couldn't get the result")
-                logger.error(f"Worker process timed out, couldn't get the result")
+                logger.error("Worker process timed out, couldn't get the result")
+                timed_out = True
+                self._abandon(future, process_id)
             except Exception as e:
                 print(f"Error processing node: {str(e)}")
                 logger.error(f"Error processing node: {str(e)}")
@@ -2171,14 +2178,198 @@ class ParallelAgent:
                 traceback.print_exc()
                 raise
             finally:
-                # Release GPU for this process if it was using one
-                process_id = f"worker_{i}"
-                if (
-                    self.gpu_manager is not None
-                    and process_id in self.gpu_manager.gpu_assignments
-                ):
-                    self.gpu_manager.release_gpu(process_id)
-                    logger.info(f"Released GPU for process {process_id}")
+                # Release the resource slot held by this process (a timed-out
+                # worker keeps it until it exits, see _abandon)
+                if not timed_out:
+                    self._release_worker_resources(process_id)
+        logger.info(f"Resource utilization: {self.resources.utilization()}")
+
+    def _get_memory_summary(self) -> str:
+        """Return the latest finished memory summary and start folding newly added
+        nodes into it in the background, so submissions never wait on the LLM."""
+        if self._summary_future is not None and self._summary_future.done():
+            future, pending = self._summary_future, self._summary_pending
+            self._summary_future = self._summary_pending = None
+            try:
+                if not self.journal.commit_summary(pending, future.result()):
+                    logger.info("Discarding stale memory summary update")
+            except Exception as e:
+                logger.warning(f"Memory summary update failed, will retry: {e}")
+
+        if self._summary_future is None:
+            pending = self.journal.pending_summary_digests(include_code=False)
+            if pending["successes"] or pending["failures"]:
+                self._summary_pending = pending
+                self._summary_future = self._summary_executor.submit(
+                    Journal.summarize_digests, pending, self.journal.memory_summary
+                )
+
+        if not self.journal.nodes:
+            return "No experiments conducted yet."
+        return self.journal.memory_summary or ""
+
+    def _step_async(self):
+        """Continuous scheduling: refill free worker slots, then return as soon as
+        any in-flight node finishes instead of waiting for the whole batch."""
+        self._reap_abandoned()
+        free_slots = min(
+            self.num_workers - len(self._inflight) - len(self._abandoned),
+            self.resources.free_slots,
+        )
+        if free_slots > 0:
+            print(f"Selecting nodes for {free_slots} free worker slot(s)")
+            nodes_to_process = self._select_parallel_nodes(num_nodes=free_slots)
+            print(f"Selected nodes: {[n.id if n else None for n in nodes_to_process]}")
+
+            node_data_list = self._prepare_node_data(nodes_to_process)
+            memory_summary = self._get_memory_summary()
+
+            print("Submitting tasks to process pool")
+            for node, node_data in zip(nodes_to_process, node_data_list):
+                process_id = f"worker_{self._submission_count}"
+                self._submission_count += 1
+                future = self._submit_node(node_data, memory_summary, process_id)
+                self._inflight[future] = process_id
+                self._inflight_parents[future] = node
+
+        if not self._inflight:
+            # every worker is held by a timed-out node that has not exited yet
+            wait(self._abandoned, timeout=self.timeout, return_when=FIRST_COMPLETED)
+            return
+
+        print(f"Waiting for the first of {len(self._inflight)} in-flight node(s)")
+        done, _ = wait(self._inflight, timeout=self.timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            # nothing finished within the timeout, so every in-flight node has run
+            # for at least that long
+            print("Worker process timed out, couldn't get the result")
+            logger.error("Worker process timed out, couldn't get the result")
+            for future in list(self._inflight):
+                self._inflight_parents.pop(future, None)
+                self._abandon(future, self._inflight.pop(future))
+        self._collect_finished(done)
+
+    def _abandon(self, future: Future, process_id: str) -> None:
+        """Drop a timed-out node. A running worker can't be cancelled, so it keeps
+        its resource slot (and counts against num_workers) until it exits."""
+        if future.cancel():
+            self._release_worker_resources(process_id)
+        else:
+            self._abandoned[future] = process_id
+
+    def _reap_abandoned(self) -> None:
+        """Free the slots of timed-out nodes whose worker has finished; results are discarded."""
+        for future in [f for f in self._abandoned if f.done()]:
+            self._release_worker_resources(self._abandoned.pop(future))
+
+    def _collect_finished(self, done):
+        """Move finished futures into the journal and free their worker slots."""
+        for future in done:
+            process_id = self._inflight.pop(future)
+            self._inflight_parents.pop(future, None)
+            try:
+                self._add_result_to_journal(future.result())
+            except Exception as e:
+                print(f"Error processing node: {str(e)}")
+                logger.error(f"Error processing node: {str(e)}")
+                import traceback
+
+                traceback.print_exc()
+                raise
+            finally:
+                self._release_worker_resources(process_id)
+        logger.info(f"Resource utilization: {self.resources.utilization()}")
+
+    def drain(self):
+        """Wait for all in-flight nodes (async scheduling) and add them to the journal."""
+        if not self._inflight:
+            return
+        print(f"Draining {len(self._inflight)} in-flight node(s)")
+        done, not_done = wait(self._inflight, timeout=self.timeout)
+        self._collect_finished(done)
+        for future in not_done:
+            logger.error("Worker process timed out while draining, dropping its result")
+            self._inflight_parents.pop(future, None)
+            self._abandon(future, self._inflight.pop(future))
+        self._reap_abandoned()
+
+    def _prepare_node_data(self, nodes_to_process: List[Optional[Node]]) -> list:
+        """Convert nodes to dicts that can be shipped to worker processes."""
+        node_data_list = []
+        for node in nodes_to_process:
+            if node:
+                try:
+                    node_data_list.append(node.to_dict(inline_blobs=False))
+                except Exception as e:
+                    logger.error(f"Error preparing node {node.id}: {str(e)}")
+                    raise
+            else:
+                node_data_list.append(None)  # None means new draft
+        return node_data_list
+
+    def _submit_node(self, node_data, memory_summary: str, process_id: str) -> Future:
+        """Reserve a resource slot, pick a stage-specific idea for a node and submit it to the pool."""
+        resource_slot = self.resources.acquire(process_id)
+        if resource_slot is None:
+            # callers never select more nodes than there are free slots
+            raise RuntimeError(f"No free resource slot for process {process_id}")
+
+        if (
+            self.stage_name
+            and self.stage_name.startswith("2_")
+            and node_data["is_buggy"] is False
+        ):
+            new_hyperparam_idea = self._generate_hyperparam_tuning_idea()
+            self._hyperparam_tuning_state["tried_hyperparams"].add(
+                new_hyperparam_idea.name
+            )
+            new_ablation_idea = None
+        elif (
+            self.stage_name
+            and self.stage_name.startswith("4_")
+            and node_data["is_buggy"] is False
+        ):
+            new_ablation_idea = self._generate_ablation_idea()
+            self._ablation_state["completed_ablations"].add(new_ablation_idea.name)
+            new_hyperparam_idea = None
+        else:
+            new_ablation_idea = None
+            new_hyperparam_idea = None
+
+        return self.executor.submit(
+            self._process_node_wrapper,
+            node_data,
+            resource_slot,
+            memory_summary,
+            new_ablation_idea,
+            new_hyperparam_idea,
+        )
+
+    def _add_result_to_journal(self, result_data: dict) -> Node:
+        """Rebuild a worker result as a Node and append it to the journal."""
+        if "metric" in result_data:
+            print(f"metric type: {type(result_data['metric'])}")
+            print(f"metric contents: {result_data['metric']}")
+
+        # Create node and restore relationships using journal.
+        # Journal acts as a database to look up a parent node,
+        # and add the result node as a child.
+        result_node = Node.from_dict(result_data, self.journal)
+        print("[red]Investigating if result node has metric[/red]", flush=True)
+        print(result_node.metric)
+        # Update hyperparam tuning state if in Stage 2
+        self._update_hyperparam_tuning_state(result_node)
+        # Update ablation state if in Stage 4
+        self._update_ablation_state(result_node)
+
+        # Add node to journal's list and assign its step number
+        self.journal.append(result_node)
+        print("Added result node to journal")
+        return result_node
+
+    def _release_worker_resources(self, process_id: str):
+        """Return the CPU/memory/GPU slot held by this process"""
+        self.resources.release(process_id)
 
     def _update_hyperparam_tuning_state(self, result_node: Node):
         """Update hyperparam tuning tracking state based on execution results."""
@@ -2329,10 +2520,18 @@ class ParallelAgent:
         if not self._is_shutdown:
             print("Shutting down parallel executor...")
             try:
-                # Release all GPUs
-                if self.gpu_manager is not None:
-                    for process_id in list(self.gpu_manager.gpu_assignments.keys()):
-                        self.gpu_manager.release_gpu(process_id)
+                # Drop nodes still in flight (async scheduling)
+                for future in [*self._inflight, *self._abandoned]:
+                    future.cancel()
+                self._inflight.clear()
+                self._inflight_parents.clear()
+                self._abandoned.clear()
+
+                # Don't wait for a pending memory summary
+                self._summary_executor.shutdown(wait=False, cancel_futures=True)
+
+                # Release all resource slots
+                self.resources.release_all()
 
                 # Shutdown executor first
                 self.executor.shutdown(wait=False, cancel_futures=True)
@@ -2355,5 +2554,14 @@ class ParallelAgent:
             finally:
                 self._is_shutdown = True
 
+    def cleanup_after(self, future: Future) -> None:
+        """Defer the cleanup at `with` exit until `future` completes (e.g. a stage
+        finalization that still runs plot aggregation on this agent)."""
+        self._cleanup_after = future
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.cleanup()
+        if self._cleanup_after is not None:
+            # runs right away if the future is already done
+            self._cleanup_after.add_done_callback(lambda _: self.cleanup())
+        else:
+            self.cleanup()
@@ -131,7 +131,8 @@ def perform_experiments_bfts(config_path: str, debug: bool = False):
                     if journal.get_best_node()
                     else "None"
                 ),
-                "current_findings": journal.generate_summary(include_code=False),
+                # maintained in the background by ParallelAgent; never block the step on it
+                "current_findings": journal.memory_summary or "",
             }
 
             with open(notes_dir / "stage_progress.json", "w") as f:
@@ -0,0 +1,104 @@
+"""Content-addressed on-disk store for large node payloads (code, terminal output, ...)"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+# worker processes find the store through this env var (spawned workers don't
+# inherit module state)
+BLOB_DIR_ENV = "RUN_EXPERIMENT_BLOB_DIR"
+# values smaller than this (serialized) stay inline on the node
+BLOB_MIN_BYTES = 512
+# decoded text of recently loaded blobs kept in memory
+BLOB_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class BlobStore:
+    def __init__(self, root: Path | str, cache_bytes: int = BLOB_CACHE_BYTES):
+        Path(root).mkdir(parents=True, exist_ok=True)
+        self.root = Path(root).resolve()
+        self.cache_bytes = cache_bytes
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._cached_bytes = 0
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.json.gz"
+
+    def put_text(self, text: str) -> str:
+        """Store serialized JSON text and return its digest"""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write atomically: workers may store the same payload concurrently
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(text.encode("utf-8"), compresslevel=1))
+            os.replace(tmp_path, path)
+        return digest
+
+    def get_text(self, digest: str) -> str:
+        text = self._cache.get(digest)
+        if text is not None:
+            self._cache.move_to_end(digest)
+            return text
+        with open(self._path(digest), "rb") as f:
+            text = gzip.decompress(f.read()).decode("utf-8")
+        self._cache[digest] = text
+        self._cached_bytes += len(text)
+        while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= len(evicted)
+        return text
+
+    def get(self, digest: str) -> Any:
+        # decode on every access so callers never share (and mutate) a cached object
+        return json.loads(self.get_text(digest))
+
+
+_store: Optional[BlobStore] = None
+_stores_by_root: dict[str, BlobStore] = {}
+
+
+def set_blob_store(root: Path | str | None) -> Optional[BlobStore]:
+    """Enable (or with None, disable) payload offloading for this process and its workers"""
+    global _store
+    if root is None:
+        _store = None
+        os.environ.pop(BLOB_DIR_ENV, None)
+        return None
+    _store = BlobStore(root)
+    os.environ[BLOB_DIR_ENV] = str(_store.root)
+    return _store
+
+
+def get_blob_store() -> Optional[BlobStore]:
+    global _store
+    root = os.environ.get(BLOB_DIR_ENV)
+    if _store is None and root:
+        _store = BlobStore(root)
+    return _store
+
+
+def _store_at(root: str) -> BlobStore:
+    store = get_blob_store()
+    if store is None or str(store.root) != root:
+        store = _stores_by_root.get(root)
+        if store is None:
+            store = _stores_by_root[root] = BlobStore(root)
+    return store
+
+
+def load_blob(root: str, digest: str) -> Any:
+    """Load a blob from the store at `root` (e.g. a ref created by another process)"""
+    return _store_at(root).get(digest)
+
+
+def put_blob(root: str, value: Any) -> str:
+    """Store a JSON-serializable value in the store at `root` and return its digest"""
+    return _store_at(root).put_text(json.dumps(value, default=str))
@@ -69,6 +69,8 @@ class AgentConfig:
     num_workers: int
     type: str
     multi_seed_eval: dict[str, int]
+    scheduling: str = "batch"
+    overlap_stage_transitions: bool = False
 
 
 @dataclass
@@ -76,6 +78,15 @@ class ExecConfig:
     timeout: int
     agent_file_name: str
     format_tb_ipython: bool
+    # fork interpreter children from a forkserver with preload_modules already imported
+    warm_start: bool = False
+    preload_modules: Optional[list[str]] = None
+    # per-worker resource slots (None = split the machine evenly across workers)
+    cpus_per_worker: Optional[int] = None
+    mem_per_worker_mb: Optional[int] = None
+    pin_cpus: bool = True
+    # store large node payloads in <log_dir>/blobs and pass digests between processes
+    offload_node_payloads: bool = False
 
 
 @dataclass
@@ -173,6 +184,9 @@ def prep_cfg(cfg: Config):
     if cfg.agent.type not in ["parallel", "sequential"]:
         raise ValueError("agent.type must be either 'parallel' or 'sequential'")
 
+    if cfg.agent.scheduling not in ["batch", "async"]:
+        raise ValueError("agent.scheduling must be either 'batch' or 'async'")
+
     return cast(Config, cfg)
 
 
@@ -222,9 +236,9 @@ def save_run(cfg: Config, journal, stage_name: str = None):
     save_dir = cfg.log_dir / stage_name
     save_dir.mkdir(parents=True, exist_ok=True)
 
-    # save journal
+    # save journal (appends only the nodes added since the last save)
     try:
-        serialize.dump_json(journal, save_dir / "journal.json")
+        serialize.sync_journal_log(journal, save_dir / "journal.jsonl")
     except Exception as e:
         print(f"Error saving journal: {e}")
         raise
@@ -167,29 +167,48 @@ class MetricValue(DataClassJsonMixin):
                 # Single value case
                 assert isinstance(self.value, (float, int, np.number, np.floating))
                 self.value = float(self.value)
+        # metric values are treated as immutable once built: cache the scalar and
+        # direction that every comparison needs instead of re-parsing the dict
+        self._cache_comparison_values()
 
-    def __gt__(self, other) -> bool:
-        if self.value is None:
-            return False
-        if other.value is None:
-            return True
-
-        assert type(self) is type(other)
+    def _cache_comparison_values(self) -> None:
+        self._mean_value = self._compute_mean_value()
+        self._maximize = self._compute_should_maximize()
 
-        # Get mean values for comparison
-        self_val = self.get_mean_value()
-        other_val = other.get_mean_value()
+    def _cached(self, attr: str):
+        # metrics unpickled from older checkpoints don't have the cached values yet
+        if attr not in self.__dict__:
+            self._cache_comparison_values()
+        return self.__dict__[attr]
 
-        if self_val == other_val:
-            return False
-
-        # Determine if we should maximize or minimize
-        should_maximize = self._should_maximize()
-        comp = self_val > other_val
-        return comp if should_maximize else not comp
+    def __gt__(self, other) -> bool:
+        if self.value is not None and other.value is not None:
+            assert type(self) is type(other)
+        # better means a larger rank key, so sorting by rank_key and comparing agree
+        return self.rank_key() > other.rank_key()
+
+    def __lt__(self, other) -> bool:
+        # not derived by total_ordering, which would go through __eq__ (raw values)
+        if self.value is not None and other.value is not None:
+            assert type(self) is type(other)
+        return self.rank_key() < other.rank_key()
+
+    def rank_key(self) -> float:
+        """Scalar where larger is better, for sorting many metrics at once.
+
+        Defines the order of comparisons: the mean value, negated when minimizing.
+        Missing or NaN values rank last in either direction and tie with each other.
+        """
+        mean = self.get_mean_value()
+        if self.value is None or np.isnan(mean):
+            return float("-inf")
+        return mean if self._should_maximize() else -mean
 
     def _should_maximize(self) -> bool:
         """Determine if we should maximize based on the metric format"""
+        return self._cached("_maximize")
+
+    def _compute_should_maximize(self) -> bool:
         if isinstance(self.value, dict):
             # New format
             if "metric_names" in self.value:
@@ -301,6 +320,9 @@ class MetricValue(DataClassJsonMixin):
 
     def get_mean_value(self) -> float:
         """Get the mean value across all metrics and datasets"""
+        return self._cached("_mean_value")
+
+    def _compute_mean_value(self) -> float:
         if self.value is None:
             return float("nan")
         if isinstance(self.value, dict):
@@ -0,0 +1,189 @@
+"""CPU/memory/GPU slot scheduling for parallel tree-search workers"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("ai-scientist")
+
+# env vars that size the thread pools of numpy/torch/BLAS backends
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+]
+
+
+def available_cpus() -> List[int]:
+    """CPU ids this process may run on (respects cgroup/taskset restrictions)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def total_memory_mb() -> Optional[int]:
+    """Physical memory of the machine in MB, or None if it cannot be determined."""
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+@dataclass
+class ResourceSlot:
+    """Resources reserved for one worker task"""
+
+    process_id: str
+    cpus: List[int]
+    mem_mb: Optional[int] = None
+    gpu_id: Optional[int] = None
+    pin_cpus: bool = True
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that confine the task to this slot."""
+        env = {var: str(len(self.cpus)) for var in THREAD_ENV_VARS}
+        env["CUDA_VISIBLE_DEVICES"] = "" if self.gpu_id is None else str(self.gpu_id)
+        return env
+
+    def apply(self) -> None:
+        """Pin the calling (worker) process to this slot; children inherit it."""
+        os.environ.update(self.env())
+        if self.pin_cpus and self.cpus and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, self.cpus)
+            except OSError as e:
+                logger.warning(f"Could not pin {self.process_id} to CPUs {self.cpus}: {e}")
+
+
+@dataclass
+class ResourceScheduler:
+    """Hands out disjoint CPU sets, memory budgets and (optionally) GPUs to workers.
+
+    Replaces whole-GPU-only allocation: every task gets `cpus_per_worker` cores and
+    `mem_per_worker_mb` of the memory budget, plus a GPU when GPUs are present.
+    `acquire` returns None when resources are exhausted so callers can queue the
+    task until another one releases its slot.
+    """
+
+    num_workers: int
+    num_gpus: int = 0
+    cpus_per_worker: Optional[int] = None
+    mem_per_worker_mb: Optional[int] = None
+    pin_cpus: bool = True
+    cpus: List[int] = field(default_factory=available_cpus)
+    total_mem_mb: Optional[int] = field(default_factory=total_memory_mb)
+
+    def __post_init__(self):
+        if not self.cpus_per_worker:
+            # split the cores over the number of workers memory/GPUs can back
+            self.cpus_per_worker = max(1, len(self.cpus) // self._slot_limit())
+        self.cpus_per_worker = min(self.cpus_per_worker, len(self.cpus))
+        self.free_cpus: List[int] = list(self.cpus)
+        self.free_gpus: List[int] = list(range(self.num_gpus))
+        self.free_mem_mb = self.total_mem_mb
+        self.assignments: Dict[str, ResourceSlot] = {}
+        self._acquired_at: Dict[str, float] = {}
+        self.stats = {
+            "acquired": 0,
+            "queued": 0,  # acquire attempts refused for lack of resources
+            "peak_slots": 0,
+            "busy_seconds": 0.0,
+        }
+        self._started_at = time.time()
+
+    def _slot_limit(self) -> int:
+        """Number of concurrent slots allowed by workers, memory and GPUs."""
+        limits = [self.num_workers]
+        if self.mem_per_worker_mb and self.total_mem_mb:
+            limits.append(self.total_mem_mb // self.mem_per_worker_mb)
+        if self.num_gpus > 0:
+            limits.append(self.num_gpus)
+        return max(1, min(limits))
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of tasks that can hold a slot at the same time."""
+        return max(1, min(self._slot_limit(), len(self.cpus) // self.cpus_per_worker))
+
+    @property
+    def free_slots(self) -> int:
+        return self.capacity - len(self.assignments)
+
+    def acquire(self, process_id: str) -> Optional[ResourceSlot]:
+        """Reserve a slot for a task, or return None if resources are exhausted"""
+        if process_id in self.assignments:
+            return self.assignments[process_id]
+        needs_mem = self.mem_per_worker_mb and self.free_mem_mb is not None
+        if (
+            self.free_slots <= 0
+            or len(self.free_cpus) < self.cpus_per_worker
+            or (needs_mem and self.free_mem_mb < self.mem_per_worker_mb)
+            or (self.num_gpus > 0 and not self.free_gpus)
+        ):
+            self.stats["queued"] += 1
+            return None
+
+        cpus = self.free_cpus[: self.cpus_per_worker]
+        del self.free_cpus[: self.cpus_per_worker]
+        gpu_id = self.free_gpus.pop(0) if self.num_gpus > 0 else None
+        if needs_mem:
+            self.free_mem_mb -= self.mem_per_worker_mb
+        slot = ResourceSlot(
+            process_id=process_id,
+            cpus=cpus,
+            mem_mb=self.mem_per_worker_mb,
+            gpu_id=gpu_id,
+            pin_cpus=self.pin_cpus,
+        )
+        self.assignments[process_id] = slot
+        self._acquired_at[process_id] = time.time()
+        self.stats["acquired"] += 1
+        self.stats["peak_slots"] = max(self.stats["peak_slots"], len(self.assignments))
+        logger.info(f"Assigned CPUs {cpus} / GPU {gpu_id} to process {process_id}")
+        return slot
+
+    def release(self, process_id: str) -> None:
+        """Return the slot held by a task to the pool"""
+        slot = self.assignments.pop(process_id, None)
+        if slot is None:
+            return
+        self.stats["busy_seconds"] += time.time() - self._acquired_at.pop(process_id)
+        self.free_cpus = sorted(self.free_cpus + slot.cpus)
+        if slot.gpu_id is not None:
+            self.free_gpus = sorted(self.free_gpus + [slot.gpu_id])
+        if slot.mem_mb and self.free_mem_mb is not None:
+            self.free_mem_mb += slot.mem_mb
+        logger.info(f"Released resources of process {process_id}")
+
+    def release_all(self) -> None:
+        for process_id in list(self.assignments):
+            self.release(process_id)
+
+    def utilization(self) -> dict:
+        """Snapshot of current usage plus cumulative scheduling stats"""
+        elapsed = max(time.time() - self._started_at, 1e-9)
+        busy = self.stats["busy_seconds"] + sum(
+            time.time() - t for t in self._acquired_at.values()
+        )
+        used_mem = (
+            None
+            if self.free_mem_mb is None or self.total_mem_mb is None
+            else self.total_mem_mb - self.free_mem_mb
+        )
+        return {
+            "capacity": self.capacity,
+            "active_slots": len(self.assignments),
+            "cpus_in_use": len(self.cpus) - len(self.free_cpus),
+            "cpus_total": len(self.cpus),
+            "mem_in_use_mb": used_mem,
+            "mem_total_mb": self.total_mem_mb,
+            "gpus_in_use": self.num_gpus - len(self.free_gpus),
+            "gpus_total": self.num_gpus,
+            # average fraction of slots busy since the scheduler was created
+            "slot_utilization": busy / (elapsed * self.capacity),
+            **self.stats,
+        }
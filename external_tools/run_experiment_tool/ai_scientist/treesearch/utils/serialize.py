@@ -1,11 +1,17 @@
 import copy
 import json
+import logging
+import os
+import threading
 from pathlib import Path
 from typing import Type, TypeVar
 import re
 
 import dataclasses_json
-from ..journal import Journal, Node
+from ..journal import OFFLOADED_NODE_FIELDS, Journal, Node
+from .blob_store import BLOB_MIN_BYTES, BlobStore, get_blob_store
+
+logger = logging.getLogger("ai-scientist")
 
 
 def dumps_json(obj: dataclasses_json.DataClassJsonMixin):
@@ -36,6 +42,164 @@ def dump_json(obj: dataclasses_json.DataClassJsonMixin, path: Path):
         f.write(dumps_json(obj))
 
 
+class JournalLog:
+    """
+    Append-only JSONL log of a Journal: one record per node, in journal order,
+    carrying the node's parent edge. Each sync writes only the nodes appended since
+    the previous sync, so persisting a journal costs O(new nodes) instead of a
+    deepcopy + dump of the whole tree.
+
+    A log found on disk (reused log dir, resumed run) is only appended to after its
+    records are checked against the journal: records from the first node id that
+    differs onwards are truncated and rewritten.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.node_ids: list[str] = []  # id of each node record in the log
+        self._record_ends: list[int] = []  # byte offset just past each record
+        self._validated = False
+        # save_run may sync from a background stage finalization too
+        self._lock = threading.Lock()
+        if self.path.exists():
+            offset = 0
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn write from an interrupted run
+                    try:
+                        node_id = json.loads(line)["node"]["id"]
+                    except (ValueError, KeyError, TypeError):
+                        break  # unreadable record; everything from here is rewritten
+                    offset += len(line)
+                    self.node_ids.append(node_id)
+                    self._record_ends.append(offset)
+            if offset != self.path.stat().st_size:
+                os.truncate(self.path, offset)
+
+    @property
+    def num_nodes(self) -> int:
+        """Number of node records in the log."""
+        return len(self.node_ids)
+
+    @property
+    def offset(self) -> int:
+        """Byte offset just past the last complete record."""
+        return self._record_ends[-1] if self._record_ends else 0
+
+    def _truncate(self, num_nodes: int) -> None:
+        del self.node_ids[num_nodes:]
+        del self._record_ends[num_nodes:]
+        os.truncate(self.path, self.offset)
+
+    def _validate(self, journal: Journal) -> None:
+        """Drop logged records that are not a prefix of the journal's nodes."""
+        keep = 0
+        for node_id, node in zip(self.node_ids, journal.nodes):
+            if node_id != node.id:
+                break
+            keep += 1
+        if keep < self.num_nodes:
+            logger.warning(
+                f"{self.path}: {self.num_nodes - keep} logged node(s) do not match the journal, rewriting them"
+            )
+            self._truncate(keep)
+        self._validated = True
+
+    def sync(self, journal: Journal) -> int:
+        """Append the journal's not-yet-logged nodes and return the new byte offset."""
+        with self._lock:
+            return self._sync(journal)
+
+    def _sync(self, journal: Journal) -> int:
+        # full check once per log; afterwards the last logged node is enough to
+        # notice a journal that was replaced under us
+        if not self._validated or (
+            self.num_nodes
+            and (
+                len(journal.nodes) < self.num_nodes
+                or journal.nodes[self.num_nodes - 1].id != self.node_ids[-1]
+            )
+        ):
+            self._validate(journal)
+        new_nodes = journal.nodes[self.num_nodes :]
+        if not new_nodes:
+            return self.offset
+
+        lines = []
+        for node in new_nodes:
+            node_dict = node.to_dict()
+            # edges are stored once, on the child; children are rebuilt on load
+            node_dict.pop("children", None)
+            lines.append(json.dumps({"node": node_dict}, separators=(",", ":")) + "\n")
+        data = [line.encode("utf-8") for line in lines]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(b"".join(data))
+        offset = self.offset
+        for node, line in zip(new_nodes, data):
+            offset += len(line)
+            self.node_ids.append(node.id)
+            self._record_ends.append(offset)
+        return self.offset
+
+
+_journal_logs: dict[Path, JournalLog] = {}
+_journal_logs_lock = threading.Lock()
+
+
+def sync_journal_log(journal: Journal, path: Path) -> JournalLog:
+    """Append new journal nodes to the log at `path`, reusing one JournalLog per file."""
+    path = Path(path).resolve()
+    with _journal_logs_lock:
+        if path not in _journal_logs:
+            _journal_logs[path] = JournalLog(path)
+        journal_log = _journal_logs[path]
+    journal_log.sync(journal)
+    return journal_log
+
+
+def iter_journal_log(path: Path, num_nodes: int | None = None):
+    """Yield node dicts from a journal log, stopping after `num_nodes` records."""
+    with open(path, "r") as f:
+        for i, line in enumerate(f):
+            if num_nodes is not None and i >= num_nodes:
+                return
+            if not line.endswith("\n"):
+                return
+            yield json.loads(line)["node"]
+
+
+def load_journal_log(path: Path, num_nodes: int | None = None, blob_dir: Path | None = None) -> Journal:
+    """
+    Rebuild a Journal from a journal log, one record at a time: each record is parsed,
+    turned into a Node and linked into the journal before the next line is read, and
+    only up to `num_nodes` records (e.g. the count stored in a checkpoint) are read.
+
+    Large payloads (code, terminal output, ...) go to a blob store as they stream in,
+    so the rebuilt journal holds only the scheduling fields in memory: the active
+    store, else `blob_dir`, else the run's store next to the stage logs
+    (<log_dir>/blobs, which already holds the payloads of a run that used one).
+    """
+    path = Path(path)
+    store = get_blob_store()
+    if store is None:
+        store = BlobStore(blob_dir if blob_dir is not None else path.resolve().parent.parent / "blobs")
+    journal = Journal()
+    for node_dict in iter_journal_log(path, num_nodes):
+        for name in OFFLOADED_NODE_FIELDS:
+            value = node_dict.get(name)
+            if value is None or (isinstance(value, dict) and "__blob__" in value):
+                continue
+            text = json.dumps(value, default=str)
+            if len(text) >= BLOB_MIN_BYTES:
+                node_dict[name] = {"__blob__": store.put_text(text), "root": str(store.root)}
+        # from_dict looks the parent up in the journal and restores both links
+        journal.append(Node.from_dict(node_dict, journal))
+    return journal
+
+
 G = TypeVar("G", bound=dataclasses_json.DataClassJsonMixin)
 
 
@@ -49,6 +213,7 @@ def loads_json(s: str, cls: Type[G]) -> G:
         for child_id, parent_id in obj_dict["node2parent"].items():
             id2nodes[child_id].parent = id2nodes[parent_id]
             id2nodes[child_id].__post_init__()
+        obj.reindex()
     return obj
 
 
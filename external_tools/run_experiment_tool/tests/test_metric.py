@@ -0,0 +1,35 @@
+import math
+
+from ai_scientist.treesearch.utils.metric import MetricValue, WorstMetricValue
+
+
+def test_nan_ranks_last_when_minimizing():
+    nan = MetricValue(math.nan, maximize=False)
+    low = MetricValue(0.1, maximize=False)
+    high = MetricValue(5.0, maximize=False)
+
+    assert low > high and not high > low
+    assert low > nan and high > nan
+    assert not nan > low and not nan > high
+    assert max([nan, high, low]) is low
+    assert max([low, high, nan]) is low
+    assert sorted([nan, high, low], key=MetricValue.rank_key) == [nan, high, low]
+
+
+def test_nan_ranks_last_when_maximizing():
+    nan = MetricValue(math.nan, maximize=True)
+    good = MetricValue(0.9, maximize=True)
+
+    assert good > nan and not nan > good
+    assert good.rank_key() > nan.rank_key()
+
+
+def test_rank_key_agrees_with_comparisons():
+    for maximize in (True, False):
+        metrics = [
+            MetricValue(v, maximize=maximize) for v in (math.nan, -1.0, 0.0, 2.5, math.nan)
+        ] + [WorstMetricValue()]
+        for a in metrics:
+            for b in metrics:
+                assert (a > b) == (a.rank_key() > b.rank_key())
+                assert (a < b) == (a.rank_key() < b.rank_key())
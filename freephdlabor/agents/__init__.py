@@ -1,12 +1,20 @@
 """
 AI research agents using smolagents framework.
+
+Agent classes are imported on first access: each agent module pulls in its
+toolkits, and importing one agent (e.g. the ManagerAgent) should not load them all.
 """
 
-from .base_research_agent import BaseResearchAgent
-from .ideation_agent import IdeationAgent
-from .experimentation_agent import ExperimentationAgent
-from .writeup_agent import WriteupAgent
-from .manager_agent import ManagerAgent
+import importlib
+
+_AGENT_MODULES = {
+    "BaseResearchAgent": ".base_research_agent",
+    "IdeationAgent": ".ideation_agent",
+    "ExperimentationAgent": ".experimentation_agent",
+    "WriteupAgent": ".writeup_agent",
+    "ManagerAgent": ".manager_agent",
+    "LazyAgent": ".lazy_agent",
+}
 
 __all__ = [
     "BaseResearchAgent",
@@ -14,4 +22,11 @@ __all__ = [
     "ExperimentationAgent", 
     "WriteupAgent",
     "ManagerAgent",
+    "LazyAgent",
 ]
+
+
+def __getattr__(name):
+    if name in _AGENT_MODULES:
+        return getattr(importlib.import_module(_AGENT_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,6 +8,7 @@ Python code execution.
 
 import os
 import json
+import threading
 from smolagents import CodeAgent
 from smolagents.agents import PlanningPromptTemplate
 from ..interpreters import WorkspacePythonExecutor
@@ -44,6 +45,8 @@ class BaseResearchAgent(CodeAgent):
         self.agent_name = agent_name
         self.back_up_agent_name = agent_name
         self.workspace_dir = workspace_dir
+        # Held while the agent runs a managed-agent task (see __call__)
+        self.call_lock = threading.Lock()
         
         # Create agent-specific folder in workspace
         if workspace_dir:
@@ -72,7 +75,8 @@ class BaseResearchAgent(CodeAgent):
                 model=model,  # Use original model for compaction and context limit detection
                 token_threshold=token_threshold,  # Auto-calculated if None
                 keep_recent_steps=keep_recent_steps,
-                safety_margin=safety_margin
+                safety_margin=safety_margin,
+                usage_metrics=getattr(logged_model, 'usage_metrics', None)  # Exact prompt sizes from the logging wrapper
             )
             # Add to existing callbacks or create new list
             step_callbacks = kwargs.get('step_callbacks', [])
@@ -121,6 +125,32 @@ class BaseResearchAgent(CodeAgent):
             **kwargs
         )
         
+    def __call__(self, task: str, **kwargs):
+        """
+        Run a task delegated by the manager, one at a time.
+
+        The manager reaches a managed agent both through dispatch_agents (on a
+        dispatcher thread) and by calling it from its own code; both paths land
+        here, so a task sent to a busy agent waits for it instead of running on
+        the same memory and executor concurrently.
+        """
+        with self.call_lock:
+            return super().__call__(task, **kwargs)
+
+    def _step_stream(self, memory_step):
+        """
+        Run one step, publishing the provider-reported usage of its model call.
+
+        The context compactor sizes the agent's context from that usage; planning,
+        final-answer and other calls through the same model are not recorded.
+        """
+        usage_metrics = getattr(self.model, 'usage_metrics', None)
+        if usage_metrics is None:
+            yield from super()._step_stream(memory_step)
+            return
+        with usage_metrics.step_calls():
+            yield from super()._step_stream(memory_step)
+
     def create_python_executor(self):
         """
         Override to use WorkspacePythonExecutor that runs code in workspace directory.
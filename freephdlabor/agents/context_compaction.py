@@ -14,7 +14,7 @@ Features:
 import time
 import json
 import os
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from smolagents.memory import ActionStep, MemoryStep
 from smolagents.monitoring import Timing
 
@@ -84,6 +84,88 @@ MODEL_CONTEXT_LIMITS = {
 }
 
 
+# Tokenizer registry: model-id prefix -> factory(model_id) returning a count(text) -> int callable.
+# Register provider tokenizers here (e.g. register_tokenizer("my-model", hf_tokenizer_factory("org/tok"))).
+TOKENIZER_FACTORIES: Dict[str, Callable[[str], Callable[[str], int]]] = {}
+
+# Approximate per-message framing overhead (role markers, separators) in tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Counts made without the model's own tokenizer (another tokenizer or chars/4) are
+# scaled up by this factor so compaction still triggers before the real limit
+APPROXIMATE_COUNT_MARGIN = 1.15
+
+
+def register_tokenizer(prefix: str, factory: Callable[[str], Callable[[str], int]]) -> None:
+    """Register a tokenizer factory for all model ids starting with prefix."""
+    TOKENIZER_FACTORIES[prefix] = factory
+
+
+def tiktoken_factory(model_id: str) -> Callable[[str], int]:
+    """tiktoken counter for OpenAI models (raises KeyError for models tiktoken does not know)."""
+    import tiktoken
+    encoding = tiktoken.encoding_for_model(model_id.split('/')[-1])
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def _approximate_tiktoken_counter() -> Callable[[str], int]:
+    import tiktoken
+    encoding = tiktoken.get_encoding("o200k_base")
+    return lambda text: int(len(encoding.encode(text, disallowed_special=())) * APPROXIMATE_COUNT_MARGIN)
+
+
+def hf_tokenizer_factory(tokenizer_name: str) -> Callable[[str], Callable[[str], int]]:
+    """Build a factory that counts tokens with a HuggingFace tokenizer."""
+    def factory(model_id: str) -> Callable[[str], int]:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+        return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+    return factory
+
+
+def _heuristic_token_count(text: str) -> int:
+    return int(len(text) // 4 * APPROXIMATE_COUNT_MARGIN)
+
+
+for _prefix in ("gpt-", "o1", "o3", "o4", "openai/"):
+    register_tokenizer(_prefix, tiktoken_factory)
+
+
+def _get_model_id(model) -> str:
+    if hasattr(model, 'model_id'):
+        return model.model_id
+    if hasattr(model, 'model'):
+        return model.model
+    return model if isinstance(model, str) else str(model)
+
+
+def get_token_counter(model) -> Callable[[str], int]:
+    """
+    Resolve a token counting function for a model.
+
+    Uses the longest matching prefix in TOKENIZER_FACTORIES. Models without a
+    registered tokenizer (e.g. Claude, Gemini) are approximated with tiktoken's
+    o200k_base, or a chars/4 heuristic if tiktoken is unavailable; approximate
+    counts include APPROXIMATE_COUNT_MARGIN.
+    """
+    model_id = _get_model_id(model)
+    factories = [TOKENIZER_FACTORIES[p] for p in sorted(TOKENIZER_FACTORIES, key=len, reverse=True) if model_id.startswith(p)]
+    for factory in factories:
+        try:
+            return factory(model_id)
+        except Exception as e:
+            print(f"⚠️ Tokenizer unavailable for '{model_id}' ({e}), trying fallback")
+    try:
+        counter = _approximate_tiktoken_counter()
+        print(f"⚠️ No tokenizer for '{model_id}': token counts are o200k_base approximations "
+              f"(+{APPROXIMATE_COUNT_MARGIN - 1:.0%} margin)")
+        return counter
+    except Exception:
+        print(f"⚠️ No tokenizer for '{model_id}': token counts are chars/4 estimates "
+              f"(+{APPROXIMATE_COUNT_MARGIN - 1:.0%} margin)")
+        return _heuristic_token_count
+
+
 def detect_runtime_context_limit(model) -> Optional[int]:
     """
     Attempt to detect context limit at runtime via API or model attributes.
@@ -151,14 +233,7 @@ def get_model_context_limit(model) -> int:
     print(f"🔄 Falling back to static context limit mapping...")
     
     # Extract model_id from model object or use string directly
-    if hasattr(model, 'model_id'):
-        model_id = model.model_id
-    elif hasattr(model, 'model'):
-        model_id = model.model
-    elif isinstance(model, str):
-        model_id = model
-    else:
-        model_id = str(model)
+    model_id = _get_model_id(model)
     
     # Clean model_id (remove provider prefixes)
     clean_model_id = model_id
@@ -202,7 +277,7 @@ class AutomaticContextCompactor:
     - Configurable thresholds: Adapts to different model contexts
     """
     
-    def __init__(self, agent_instance, max_tokens: Optional[int] = None, min_steps_between_compaction: int = 3, storage_dir: Optional[str] = None, safety_margin: float = 0.75):
+    def __init__(self, agent_instance, max_tokens: Optional[int] = None, min_steps_between_compaction: int = 3, storage_dir: Optional[str] = None, safety_margin: float = 0.75, usage_metrics=None):
         """
         Initialize automatic compaction system.
         
@@ -212,8 +287,10 @@ class AutomaticContextCompactor:
             min_steps_between_compaction: Minimum steps between compactions
             storage_dir: Directory for external memory storage (defaults to workspace_dir/memory_backup)
             safety_margin: Fraction of model context to use before compaction
+            usage_metrics: Optional TokenUsageMetrics published by the agent's logging model
         """
         self.agent = agent_instance
+        self.usage_metrics = usage_metrics
         self.min_steps_between_compaction = min_steps_between_compaction
         self.safety_margin = safety_margin
         
@@ -244,11 +321,27 @@ class AutomaticContextCompactor:
         self.compaction_count = 0
         self.last_compaction_step = 0
         self.step_count = 0
+        # Provider call count at the last compaction; usage reported before it is stale
+        self.last_compaction_call_count = 0
         
         # Memory backup tracking
         self.backup_file = os.path.join(self.storage_dir, 'full_conversation_backup.jsonl')
         self.last_backed_up_step = 0
         
+    def provider_prompt_tokens(self) -> Optional[int]:
+        """
+        Exact prompt size of the agent's last model call, as reported by the provider.
+        
+        Returns:
+            Optional[int]: Prompt tokens, or None if unavailable or stale after a compaction
+        """
+        metrics = self.usage_metrics
+        if metrics is None or metrics.last_prompt_tokens is None:
+            return None
+        if metrics.call_count <= self.last_compaction_call_count:
+            return None
+        return metrics.last_prompt_tokens
+    
     def should_compact(self, current_tokens: int) -> bool:
         """
         Determine if compaction should be triggered.
@@ -600,6 +693,8 @@ class AutomaticContextCompactor:
         """
         self.compaction_count += 1
         self.last_compaction_step = self.step_count
+        if self.usage_metrics is not None:
+            self.last_compaction_call_count = self.usage_metrics.call_count
         
         print(f"\n🧠 PERFORMING AUTOMATIC CONTEXT COMPACTION #{self.compaction_count}")
         print(f"   📊 Current tokens: {current_tokens:,}")
@@ -671,7 +766,7 @@ class ContextMonitoringCallback:
     Integrates with any BaseResearchAgent to provide automatic context management.
     """
     
-    def __init__(self, model, token_threshold: Optional[int] = None, keep_recent_steps: int = 3, storage_dir: Optional[str] = None, safety_margin: float = 0.75):
+    def __init__(self, model, token_threshold: Optional[int] = None, keep_recent_steps: int = 3, storage_dir: Optional[str] = None, safety_margin: float = 0.75, usage_metrics=None):
         """
         Initialize context monitoring with automatic compaction.
         
@@ -681,8 +776,10 @@ class ContextMonitoringCallback:
             keep_recent_steps: Number of recent steps to preserve during compaction
             storage_dir: Directory for external memory storage
             safety_margin: Fraction of model context to use before compaction (0.75 = 75%)
+            usage_metrics: Optional TokenUsageMetrics with provider-reported token usage
         """
         self.model = model
+        self.usage_metrics = usage_metrics
         self.keep_recent_steps = keep_recent_steps
         self.storage_dir = storage_dir
         self.safety_margin = safety_margin
@@ -699,6 +796,17 @@ class ContextMonitoringCallback:
         self.agent = None
         self.compactor = None
         
+        # Running token count over memory.steps, which only grows between compactions:
+        # steps past the cursor are tokenized once and added; a compaction or a new
+        # steps list (memory reset) invalidates the count, which is then rebuilt
+        self.count_tokens = get_token_counter(model)
+        self._counted_steps: Optional[list] = None  # the memory.steps list the count covers
+        self._counted_cursor = 0
+        self._system_prompt_step = None
+        self._running_tokens = 0
+        # Step handed to the callback before smolagents appends it to memory
+        self._pending_step: Optional[Tuple[MemoryStep, int]] = None
+        
     def __call__(self, memory_step: MemoryStep, agent=None) -> None:
         """
         Callback triggered after each memory step.
@@ -715,7 +823,8 @@ class ContextMonitoringCallback:
                 max_tokens=self.token_threshold,
                 min_steps_between_compaction=self.keep_recent_steps,
                 storage_dir=self.storage_dir,
-                safety_margin=self.safety_margin
+                safety_margin=self.safety_margin,
+                usage_metrics=self.usage_metrics
             )
         
         # Only monitor ActionSteps
@@ -736,70 +845,115 @@ class ContextMonitoringCallback:
         except Exception as e:
             print(f"   ⚠️ Failed to backup step: {e}")
         
-        # Estimate current tokens using simple method
+        # Update the running token count with the steps added since the last call
         try:
-            # Simple token estimation based on memory size
-            current_tokens = self._estimate_tokens_simple()
-            print(f"📊 Step {self.compactor.step_count}: ~{current_tokens:,} tokens")
+            current_tokens = self._update_token_count(memory_step)
+            prompt_tokens = self.compactor.provider_prompt_tokens()
+            if prompt_tokens is not None:
+                # Exact size of the last prompt plus the step it produced
+                step_entry = self._pending_step
+                current_tokens = prompt_tokens + (step_entry[1] if step_entry and step_entry[0] is memory_step else 0)
+                print(f"📊 Step {self.compactor.step_count}: {current_tokens:,} tokens (provider-reported)")
+            else:
+                print(f"📊 Step {self.compactor.step_count}: ~{current_tokens:,} tokens")
             
             # Check if compaction needed
             if self.compactor.should_compact(current_tokens):
                 self.compactor.perform_compaction(current_tokens)
+                self.invalidate_token_count()
+                new_tokens = self._update_token_count(memory_step)
+                print(f"   📉 Tokens after compaction: ~{new_tokens:,}")
             else:
                 print(f"   ✅ No compaction needed (threshold: {self.compactor.max_tokens:,})")
                 
         except Exception as e:
             print(f"   ⚠️ Token estimation failed: {e}")
     
-    def _estimate_tokens_simple(self) -> int:
+    def invalidate_token_count(self) -> None:
+        """Forget the running count, e.g. after memory.steps was rewritten by a compaction."""
+        self._counted_steps = None
+        self._counted_cursor = 0
+        self._system_prompt_step = None
+        self._running_tokens = 0
+
+    def _update_token_count(self, memory_step: Optional[MemoryStep] = None) -> int:
         """
-        Simple token estimation based on total memory content.
+        Incrementally update the token count of the agent's current context.
         
+        Only the steps appended since the last call are tokenized; the count is
+        rebuilt after invalidate_token_count() or when memory.steps is replaced.
+        
+        Args:
+            memory_step: The step that was just completed, in case it is not yet in memory
+            
         Returns:
-            int: Estimated token count
+            int: Current token count
         """
         if not self.agent or not hasattr(self.agent, 'memory'):
             return 0
         
-        total_chars = 0
-        
-        # Count characters in all steps
-        for step in self.agent.memory.steps:
-            if hasattr(step, 'to_messages'):
-                messages = step.to_messages()
-                for msg in messages:
-                    # Handle both ChatMessage objects and dictionary format
-                    if hasattr(msg, 'content'):
-                        # New ChatMessage object format
-                        content = msg.content
-                    elif isinstance(msg, dict):
-                        # Old dictionary format
-                        content = msg.get('content', '')
-                    else:
-                        content = ''
-                        
-                    if isinstance(content, str):
-                        total_chars += len(content)
-                    elif isinstance(content, list):
-                        for item in content:
-                            if isinstance(item, dict):
-                                if hasattr(item, 'get') and item.get('type') == 'text':
-                                    total_chars += len(item.get('text', ''))
-                                elif hasattr(item, 'type') and item.type == 'text':
-                                    # Handle object-style access
-                                    total_chars += len(getattr(item, 'text', ''))
-        
-        # Add tool schema overhead (approximate)
-        if hasattr(self.agent, 'tools_and_managed_agents'):
-            tool_count = len(self.agent.tools_and_managed_agents)
-            tool_overhead = tool_count * 500  # Rough estimate per tool
-            total_chars += tool_overhead
-        
-        # Convert to tokens (chars / 4) + constant overhead
-        estimated_tokens = total_chars // 4
-        
-        # Add empirically determined constant overhead (~3,500 tokens)
-        # This accounts for system prompts, tool schemas, formatting overhead
-        constant_overhead = 3500
-        
-        return estimated_tokens + constant_overhead
\ No newline at end of file
+        steps = self.agent.memory.steps
+        if steps is not self._counted_steps or len(steps) < self._counted_cursor:
+            self.invalidate_token_count()
+            self._counted_steps = steps
+
+        system_prompt = getattr(self.agent.memory, 'system_prompt', None)
+        if system_prompt is not self._system_prompt_step:
+            if self._system_prompt_step is not None:
+                self._running_tokens -= self._count_step_tokens(self._system_prompt_step)
+            if system_prompt is not None:
+                self._running_tokens += self._count_step_tokens(system_prompt)
+            self._system_prompt_step = system_prompt
+
+        pending = self._pending_step
+        for step in steps[self._counted_cursor:]:
+            if pending is not None and step is pending[0]:
+                self._running_tokens += pending[1]
+                pending = None
+            else:
+                self._running_tokens += self._count_step_tokens(step)
+        self._counted_cursor = len(steps)
+
+        if memory_step is not None and not (steps and steps[-1] is memory_step):
+            # counted now, and again only via _pending_step once it is appended
+            if pending is None or pending[0] is not memory_step:
+                pending = (memory_step, self._count_step_tokens(memory_step))
+            self._pending_step = pending
+            return self._running_tokens + pending[1]
+        self._pending_step = None
+        return self._running_tokens
+    
+    def _count_step_tokens(self, step: MemoryStep) -> int:
+        """
+        Count the tokens a single memory step contributes to the model input.
+        
+        Args:
+            step: Memory step to count
+            
+        Returns:
+            int: Token count of the step's messages
+        """
+        if not hasattr(step, 'to_messages'):
+            return 0
+        
+        tokens = 0
+        for msg in step.to_messages():
+            # Handle both ChatMessage objects and dictionary format
+            if hasattr(msg, 'content'):
+                content = msg.content
+            elif isinstance(msg, dict):
+                content = msg.get('content', '')
+            else:
+                content = ''
+            
+            tokens += MESSAGE_OVERHEAD_TOKENS
+            if isinstance(content, str):
+                tokens += self.count_tokens(content)
+            elif isinstance(content, list):
+                for item in content:
+                    if isinstance(item, dict) and item.get('type') == 'text':
+                        tokens += self.count_tokens(item.get('text', ''))
+                    elif getattr(item, 'type', None) == 'text':
+                        tokens += self.count_tokens(getattr(item, 'text', ''))
+        
+        return tokens
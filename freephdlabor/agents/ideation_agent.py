@@ -60,6 +60,7 @@ class IdeationAgent(BaseResearchAgent):
         # Initialize tools - these are the primary executors
         # NOTE: Tools get raw model for efficiency, agents use LoggingLiteLLMModel for decision tracking
         from ..toolkits.model_utils import get_raw_model
+        from ..toolkits.tool_registry import shared_tool
         raw_model = get_raw_model(model)
         
         tools = [
@@ -70,7 +71,7 @@ class IdeationAgent(BaseResearchAgent):
             FetchArxivPapersTool(working_dir=workspace_dir),  # Pass workspace_dir for proper file organization
             GenerateIdeaTool(model=raw_model),  # Tools use raw model for efficiency
             RefineIdeaTool(model=raw_model),  # Tools use raw model for efficiency
-            VLMDocumentAnalysisTool(model=raw_model, working_dir=workspace_dir),  # Superior PDF analysis with visual understanding
+            shared_tool(VLMDocumentAnalysisTool, model=raw_model, working_dir=workspace_dir),  # Superior PDF analysis with visual understanding
         ]
         
         # Add file editing tools if workspace_dir is provided
@@ -0,0 +1,65 @@
+"""
+LazyAgent - placeholder for a managed agent that is built on first delegation.
+
+Constructing a specialist agent imports its toolkits (VLM, citation, LaTeX,
+plotting, ...), builds its tools and logging model and resumes its memory.
+Most runs only reach some agents hours into the run, so initialize_agent_system
+hands the ManagerAgent these proxies instead: they carry the name and
+description the manager's prompt needs and build the real agent the first time
+the manager calls it (or any other attribute is needed).
+"""
+
+import threading
+from typing import Any, Callable, Optional
+
+
+class LazyAgent:
+    """Proxy for a managed agent, built by `factory()` on first use."""
+
+    def __init__(self, name: str, description: str, factory: Callable[[], Any]):
+        self.name = name
+        self.description = description
+        self._factory = factory
+        self._agent: Optional[Any] = None
+        self._build_lock = threading.Lock()
+        # Set by CodeAgent when the proxy is registered as a managed agent
+        self.inputs: Optional[dict] = None
+        self.output_type: Optional[str] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._agent is not None
+
+    @property
+    def agent(self) -> Any:
+        """The real agent, constructing it on first access."""
+        if self._agent is None:
+            with self._build_lock:
+                if self._agent is None:
+                    print(f"🔧 Building {self.name} on first delegation...")
+                    agent = self._factory()
+                    # keep the call signature the manager registered on the proxy
+                    if self.inputs is not None:
+                        agent.inputs = self.inputs
+                        agent.output_type = self.output_type
+                    self._agent = agent
+                    print(f"✅ {self.name} initialized")
+        return self._agent
+
+    def __call__(self, *args, **kwargs):
+        return self.agent(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        # only reached for attributes the proxy itself does not define
+        if name.startswith("__") or name in ("_agent", "_factory", "_build_lock"):
+            raise AttributeError(name)
+        return getattr(self.agent, name)
+
+    def save_memory(self):
+        # nothing to save for an agent that never ran
+        if self._agent is not None:
+            self._agent.save_memory()
+
+    def __repr__(self) -> str:
+        state = "built" if self.is_built else "not built"
+        return f"LazyAgent(name='{self.name}', {state})"
@@ -6,12 +6,6 @@ Orchestrates IdeationAgent and other agents in the multi-agent system.
 import os
 from typing import List
 from .base_research_agent import BaseResearchAgent
-
-from .reviewer_agent import ReviewerAgent
-from .ideation_agent import IdeationAgent
-from .experimentation_agent import ExperimentationAgent
-from .resource_preparation_agent import ResourcePreparationAgent
-from .writeup_agent import WriteupAgent
 from ..toolkits.general_tools.file_editing.file_editing_tools import (
     SeeFile,
     CreateFileWithContent,
@@ -20,6 +14,11 @@ from ..toolkits.general_tools.file_editing.file_editing_tools import (
     SearchKeyword,
     DeleteFileOrFolder,
 )
+from ..toolkits.general_tools.agent_dispatch.agent_dispatch_tools import (
+    AgentDispatcher,
+    DispatchAgentsTool,
+    GatherAgentResultsTool,
+)
 from ..prompts.manager_instructions import get_manager_system_prompt
 
 
@@ -65,6 +64,12 @@ class ManagerAgent(BaseResearchAgent):
             self.managed_agents = managed_agents
         else:
             # Fallback: Create agents internally (legacy behavior)
+            from .reviewer_agent import ReviewerAgent
+            from .ideation_agent import IdeationAgent
+            from .experimentation_agent import ExperimentationAgent
+            from .resource_preparation_agent import ResourcePreparationAgent
+            from .writeup_agent import WriteupAgent
+
             # Essential imports for tool-centric agents (shared across all agents)
             essential_imports = kwargs.get("additional_authorized_imports", [])
 
@@ -158,7 +163,14 @@ Approach: Comprehensive documentation of all experimental artifacts without sele
                 DeleteFileOrFolder(working_dir=workspace_dir),
             ]
 
-        tools: List = file_editing_tools
+        # Concurrent delegation: lets the manager run independent agent tasks in parallel
+        self.dispatcher = AgentDispatcher(self.managed_agents)
+        dispatch_tools = [
+            DispatchAgentsTool(self.dispatcher),
+            GatherAgentResultsTool(self.dispatcher),
+        ]
+
+        tools: List = file_editing_tools + dispatch_tools
 
         # Generate complete system prompt using template
         system_prompt = get_manager_system_prompt(
@@ -33,12 +33,13 @@ class ResourcePreparationAgent(BaseResearchAgent):
             os.makedirs(self.agent_folder, exist_ok=True)
 
         from ..toolkits.model_utils import get_raw_model
+        from ..toolkits.tool_registry import shared_tool
         raw_model = get_raw_model(model)
 
         tools = [
             ExperimentLinkerTool(working_dir=workspace_dir),
-            CitationSearchTool(),
-            VLMDocumentAnalysisTool(model=raw_model, working_dir=workspace_dir),
+            shared_tool(CitationSearchTool),
+            shared_tool(VLMDocumentAnalysisTool, model=raw_model, working_dir=workspace_dir),
         ]
 
         if workspace_dir:
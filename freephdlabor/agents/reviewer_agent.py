@@ -52,11 +52,12 @@ class ReviewerAgent(BaseResearchAgent):
         # Initialize tools - minimal set focused on experimentation
         # NOTE: Tools get raw model for efficiency, agents use LoggingLiteLLMModel for decision tracking
         from ..toolkits.model_utils import get_raw_model
+        from ..toolkits.tool_registry import shared_tool
         raw_model = get_raw_model(model)
         
         tools = [
-            VLMDocumentAnalysisTool(
-                model=raw_model, working_dir=workspace_dir
+            shared_tool(
+                VLMDocumentAnalysisTool, model=raw_model, working_dir=workspace_dir
             ),  # Primary tool for analyzing research paper (use raw model)
         ]
 
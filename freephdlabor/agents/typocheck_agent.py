@@ -52,11 +52,12 @@ class ProofreadingAgent(BaseResearchAgent):
         # Initialize tools - minimal set focused on experimentation
         # NOTE: Tools get raw model for efficiency, agents use LoggingLiteLLMModel for decision tracking
         from ..toolkits.model_utils import get_raw_model
+        from ..toolkits.tool_registry import shared_tool
         raw_model = get_raw_model(model)
         
         tools = [
-            LaTeXCompilerTool(working_dir=workspace_dir, model=raw_model),  # Primary tool for regenerating PDF (use raw model)
-            VLMDocumentAnalysisTool(working_dir=workspace_dir, model=raw_model),  # Primary tool for document analysis (use raw model)
+            shared_tool(LaTeXCompilerTool, working_dir=workspace_dir, model=raw_model),  # Primary tool for regenerating PDF (use raw model)
+            shared_tool(VLMDocumentAnalysisTool, working_dir=workspace_dir, model=raw_model),  # Primary tool for document analysis (use raw model)
         ]
 
         # file editing tools for typo correction
@@ -79,6 +79,7 @@ class WriteupAgent(BaseResearchAgent):
         # Initialize tools - comprehensive set for academic writing (workspace-aware)
         # NOTE: Tools get raw model for efficiency, agents use LoggingLiteLLMModel for decision tracking
         from ..toolkits.model_utils import get_raw_model
+        from ..toolkits.tool_registry import shared_tool
         raw_model = get_raw_model(model)
         
         # STREAMLINED TOOLS - LaTeX workflow with citation support
@@ -87,12 +88,12 @@ class WriteupAgent(BaseResearchAgent):
             # CORE LaTeX WORKFLOW (ESSENTIAL - 6 tools)
             LaTeXGeneratorTool(model=raw_model, working_dir=workspace_dir),      # THE CONTENT CREATION BRAIN
             LaTeXReflectionTool(model=raw_model, working_dir=workspace_dir),     # THE QUALITY GUARDIAN
-            LaTeXCompilerTool(model=raw_model, working_dir=workspace_dir),       # PDF compilation with BibTeX support
+            shared_tool(LaTeXCompilerTool, model=raw_model, working_dir=workspace_dir), # PDF compilation with BibTeX support
             LaTeXContentVerificationTool(working_dir=workspace_dir),             # Success criteria verification
             LaTeXSyntaxCheckerTool(working_dir=workspace_dir),                   # Document structure validation
 
             # PDF VALIDATION (1 tool)
-            VLMDocumentAnalysisTool(model=raw_model, working_dir=workspace_dir), # PDF validation and analysis
+            shared_tool(VLMDocumentAnalysisTool, model=raw_model, working_dir=workspace_dir), # PDF validation and analysis
 
             # NOTE: Citation resolution handled automatically by LaTeXCompilerTool during compilation
             # NOTE: Plotting tools handled by ResourcePreparationAgent (see prep agent for all plotting)
@@ -86,6 +86,12 @@ Examples:
         help="Interval for planning steps (e.g., 3 = replan every 3 steps). Only used if --enable-planning is set."
     )
 
+    parser.add_argument(
+        "--eager-agents",
+        action="store_true",
+        help="Build all specialist agents at startup instead of on first delegation"
+    )
+
     parser.add_argument(
         "--resume",
         type=str,
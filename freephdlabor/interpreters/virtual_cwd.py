@@ -0,0 +1,405 @@
+"""
+Per-executor virtual working directory for sandboxed agent code.
+
+The process working directory is shared by every thread, so executors cannot
+`os.chdir` into their workspace while other agents run concurrently. Instead,
+each WorkspacePythonExecutor owns a VirtualCwd, and the filesystem modules
+imported by its code (os, os.path, pathlib, shutil, glob, subprocess,
+zipfile, tarfile, logging, toml, and datasets.load_from_disk) are copies whose
+path-taking functions resolve relative paths against it.
+
+Other libraries (numpy, pandas, matplotlib, yaml, ...) still receive paths as
+given and resolve them against the process cwd, which WorkspacePythonExecutor
+keeps on the workspace while code runs (see ProcessCwd). Tools called from
+sandboxed code default their paths with `current_cwd()` rather than os.getcwd().
+"""
+
+import contextlib
+import contextvars
+import functools
+import glob as _glob
+import inspect
+import logging
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tarfile
+import threading
+import zipfile
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+
+from smolagents import local_python_executor
+
+
+class VirtualCwd:
+    """A working directory that only exists for one executor."""
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+
+    def resolve(self, path: Any) -> Any:
+        """Anchor a relative str/bytes/PathLike path; file descriptors and file objects pass through."""
+        if not isinstance(path, (str, bytes, os.PathLike)):
+            return path
+        path = os.fspath(path)
+        if os.path.isabs(path):
+            return path
+        if isinstance(path, bytes):
+            return os.path.join(os.fsencode(self.path), path)
+        return os.path.join(self.path, path)
+
+    def chdir(self, path: Any) -> None:
+        target = os.path.normpath(self.resolve(path))
+        if isinstance(target, bytes):
+            target = os.fsdecode(target)
+        if not os.path.isdir(target):
+            raise FileNotFoundError(f"No such directory: '{target}'")
+        self.path = target
+
+
+def _anchor(func: Callable, cwd: VirtualCwd, params: Dict[str, Optional[int]], default_cwd: Optional[str] = None) -> Callable:
+    """Wrap `func` so its path parameters are resolved against `cwd`.
+
+    `params` maps parameter names to their position (None for keyword-only);
+    `default_cwd` names a parameter that defaults to the current directory when
+    omitted or None (e.g. os.listdir's `path`, glob's `root_dir`).
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        args = list(args)
+        for name, position in params.items():
+            if position is not None and position < len(args):
+                if args[position] is not None or name == default_cwd:
+                    args[position] = cwd.resolve(args[position] if args[position] is not None else cwd.path)
+            elif kwargs.get(name) is not None:
+                kwargs[name] = cwd.resolve(kwargs[name])
+            elif name == default_cwd:
+                kwargs[name] = cwd.path
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+# Path-taking functions per module: name -> ({param: position}, param defaulting to the cwd)
+_OS_FUNCTIONS = {
+    "access": ({"path": 0}, None),
+    "chmod": ({"path": 0}, None),
+    "chown": ({"path": 0}, None),
+    "link": ({"src": 0, "dst": 1}, None),
+    "listdir": ({"path": 0}, "path"),
+    "lstat": ({"path": 0}, None),
+    "makedirs": ({"name": 0}, None),
+    "mkdir": ({"path": 0}, None),
+    "open": ({"path": 0}, None),
+    "readlink": ({"path": 0}, None),
+    "remove": ({"path": 0}, None),
+    "removedirs": ({"name": 0}, None),
+    "rename": ({"src": 0, "dst": 1}, None),
+    "renames": ({"old": 0, "new": 1}, None),
+    "replace": ({"src": 0, "dst": 1}, None),
+    "rmdir": ({"path": 0}, None),
+    "scandir": ({"path": 0}, "path"),
+    "stat": ({"path": 0}, None),
+    "symlink": ({"dst": 1}, None),  # src is relative to the link, not the cwd
+    "truncate": ({"path": 0}, None),
+    "unlink": ({"path": 0}, None),
+    "utime": ({"path": 0}, None),
+}
+_OS_PATH_FUNCTIONS = {
+    name: ({"path": 0}, None)
+    for name in ("exists", "lexists", "isfile", "isdir", "islink", "ismount",
+                 "getsize", "getmtime", "getatime", "getctime")
+}
+_OS_PATH_FUNCTIONS["samefile"] = ({"f1": 0, "f2": 1}, None)
+_SHUTIL_FUNCTIONS = {
+    name: ({"src": 0, "dst": 1}, None)
+    for name in ("copy", "copy2", "copyfile", "copymode", "copystat", "copytree", "move")
+}
+_SHUTIL_FUNCTIONS.update({
+    "disk_usage": ({"path": 0}, None),
+    "make_archive": ({"base_name": 0, "root_dir": 2}, "root_dir"),
+    "rmtree": ({"path": 0}, None),
+    "unpack_archive": ({"filename": 0, "extract_dir": 1}, "extract_dir"),
+})
+_GLOB_FUNCTIONS = {
+    "glob": ({"root_dir": None}, "root_dir"),
+    "iglob": ({"root_dir": None}, "root_dir"),
+}
+# Modules only anchored when sandboxed code imports them; they are not imported here
+_LAZY_MODULE_FUNCTIONS = {
+    "toml": {"load": ({"f": 0}, None)},
+    "datasets": {"load_from_disk": ({"dataset_path": 0}, None)},
+}
+
+
+def _copy_module(module: ModuleType, overrides: Dict[str, Any]) -> ModuleType:
+    bound = ModuleType(module.__name__, module.__doc__)
+    bound.__dict__.update({k: v for k, v in vars(module).items() if k != "__dict__"})
+    bound.__dict__.update(overrides)
+    return bound
+
+
+def _anchored_functions(module: ModuleType, cwd: VirtualCwd, spec: dict) -> Dict[str, Callable]:
+    return {
+        name: _anchor(getattr(module, name), cwd, params, default_cwd)
+        for name, (params, default_cwd) in spec.items()
+        if hasattr(module, name)
+    }
+
+
+def _bind_os_path(cwd: VirtualCwd) -> ModuleType:
+    def abspath(path):
+        return os.path.normpath(cwd.resolve(path))
+
+    def realpath(path, **kwargs):
+        return os.path.realpath(cwd.resolve(path), **kwargs)
+
+    def relpath(path, start=None):
+        return os.path.relpath(cwd.resolve(path), cwd.resolve(start if start is not None else cwd.path))
+
+    return _copy_module(os.path, {
+        **_anchored_functions(os.path, cwd, _OS_PATH_FUNCTIONS),
+        "abspath": abspath,
+        "realpath": realpath,
+        "relpath": relpath,
+    })
+
+
+def _bind_os(cwd: VirtualCwd, bound_path: ModuleType) -> ModuleType:
+    def walk(top, *args, **kwargs):
+        # report directories the way os.walk(top) would, relative paths included
+        anchored = cwd.resolve(top)
+        for dirpath, dirnames, filenames in os.walk(anchored, *args, **kwargs):
+            rel = os.path.relpath(dirpath, anchored)
+            yield (top if rel == os.curdir else os.path.join(top, rel)), dirnames, filenames
+
+    def getcwd():
+        return cwd.path
+
+    def getcwdb():
+        return os.fsencode(cwd.path)
+
+    return _copy_module(os, {
+        **_anchored_functions(os, cwd, _OS_FUNCTIONS),
+        "getcwd": getcwd,
+        "getcwdb": getcwdb,
+        "chdir": cwd.chdir,
+        "walk": walk,
+        "path": bound_path,
+    })
+
+
+def _bind_pathlib(cwd: VirtualCwd) -> ModuleType:
+    concrete = type(pathlib.Path())
+
+    # Relative paths are anchored when created (derived paths are then absolute)
+    if sys.version_info >= (3, 12):
+        class WorkspacePath(concrete):
+            def __init__(self, *args):
+                super().__init__(cwd.path, *args)
+    else:
+        class WorkspacePath(concrete):
+            def __new__(cls, *args, **kwargs):
+                return super().__new__(cls, cwd.path, *args)
+
+    WorkspacePath.cwd = classmethod(lambda cls: cls(cwd.path))
+    WorkspacePath.__name__ = WorkspacePath.__qualname__ = concrete.__name__
+    return _copy_module(pathlib, {"Path": WorkspacePath, concrete.__name__: WorkspacePath})
+
+
+def _bind_subprocess(cwd: VirtualCwd) -> ModuleType:
+    def with_cwd(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            kwargs["cwd"] = cwd.resolve(kwargs.get("cwd") or cwd.path)
+            return func(*args, **kwargs)
+        return wrapper
+
+    class Popen(subprocess.Popen):
+        def __init__(self, *args, **kwargs):
+            kwargs["cwd"] = cwd.resolve(kwargs.get("cwd") or cwd.path)
+            super().__init__(*args, **kwargs)
+
+    return _copy_module(subprocess, {
+        "Popen": Popen,
+        **{name: with_cwd(getattr(subprocess, name)) for name in ("run", "call", "check_call", "check_output")},
+    })
+
+
+def _anchor_archive_source(func: Callable, cwd: VirtualCwd, param: str) -> Callable:
+    """Anchor the file added by ZipFile.write / TarFile.add, archiving it under the name given.
+
+    Both name the archive member after the source path by default, which would
+    otherwise become the anchored absolute path.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        call = signature.bind(*args, **kwargs)
+        source = call.arguments[param]
+        if call.arguments.get("arcname") is None:
+            call.arguments["arcname"] = source
+        call.arguments[param] = cwd.resolve(source)
+        return func(*call.args, **call.kwargs)
+
+    return wrapper
+
+
+def _bind_zipfile(cwd: VirtualCwd) -> ModuleType:
+    # positions count `self`; extract/extractall default to the cwd
+    class ZipFile(zipfile.ZipFile):
+        __init__ = _anchor(zipfile.ZipFile.__init__, cwd, {"file": 1}, None)
+        write = _anchor_archive_source(zipfile.ZipFile.write, cwd, "filename")
+        extract = _anchor(zipfile.ZipFile.extract, cwd, {"path": 2}, "path")
+        extractall = _anchor(zipfile.ZipFile.extractall, cwd, {"path": 1}, "path")
+
+    return _copy_module(zipfile, {
+        "ZipFile": ZipFile,
+        "is_zipfile": _anchor(zipfile.is_zipfile, cwd, {"filename": 0}, None),
+    })
+
+
+def _bind_tarfile(cwd: VirtualCwd) -> ModuleType:
+    class TarFile(tarfile.TarFile):
+        __init__ = _anchor(tarfile.TarFile.__init__, cwd, {"name": 1}, None)
+        add = _anchor_archive_source(tarfile.TarFile.add, cwd, "name")
+        extract = _anchor(tarfile.TarFile.extract, cwd, {"path": 2}, "path")
+        extractall = _anchor(tarfile.TarFile.extractall, cwd, {"path": 1}, "path")
+
+    # TarFile.open hands `name` to GzipFile & co. before TarFile.__init__ sees it
+    tar_open = _anchor(TarFile.open, cwd, {"name": 0}, None)
+    return _copy_module(tarfile, {
+        "TarFile": TarFile,
+        "open": tar_open,
+        "is_tarfile": _anchor(tarfile.is_tarfile, cwd, {"name": 0}, None),
+    })
+
+
+def _bind_logging(cwd: VirtualCwd) -> ModuleType:
+    class FileHandler(logging.FileHandler):
+        __init__ = _anchor(logging.FileHandler.__init__, cwd, {"filename": 1}, None)
+
+    return _copy_module(logging, {
+        "FileHandler": FileHandler,
+        "basicConfig": _anchor(logging.basicConfig, cwd, {"filename": None}, None),
+    })
+
+
+class WorkspaceModules:
+    """Lazily built, cached cwd-bound copies of the filesystem modules for one executor."""
+
+    def __init__(self, cwd: VirtualCwd):
+        self.cwd = cwd
+        self._modules: Dict[str, ModuleType] = {}
+
+    def get(self, module: ModuleType) -> Optional[ModuleType]:
+        name = module.__name__
+        if name not in self._modules:
+            if name == os.path.__name__:
+                self._modules[name] = _bind_os_path(self.cwd)
+            elif name == "os":
+                self._modules[name] = _bind_os(self.cwd, self.get(os.path))
+            elif name == "pathlib":
+                self._modules[name] = _bind_pathlib(self.cwd)
+            elif name == "shutil":
+                self._modules[name] = _copy_module(shutil, _anchored_functions(shutil, self.cwd, _SHUTIL_FUNCTIONS))
+            elif name == "glob":
+                self._modules[name] = _copy_module(_glob, _anchored_functions(_glob, self.cwd, _GLOB_FUNCTIONS))
+            elif name == "subprocess":
+                self._modules[name] = _bind_subprocess(self.cwd)
+            elif name == "zipfile":
+                self._modules[name] = _bind_zipfile(self.cwd)
+            elif name == "tarfile":
+                self._modules[name] = _bind_tarfile(self.cwd)
+            elif name == "logging":
+                self._modules[name] = _bind_logging(self.cwd)
+            elif name in _LAZY_MODULE_FUNCTIONS:
+                self._modules[name] = _copy_module(
+                    module, _anchored_functions(module, self.cwd, _LAZY_MODULE_FUNCTIONS[name])
+                )
+            else:
+                return None
+        return self._modules[name]
+
+
+# Modules of the executor whose code is being evaluated in this thread
+_active_modules: contextvars.ContextVar[Optional[WorkspaceModules]] = contextvars.ContextVar(
+    "workspace_modules", default=None
+)
+_base_get_safe_module = local_python_executor.get_safe_module
+
+
+def _get_safe_module(raw_module, authorized_imports, visited=None):
+    # smolagents copies every module imported by sandboxed code through this hook;
+    # hand out the active executor's cwd-bound copy instead for filesystem modules
+    modules = _active_modules.get()
+    if modules is not None and visited is None and isinstance(raw_module, ModuleType):
+        bound = modules.get(raw_module)
+        if bound is not None:
+            return bound
+    return _base_get_safe_module(raw_module, authorized_imports, visited=visited)
+
+
+local_python_executor.get_safe_module = _get_safe_module
+
+
+class ProcessCwd:
+    """Keeps the process cwd on a workspace while executors for it are running code.
+
+    Libraries the sandbox cannot wrap (matplotlib, numpy, pandas, torch, ...)
+    resolve relative paths against the real process cwd. Executors sharing a
+    workspace - every agent of a run - share the chdir: the first to enter moves
+    the process there and the last to leave moves it back. An executor for a
+    different workspace never waits (a thread inside one executor may be waiting
+    on an agent running another); it runs with its virtual cwd only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._original: Optional[str] = None
+        self._holders = 0
+
+    @contextlib.contextmanager
+    def enter(self, path: str):
+        with self._lock:
+            if self._holders == 0:
+                self._original = os.getcwd()
+                os.chdir(path)
+                self._path = path
+            joined = self._path == path
+            if joined:
+                self._holders += 1
+        try:
+            yield joined
+        finally:
+            if joined:
+                with self._lock:
+                    self._holders -= 1
+                    if self._holders == 0:
+                        os.chdir(self._original)
+                        self._path = self._original = None
+
+
+process_cwd = ProcessCwd()
+
+
+def current_cwd() -> str:
+    """The virtual cwd of the executor running code in this thread, else the process cwd."""
+    modules = _active_modules.get()
+    return modules.cwd.path if modules is not None else os.getcwd()
+
+
+@contextlib.contextmanager
+def activate(modules: WorkspaceModules):
+    """Route sandbox imports in the current thread to `modules` while active."""
+    token = _active_modules.set(modules)
+    try:
+        yield modules
+    finally:
+        _active_modules.reset(token)
@@ -3,6 +3,10 @@ Workspace-aware Python executor for agent code execution.
 
 This module provides a custom Python executor that runs code in a specified
 workspace directory while maintaining full compatibility with smolagents.
+The workspace is a per-executor virtual working directory (see virtual_cwd),
+so executors of different agents can run concurrently in one process; the
+process cwd is also kept on the workspace while code runs, for libraries
+that resolve relative paths themselves.
 """
 
 import os
@@ -10,6 +14,8 @@ import logging
 from typing import Any, Optional, Dict, List, Tuple
 from smolagents import LocalPythonExecutor, Tool
 
+from .virtual_cwd import VirtualCwd, WorkspaceModules, activate, process_cwd
+
 
 class WorkspacePythonExecutor(LocalPythonExecutor):
     """
@@ -17,7 +23,11 @@ class WorkspacePythonExecutor(LocalPythonExecutor):
     
     This executor wraps LocalPythonExecutor to ensure all agent-generated code
     runs in the workspace directory, while maintaining complete compatibility
-    with the base executor's behavior.
+    with the base executor's behavior. Relative paths given to os, os.path,
+    pathlib, shutil, glob, subprocess and the other wrapped modules resolve
+    against the executor's own virtual cwd, so an os.chdir in one agent's code
+    does not move another's. Other libraries resolve against the process cwd,
+    which is shared by all executors of the workspace while they run code.
     
     Args:
         workspace_dir: Directory where code should be executed
@@ -39,6 +49,10 @@ class WorkspacePythonExecutor(LocalPythonExecutor):
         
         # Ensure workspace directory exists
         os.makedirs(self.workspace_dir, exist_ok=True)
+
+        # Virtual cwd (os.chdir inside the code moves it) and the modules bound to it
+        self.cwd = VirtualCwd(self.workspace_dir)
+        self.workspace_modules = WorkspaceModules(self.cwd)
         
         # Initialize parent with all the same parameters
         # Ensure additional_authorized_imports is always a list
@@ -67,15 +81,13 @@ class WorkspacePythonExecutor(LocalPythonExecutor):
             - output: Captured print outputs
             - is_final_answer: Whether this is a final answer
         """
-        # Save current directory
-        original_dir = os.getcwd()
-        
         try:
-            # Change to workspace directory
-            os.chdir(self.workspace_dir)
-            
-            # Execute code using parent's implementation
-            result = super().__call__(code_action)
+            # Execute code using parent's implementation, with filesystem
+            # imports bound to this executor's workspace
+            with process_cwd.enter(self.workspace_dir) as joined, activate(self.workspace_modules):
+                if not joined:
+                    logging.debug(f"Process cwd is on another workspace; {self.workspace_dir} uses its virtual cwd only")
+                result = super().__call__(code_action)
             
             return result
             
@@ -91,10 +103,6 @@ class WorkspacePythonExecutor(LocalPythonExecutor):
             # Re-raise the exception to maintain normal error handling flow
             raise
             
-        finally:
-            # Always restore original directory
-            os.chdir(original_dir)
-            
     def send_variables(self, variables: Dict[str, Any]) -> None:
         """
         Update state with variables (delegated to parent).
@@ -5,15 +5,223 @@ This module provides a logging wrapper for LiteLLMModel that captures complete
 agent LLM call context for debugging and prompt improvement analysis.
 """
 
+import atexit
+import contextlib
+import glob
+import gzip
+import hashlib
 import json
+import queue
+import shutil
+import threading
 import uuid
 import os
 import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from smolagents.models import ChatMessage
 
 
+# Log writer settings (environment overrides)
+LOG_QUEUE_SIZE = 1024  # Entries buffered before generate() blocks on the writer
+LOG_FLUSH_INTERVAL = float(os.environ.get("AGENT_LLM_LOG_FLUSH_SECONDS", "2"))
+LOG_MAX_BYTES = int(float(os.environ.get("AGENT_LLM_LOG_MAX_MB", "256")) * 1024 * 1024)  # 0 disables rotation
+LOG_DELTA_MESSAGES = os.environ.get("AGENT_LLM_LOG_DELTA", "false").lower() == "true"
+
+
+class LLMLogWriter:
+    """
+    Background writer shared by all agents logging to the same JSONL file.
+    
+    Entries are queued (bounded) and written by a single thread that keeps the file
+    open, flushes periodically, and rotates the file into gzip archives once it
+    exceeds LOG_MAX_BYTES (e.g. agent_llm_calls.20250715_103000.jsonl.gz).
+    """
+    
+    def __init__(self, log_file_path: str, max_bytes: int = LOG_MAX_BYTES, flush_interval: float = LOG_FLUSH_INTERVAL):
+        self.log_file_path = log_file_path
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="llm-log-writer", daemon=True)
+        self._thread.start()
+    
+    def write(self, log_entry: Dict[str, Any]) -> None:
+        """Queue a log entry (blocks only if the writer has fallen LOG_QUEUE_SIZE entries behind)."""
+        self._queue.put(log_entry)
+    
+    def close(self) -> None:
+        """Flush all queued entries and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+    
+    def _run(self) -> None:
+        f = open(self.log_file_path, 'a', encoding='utf-8')
+        last_flush = time.time()
+        try:
+            while True:
+                try:
+                    entry = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    entry = False  # Idle: just flush
+                if entry is None:
+                    break
+                if entry:
+                    try:
+                        f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+                    except Exception as e:
+                        # Don't let logging failures break the system
+                        print(f"Warning: Failed to write LLM log entry: {e}")
+                if entry is False or time.time() - last_flush >= self.flush_interval:
+                    f.flush()
+                    last_flush = time.time()
+                    if self.max_bytes and f.tell() >= self.max_bytes:
+                        f.close()
+                        self._rotate()
+                        f = open(self.log_file_path, 'a', encoding='utf-8')
+        finally:
+            f.close()
+    
+    def _rotate(self) -> None:
+        """Compress the current log file into a timestamped gzip archive."""
+        base, ext = os.path.splitext(self.log_file_path)
+        archive_path = f"{base}.{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{ext}.gz"
+        try:
+            with open(self.log_file_path, 'rb') as src, gzip.open(archive_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.log_file_path)
+        except Exception as e:
+            print(f"Warning: Failed to rotate LLM log {self.log_file_path}: {e}")
+
+
+_log_writers: Dict[str, LLMLogWriter] = {}
+_log_writers_lock = threading.Lock()
+
+
+def get_log_writer(log_file_path: str) -> LLMLogWriter:
+    """Return the shared writer for a log file, starting it on first use."""
+    log_file_path = os.path.abspath(log_file_path)
+    with _log_writers_lock:
+        writer = _log_writers.get(log_file_path)
+        if writer is None:
+            writer = LLMLogWriter(log_file_path)
+            _log_writers[log_file_path] = writer
+        return writer
+
+
+@atexit.register
+def close_log_writers() -> None:
+    """Flush and close all shared log writers."""
+    with _log_writers_lock:
+        writers = list(_log_writers.values())
+        _log_writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def _chain_hashes(messages: List[Dict[str, Any]], previous: str = "") -> List[str]:
+    """Running sha256 over messages: entry i identifies messages[:i + 1] (after `previous`)."""
+    hashes = []
+    for message in messages:
+        data = json.dumps(message, ensure_ascii=False, default=str, sort_keys=True)
+        previous = hashlib.sha256((previous + data).encode("utf-8")).hexdigest()
+        hashes.append(previous)
+    return hashes
+
+
+def iter_log_entries(log_file_path: str, expand_deltas: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over all logged calls, including rotated gzip archives (oldest first).
+    
+    Args:
+        log_file_path: Path to the live JSONL log file
+        expand_deltas: Rebuild full input messages for delta-encoded entries
+        
+    Yields:
+        Log entry dictionaries
+        
+    Raises:
+        ValueError: If a delta's prefix doesn't match the agent's previous logged call
+            (e.g. a missing archive), instead of rebuilding wrong messages
+    """
+    base, ext = os.path.splitext(log_file_path)
+    paths = sorted(glob.glob(f"{glob.escape(base)}.*{ext}.gz"))
+    if os.path.exists(log_file_path):
+        paths.append(log_file_path)
+    
+    last_messages: Dict[str, List[Dict[str, Any]]] = {}  # agent_name -> full messages of its last call
+    last_hashes: Dict[str, List[str]] = {}  # agent_name -> _chain_hashes of those messages
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                inputs = entry.get("input", {})
+                if not expand_deltas:
+                    yield entry
+                    continue
+                agent_name = entry.get("agent_name")
+                if "messages_delta" in inputs:
+                    length = inputs.pop("prefix_length")
+                    delta = inputs.pop("messages_delta")
+                    expected = inputs.pop("prefix_sha256", None)
+                    prefix_hashes = last_hashes.get(agent_name, [])[:length]
+                    # logs written before prefix hashes were stored can't be checked
+                    if expected is not None and (
+                        len(prefix_hashes) < length or (length and prefix_hashes[-1] != expected)
+                    ):
+                        raise ValueError(
+                            f"Cannot rebuild messages of call {entry.get('call_id')} in {path}: "
+                            f"its prefix doesn't match {agent_name}'s previous logged call"
+                        )
+                    inputs["messages"] = last_messages.get(agent_name, [])[:length] + delta
+                    last_hashes[agent_name] = prefix_hashes + _chain_hashes(
+                        delta, prefix_hashes[-1] if prefix_hashes else ""
+                    )
+                elif "messages" in inputs:
+                    last_hashes[agent_name] = _chain_hashes(inputs["messages"])
+                if "messages" in inputs:
+                    last_messages[agent_name] = inputs["messages"]
+                yield entry
+
+
+class TokenUsageMetrics:
+    """
+    Latest provider-reported token usage of a model wrapper.
+    
+    Shared with the agent's context compactor so compaction decisions can use the
+    exact prompt size the provider billed instead of a local estimate. Only the
+    agent's step calls are recorded (see `step_calls`): their prompt is the agent's
+    context, unlike planning, final-answer or other auxiliary calls.
+    """
+    
+    def __init__(self):
+        self.call_count = 0
+        self.last_prompt_tokens: Optional[int] = None
+        self.last_completion_tokens: Optional[int] = None
+        self._in_step = False
+    
+    @contextlib.contextmanager
+    def step_calls(self):
+        """Record the calls made while active, i.e. during one agent step."""
+        self._in_step = True
+        try:
+            yield
+        finally:
+            self._in_step = False
+    
+    def record(self, token_usage: Optional[Dict[str, int]]) -> None:
+        """Publish the token usage of a successful step call (ignored if the provider reported none)."""
+        if not self._in_step or not token_usage or not token_usage.get("prompt_tokens"):
+            return
+        self.call_count += 1
+        self.last_prompt_tokens = token_usage["prompt_tokens"]
+        self.last_completion_tokens = token_usage.get("completion_tokens", 0)
+
+
 class LoggingLiteLLMModel:
     """
     A wrapper around LiteLLMModel that logs all agent LLM calls with complete context.
@@ -28,7 +236,7 @@ class LoggingLiteLLMModel:
     engineering improvements and multi-agent coordination debugging.
     """
     
-    def __init__(self, base_model, agent_context: Dict[str, str], log_file_path: str):
+    def __init__(self, base_model, agent_context: Dict[str, str], log_file_path: str, delta_messages: bool = LOG_DELTA_MESSAGES):
         """
         Initialize the logging wrapper.
         
@@ -36,13 +244,20 @@ class LoggingLiteLLMModel:
             base_model: The LiteLLMModel instance to wrap
             agent_context: Dict with 'agent_type' and 'agent_name' keys
             log_file_path: Path to the JSONL log file
+            delta_messages: Log only the messages added since this agent's previous call
+                (read back full histories with iter_log_entries)
         """
         self.model = base_model
         self.agent_context = agent_context
         self.log_file_path = log_file_path
+        self.delta_messages = delta_messages
+        self.usage_metrics = TokenUsageMetrics()
+        self._last_messages: List[Dict[str, Any]] = []
+        self._last_hashes: List[str] = []  # _chain_hashes of _last_messages
         
         # Ensure log directory exists
         os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
+        self._writer = get_log_writer(log_file_path)
     
     def generate(self, messages: List[ChatMessage], **kwargs) -> ChatMessage:
         """
@@ -66,8 +281,7 @@ class LoggingLiteLLMModel:
             "agent_type": self.agent_context.get("agent_type", "unknown"),
             "agent_name": self.agent_context.get("agent_name", "unknown"),
             "workspace_run": self._get_workspace_run_id(),
-            "input": {
-                "messages": self._serialize_messages(messages),
+            "input": self._encode_messages(self._serialize_messages(messages)) | {
                 "parameters": kwargs
             }
         }
@@ -88,9 +302,11 @@ class LoggingLiteLLMModel:
                     duration_ms = int((end_time - start_time) * 1000)
                     
                     # Add response data to log entry
+                    token_usage = self._extract_token_usage(response)
+                    self.usage_metrics.record(token_usage)
                     log_entry["output"] = {
                         "content": response.content if response.content else "",
-                        "token_usage": self._extract_token_usage(response),
+                        "token_usage": token_usage,
                         "duration_ms": duration_ms
                     }
                     log_entry["status"] = "success"
@@ -202,6 +418,34 @@ class LoggingLiteLLMModel:
         
         return serialized
     
+    def _encode_messages(self, serialized: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Encode input messages, as a delta against this agent's previous call if enabled.
+        
+        Args:
+            serialized: Serialized input messages of the current call
+            
+        Returns:
+            Either {"messages": [...]} or
+            {"prefix_length": n, "prefix_sha256": ..., "messages_delta": [...]}, where
+            prefix_sha256 lets readers check they rebuild on top of the same prefix
+        """
+        previous, self._last_messages = self._last_messages, serialized
+        if not self.delta_messages:
+            return {"messages": serialized}
+        if previous and serialized[:len(previous)] == previous:
+            delta = serialized[len(previous):]
+            prefix_sha256 = self._last_hashes[-1]
+            self._last_hashes.extend(_chain_hashes(delta, prefix_sha256))
+            return {
+                "prefix_length": len(previous),
+                "prefix_sha256": prefix_sha256,
+                "messages_delta": delta
+            }
+        # not an extension of the previous call: log a full snapshot
+        self._last_hashes = _chain_hashes(serialized)
+        return {"messages": serialized}
+    
     def _extract_token_usage(self, response: ChatMessage) -> Optional[Dict[str, int]]:
         """
         Extract token usage information from the response.
@@ -213,10 +457,14 @@ class LoggingLiteLLMModel:
             Dictionary with token usage info or None
         """
         if hasattr(response, 'token_usage') and response.token_usage:
+            usage = response.token_usage
+            # smolagents' TokenUsage names them input/output tokens
+            prompt_tokens = getattr(usage, 'prompt_tokens', None) or getattr(usage, 'input_tokens', 0)
+            completion_tokens = getattr(usage, 'completion_tokens', None) or getattr(usage, 'output_tokens', 0)
             return {
-                "prompt_tokens": getattr(response.token_usage, 'prompt_tokens', 0),
-                "completion_tokens": getattr(response.token_usage, 'completion_tokens', 0),
-                "total_tokens": getattr(response.token_usage, 'total_tokens', 0)
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": getattr(usage, 'total_tokens', 0) or prompt_tokens + completion_tokens
             }
         return None
     
@@ -239,14 +487,13 @@ class LoggingLiteLLMModel:
     
     def _write_log_entry(self, log_entry: Dict[str, Any]) -> None:
         """
-        Write a log entry to the JSONL file.
+        Queue a log entry for the shared background writer of the JSONL file.
         
         Args:
             log_entry: Dictionary containing the log data
         """
         try:
-            with open(self.log_file_path, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+            self._writer.write(log_entry)
         except Exception as e:
             # Don't let logging failures break the system
             print(f"Warning: Failed to write LLM log entry: {e}")
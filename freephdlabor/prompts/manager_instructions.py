@@ -173,6 +173,13 @@ DELEGATION PRINCIPLES:
 - Read agent outputs to understand their success/failure status
 - Make informed decisions about whether to iterate or proceed
 
+CONCURRENT DELEGATION:
+- Calling an agent directly (e.g. `ideation_agent(task=...)`) blocks until it finishes
+- When tasks are INDEPENDENT (neither needs the other's output or writes the same files), start them together with `dispatch_agents` and collect the reports with `gather_agent_results`
+- Example: `ids = dispatch_agents(tasks=[{"agent": "ideation_agent", "task": "..."}, {"agent": "resource_preparation_agent", "task": "..."}])` then `results = gather_agent_results(dispatch_ids=ids)`
+- Check every report's status ("done"/"failed"/"running") and apply the usual feedback analysis to each
+- Keep dependent steps sequential (e.g. ResourcePreparationAgent BEFORE WriteupAgent)
+
 RESOURCE PREPARATION AND WRITEUP WORKFLOW:
 **CRITICAL NEW WORKFLOW**: After ExperimentationAgent completes, you MUST delegate to ResourcePreparationAgent BEFORE WriteupAgent:
 
@@ -141,6 +141,7 @@ Here are the rules you should always follow to solve your task:
 7. You can use imports in your code, but only from the following list of modules: {{{{authorized_imports}}}}
 8. The state persists between code executions: so if in one step you've created variables or imported modules, these will all persist.
 9. STRING SYNTAX: Always properly close triple-quoted strings with three double quotes. For multiline content, prefer string concatenation (e.g., "Line 1" + " Line 2") over triple-quoted strings to avoid syntax errors.
+10. FILE PATHS: Relative paths resolve against the workspace. After os.chdir(...) only os, os.path, pathlib, shutil, glob, subprocess, zipfile, tarfile, logging, toml and datasets.load_from_disk follow the new directory; other libraries (pandas, numpy, matplotlib, yaml, transformers, datasets' save_to_disk, ...) still resolve against the workspace root, so pass them paths built with os.path.join / os.path.abspath or pathlib.Path, e.g. df.to_csv(os.path.abspath("results.csv")).
 
 ALWAYS use the correct markdown format shown in all examples above: ```python your_code_here ```
 
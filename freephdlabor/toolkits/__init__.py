@@ -1,13 +1,21 @@
 """
 AI research toolkits using smolagents framework.
+
+Tools are imported on first access: they pull in smolagents and the model
+clients, and importing a standalone module (e.g. literature_search from the
+AI-Scientist subprocess) should not load them all.
 """
 
-from .paper_search_tool import PaperSearchTool
-from .generate_idea_tool import GenerateIdeaTool
-from .check_idea_novelty_tool import CheckIdeaNoveltyTool
-from .refine_idea_tool import RefineIdeaTool
-from .run_experiment_tool import RunExperimentTool
-from .model_utils import get_raw_model
+import importlib
+
+_TOOLKIT_MODULES = {
+    "PaperSearchTool": ".paper_search_tool",
+    "GenerateIdeaTool": ".generate_idea_tool",
+    "CheckIdeaNoveltyTool": ".check_idea_novelty_tool",
+    "RefineIdeaTool": ".refine_idea_tool",
+    "RunExperimentTool": ".run_experiment_tool",
+    "get_raw_model": ".model_utils",
+}
 
 __all__ = [
     "PaperSearchTool",
@@ -17,3 +25,9 @@ __all__ = [
     "RunExperimentTool",
     "get_raw_model",
 ]
+
+
+def __getattr__(name):
+    if name in _TOOLKIT_MODULES:
+        return getattr(importlib.import_module(_TOOLKIT_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,172 @@
+"""
+Concurrent delegation from the ManagerAgent to its managed agents.
+
+Calling a managed agent from the manager's code blocks until that agent is done,
+so independent work (e.g. a literature sweep and an experiment) runs back to back.
+DispatchAgentsTool starts several managed agents on a shared thread pool and
+returns dispatch ids at once; GatherAgentResultsTool waits for those ids and
+returns each agent's report.
+
+Every agent keeps its own memory, executor and <workspace>/<agent_name>/ folder.
+A single agent is not re-entrant: BaseResearchAgent.__call__ holds the agent's
+call_lock, so tasks sent to an agent that is still busy - dispatched or called
+directly by the manager - wait for it instead of running on the same memory
+concurrently. The dispatcher takes no lock of its own around an agent call.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from smolagents.tools import Tool
+
+
+@dataclass
+class Dispatch:
+    """One task handed to a managed agent"""
+
+    dispatch_id: str
+    agent_name: str
+    task: str
+    future: Future
+    submitted_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+
+class AgentDispatcher:
+    """Runs managed agents on worker threads and tracks their results as futures."""
+
+    def __init__(self, agents: List[Any], max_workers: Optional[int] = None):
+        self.agents: Dict[str, Any] = {agent.name: agent for agent in agents}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, len(self.agents)),
+            thread_name_prefix="agent-dispatch",
+        )
+        self._lock = threading.Lock()
+        self._counter = 0
+        self.dispatches: Dict[str, Dispatch] = {}
+
+    def submit(self, agent_name: str, task: str, additional_args: Optional[dict] = None) -> str:
+        """Start `task` on the named agent and return its dispatch id."""
+        if agent_name not in self.agents:
+            raise KeyError(
+                f"Unknown agent '{agent_name}'. Available agents: {', '.join(self.agents)}"
+            )
+        with self._lock:
+            self._counter += 1
+            dispatch_id = f"{agent_name}-{self._counter}"
+            dispatch = Dispatch(dispatch_id, agent_name, task, Future())
+            self.dispatches[dispatch_id] = dispatch
+        dispatch.future = self._executor.submit(self._run, dispatch, additional_args)
+        return dispatch_id
+
+    def _run(self, dispatch: Dispatch, additional_args: Optional[dict]) -> Any:
+        agent = self.agents[dispatch.agent_name]
+        try:
+            if additional_args:
+                return agent(dispatch.task, additional_args=additional_args)
+            return agent(dispatch.task)
+        finally:
+            dispatch.finished_at = time.time()
+
+    def gather(self, dispatch_ids: Optional[List[str]] = None, timeout: Optional[float] = None) -> Dict[str, dict]:
+        """Wait up to `timeout` seconds for the given (default: all) dispatches.
+
+        Returns one entry per id with status "done", "failed" or "running"; running
+        dispatches can be gathered again later.
+        """
+        if dispatch_ids is None:
+            dispatch_ids = list(self.dispatches)
+        unknown = [d for d in dispatch_ids if d not in self.dispatches]
+        if unknown:
+            raise KeyError(f"Unknown dispatch ids: {', '.join(unknown)}")
+
+        wait([self.dispatches[d].future for d in dispatch_ids], timeout=timeout)
+        results = {}
+        for dispatch_id in dispatch_ids:
+            dispatch = self.dispatches[dispatch_id]
+            entry = {"agent": dispatch.agent_name, "task": dispatch.task}
+            if not dispatch.future.done():
+                entry["status"] = "running"
+                entry["elapsed_seconds"] = round(time.time() - dispatch.submitted_at, 1)
+            elif dispatch.future.exception() is not None:
+                entry["status"] = "failed"
+                entry["error"] = f"{type(dispatch.future.exception()).__name__}: {dispatch.future.exception()}"
+            else:
+                entry["status"] = "done"
+                entry["result"] = dispatch.future.result()
+                entry["elapsed_seconds"] = round(dispatch.finished_at - dispatch.submitted_at, 1)
+            results[dispatch_id] = entry
+        return results
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel dispatches that have not started; with `wait`, also wait for running ones."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class DispatchAgentsTool(Tool):
+    name = "dispatch_agents"
+    description = (
+        "Start several managed agents at the same time without waiting for them. "
+        "Use this for INDEPENDENT tasks only (e.g. ideation on one idea while another agent "
+        "searches literature) - tasks that need each other's outputs must still run in order. "
+        "Each entry of `tasks` is a dict {'agent': <managed agent name>, 'task': <task description>, "
+        "'additional_args': <optional dict>}. Returns the list of dispatch ids (same order as `tasks`); "
+        "pass them to gather_agent_results to collect the reports. Calling an agent directly "
+        "while it still has a dispatched task running waits for that task to finish first."
+    )
+    inputs = {
+        "tasks": {
+            "type": "array",
+            "description": "List of {'agent': str, 'task': str, 'additional_args': dict (optional)} entries.",
+        }
+    }
+    output_type = "array"
+
+    def __init__(self, dispatcher: AgentDispatcher):
+        super().__init__()
+        self.dispatcher = dispatcher
+
+    def forward(self, tasks: list) -> list:
+        dispatch_ids = []
+        for entry in tasks:
+            if not isinstance(entry, dict) or "agent" not in entry or "task" not in entry:
+                raise ValueError(
+                    f"Each task must be a dict with 'agent' and 'task' keys, got: {entry!r}"
+                )
+            dispatch_ids.append(
+                self.dispatcher.submit(entry["agent"], entry["task"], entry.get("additional_args"))
+            )
+        return dispatch_ids
+
+
+class GatherAgentResultsTool(Tool):
+    name = "gather_agent_results"
+    description = (
+        "Wait for agents started with dispatch_agents and return their reports. "
+        "Returns a dict mapping each dispatch id to {'agent', 'task', 'status', ...}: status 'done' "
+        "includes 'result' (the agent's report), 'failed' includes 'error', and 'running' means the "
+        "timeout expired first - gather that id again later. Omit `dispatch_ids` to gather every dispatch."
+    )
+    inputs = {
+        "dispatch_ids": {
+            "type": "array",
+            "description": "Dispatch ids returned by dispatch_agents. Defaults to all dispatches.",
+            "nullable": True,
+        },
+        "timeout": {
+            "type": "number",
+            "description": "Maximum seconds to wait. Defaults to waiting until all are finished.",
+            "nullable": True,
+        },
+    }
+    output_type = "object"
+
+    def __init__(self, dispatcher: AgentDispatcher):
+        super().__init__()
+        self.dispatcher = dispatcher
+
+    def forward(self, dispatch_ids: Optional[list] = None, timeout: Optional[float] = None) -> dict:
+        return self.dispatcher.gather(dispatch_ids, timeout)
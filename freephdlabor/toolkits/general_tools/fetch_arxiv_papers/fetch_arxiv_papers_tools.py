@@ -8,12 +8,13 @@ from smolagents import Tool
 
 import os
 import time
-import requests
 from pathlib import Path
 from urllib.parse import urlparse
 import hashlib
 import re
 
+from ...http_session import get_http_session
+
 
 SEARCH_QUERY= "agent"  # Replace with desired search term or topic
 MAX_RESULTS= 50  # Adjust the number of papers you want to download
@@ -80,7 +81,7 @@ class FetchArxivPapersTool(Tool):
     def fetch_arxiv_papers(self, search_query, max_results=5):
         """Fetches metadata of papers from arXiv using the API."""
         url = f"{BASE_URL}search_query=all:{search_query}&start=0&max_results={max_results}"
-        response = requests.get(url)
+        response = get_http_session().get(url)
         response.raise_for_status()
         return response.text
 
@@ -109,13 +110,14 @@ class FetchArxivPapersTool(Tool):
         # Create a safe filename
         safe_title = self.sanitize_filename(title)
         filename = os.path.join(output_folder, f"{safe_title}.pdf")
-        response = requests.get(pdf_link, stream=True)
-        response.raise_for_status()
-
-        # Write the PDF to the specified folder
-        with open(filename, "wb") as file:
-            for chunk in response.iter_content(chunk_size=1024):
-                file.write(chunk)
+        # Streamed responses hold a pooled connection until closed
+        with get_http_session().get(pdf_link, stream=True) as response:
+            response.raise_for_status()
+
+            # Write the PDF to the specified folder
+            with open(filename, "wb") as file:
+                for chunk in response.iter_content(chunk_size=1024):
+                    file.write(chunk)
         print(f"Downloaded: {title}")
 
 
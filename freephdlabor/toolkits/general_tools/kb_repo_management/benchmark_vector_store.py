@@ -0,0 +1,87 @@
+"""
+Recall vs. latency of the FaissStore index modes against the exact flat baseline.
+
+Builds one store per mode over the same synthetic, clustered unit vectors and
+reports build time, index size on disk, (memory-mapped) load time, per-query
+search latency and recall@k relative to the flat index:
+
+    python -m freephdlabor.toolkits.general_tools.kb_repo_management.benchmark_vector_store \\
+        --num-vectors 100000 --dim 256
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from freephdlabor.toolkits.general_tools.kb_repo_management.repo_indexer import (
+    INDEX_TYPES,
+    FaissStore,
+)
+
+
+def make_vectors(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """Unit vectors drawn around n/100 random topics, like chunks of a real KB."""
+    centers = rng.standard_normal((max(1, n // 100), dim)).astype("float32")
+    x = centers[rng.integers(len(centers), size=n)]
+    x += 0.5 * rng.standard_normal((n, dim)).astype("float32")
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def build_store(index_type: str, index_dir: Path, vectors: np.ndarray) -> float:
+    store = FaissStore(
+        vectors.shape[1], index_dir, "benchmark", index_type=index_type, ann_min_vectors=0
+    )
+    ids = [f"doc-{i}" for i in range(len(vectors))]
+    # one "file" per vector, so hits identify the vector for the recall check
+    metas = [{"file": f"doc-{i}", "content": ""} for i in range(len(vectors))]
+    start = time.perf_counter()
+    store.add(ids, vectors, metas)
+    store.save()  # trains / builds the approximate index
+    return time.perf_counter() - start
+
+
+def run(num_vectors: int, dim: int, num_queries: int, k: int, modes: list[str]):
+    rng = np.random.default_rng(0)
+    vectors = make_vectors(num_vectors, dim, rng)
+    queries = make_vectors(num_queries, dim, rng)
+
+    truth = None
+    print(f"{num_vectors} vectors, dim {dim}, {num_queries} queries, k={k}")
+    print(f"{'mode':>6} {'build s':>8} {'size MB':>8} {'load ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'recall':>7}")
+    for mode in ["flat"] + [m for m in modes if m != "flat"]:
+        with tempfile.TemporaryDirectory() as tmp:
+            index_dir = Path(tmp)
+            build_s = build_store(mode, index_dir, vectors)
+            size_mb = (index_dir / "faiss.index").stat().st_size / 2**20
+
+            start = time.perf_counter()
+            store = FaissStore(None, index_dir, "benchmark", index_type=mode, mmap=True)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            found, latencies = [], []
+            for q in queries:
+                start = time.perf_counter()
+                hits = store.search(q[None, :], k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                found.append({h["file"] for h in hits})
+            store.db.close()
+
+        if truth is None:
+            truth = found
+        recall = np.mean([len(f & t) / max(1, len(t)) for f, t in zip(found, truth)])
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"{mode:>6} {build_s:8.2f} {size_mb:8.1f} {load_ms:8.1f} {p50:7.2f} {p95:7.2f} {recall:7.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--num-vectors", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--num-queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--modes", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES)
+    args = parser.parse_args()
+    run(args.num_vectors, args.dim, args.num_queries, args.k, args.modes)
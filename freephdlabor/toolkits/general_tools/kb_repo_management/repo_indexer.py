@@ -15,13 +15,20 @@ Self‑contained toolkit that
 from __future__ import annotations
 
 import ast
+import hashlib
 import json
 import os
+import re
 import shutil
+import sqlite3
+import stat
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import textwrap
 
@@ -41,6 +48,26 @@ INDEX_DIR = Path("vector_store")
 INDEX_PATH = INDEX_DIR / "faiss.index"
 META_PATH = INDEX_DIR / "metadata.json"
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY_EMBEDDINGS"))
+# provider limits per embeddings request: number of inputs, and total text size
+# (~4 chars per token, kept under the 300k-token request limit)
+EMBED_BATCH_SIZE = 2048
+EMBED_BATCH_CHARS = 1_000_000
+# recent query vectors kept in memory (queries never go to the on-disk chunk cache)
+QUERY_CACHE_SIZE = 256
+# offline stand-in embedder (tests, indexing without network access)
+LOCAL_EMBED_MODEL = "local-hashing"
+LOCAL_EMBED_DIM = 256
+# vector index modes: exact "flat" scan, or approximate IVF / IVF+product
+# quantization / HNSW, switched to once the store holds ANN_MIN_VECTORS vectors
+INDEX_TYPES = ("flat", "ivf", "ivfpq", "hnsw")
+ANN_MIN_VECTORS = 20_000
+IVF_NPROBE = 16
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+# hnsw can't delete in place: removed vectors stay in the graph as tombstones until
+# they make up this fraction of it, then the graph is rebuilt without them
+HNSW_MAX_TOMBSTONE_FRACTION = 0.2
 
 # ---------- helper: (mtime_ns, size) signature ----------
 
@@ -48,6 +75,17 @@ def _file_sig(p: Path):
     st = p.stat()
     return st.st_mtime_ns, st.st_size
 
+
+def _try_file_sig(p: str | Path):
+    """Signature of `p`, or None if it disappeared (or is not a regular file)."""
+    try:
+        st = os.stat(p)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime_ns, st.st_size
+
 # ────────────────────────────── Chunking ────────────────────────────────────
 
 def chunk_python(path: Path) -> List[Dict[str, Any]]:
@@ -126,47 +164,404 @@ def chunk_file(path: Path) -> List[Dict[str, Any]]:
 
 # ─────────────────────────────── Embedding ──────────────────────────────────
 
-def embed_texts(texts: list[str], client, embed_model: str) -> np.ndarray:
-    resp = client.embeddings.create(model=embed_model, input=texts)
-    return np.asarray([d.embedding for d in resp.data], dtype="float32")
+def embed_texts(
+    texts: list[str],
+    client,
+    embed_model: str,
+    batch_size: int = EMBED_BATCH_SIZE,
+    batch_chars: int = EMBED_BATCH_CHARS,
+) -> np.ndarray:
+    """Embed texts in as few requests as the provider's input limits allow."""
+    vectors = []
+    start = 0
+    while start < len(texts):
+        end, chars = start, 0
+        while end < len(texts) and end - start < batch_size:
+            if end > start and chars + len(texts[end]) > batch_chars:
+                break
+            chars += len(texts[end])
+            end += 1
+        resp = client.embeddings.create(model=embed_model, input=texts[start:end])
+        vectors.extend(d.embedding for d in resp.data)
+        start = end
+    return np.asarray(vectors, dtype="float32")
+
+
+class LocalEmbeddingClient:
+    """Offline stand-in for the OpenAI embeddings client: hashed bag-of-words
+    vectors, deterministic across processes. Used when embed_model is
+    LOCAL_EMBED_MODEL."""
+
+    def __init__(self, dim: int = LOCAL_EMBED_DIM):
+        self.dim = dim
+        self.embeddings = self  # mimic client.embeddings.create(...)
+
+    def create(self, model: str, input: list[str]):
+        data = []
+        for text in input:
+            vec = np.zeros(self.dim, dtype="float32")
+            for token in re.findall(r"\w+", text.lower()):
+                h = int.from_bytes(
+                    hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little"
+                )
+                vec[h % self.dim] += -1.0 if h >> 63 else 1.0
+            norm = np.linalg.norm(vec)
+            data.append(SimpleNamespace(embedding=(vec / norm if norm else vec).tolist()))
+        return SimpleNamespace(data=data)
+
+
+class EmbeddingCache:
+    """Append-only content-hash → vector cache for one embedding model.
+
+    Lives in `<index_dir>/embedding_cache/` as `<model>.keys` (one sha256 per line)
+    and `<model>.f32` (raw float32 rows in the same order), plus `<model>.json`
+    with the vector dimension. Unchanged chunks are never re-embedded and the
+    dimension is known without an API call.
+    """
+
+    def __init__(self, cache_dir: Path, embed_model: str):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        name = re.sub(r"[^\w.-]", "_", embed_model)
+        self.keys_path = cache_dir / f"{name}.keys"
+        self.vecs_path = cache_dir / f"{name}.f32"
+        self.info_path = cache_dir / f"{name}.json"
+        self.embed_model = embed_model
+        self.dim: Optional[int] = None
+        self._vectors: Dict[str, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        if not self.info_path.exists():
+            return
+        self.dim = json.loads(self.info_path.read_text())["dim"]
+        keys = self.keys_path.read_text().split() if self.keys_path.exists() else []
+        rows = (
+            np.fromfile(self.vecs_path, dtype="float32")
+            if self.vecs_path.exists()
+            else np.zeros(0, dtype="float32")
+        )
+        n = min(len(keys), rows.size // self.dim)
+        if n != len(keys) or n * self.dim != rows.size:
+            # an interrupted append left the files out of step; drop the partial tail
+            keys = keys[:n]
+            self.keys_path.write_text("".join(f"{k}\n" for k in keys))
+            os.truncate(self.vecs_path, n * self.dim * 4)
+        matrix = rows[: n * self.dim].reshape(n, self.dim)
+        self._vectors = dict(zip(keys, matrix))
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _append(self, keys: List[str], vectors: np.ndarray):
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            self.info_path.write_text(json.dumps({"model": self.embed_model, "dim": self.dim}))
+        vectors = np.ascontiguousarray(vectors, dtype="float32")
+        # vectors first: a crash before the keys are written only leaves an orphan tail
+        with open(self.vecs_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.keys_path, "a") as f:
+            f.write("".join(f"{k}\n" for k in keys))
+        self._vectors.update(zip(keys, vectors))
+
+    def embed(self, texts: List[str], client) -> np.ndarray:
+        """Vectors for `texts`, calling the provider only for texts not seen before."""
+        keys = [self.key(t) for t in texts]
+        missing: Dict[str, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in self._vectors:
+                missing.setdefault(k, t)
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+        if missing:
+            self._append(list(missing), embed_texts(list(missing.values()), client, self.embed_model))
+        if not keys:
+            return np.zeros((0, self.dim or 0), dtype="float32")
+        return np.stack([self._vectors[k] for k in keys])
 
 # ─────────────────────────────── Vector store ───────────────────────────────
+def chunk_id_int(chunk_id: str) -> int:
+    """Stable 63-bit FAISS id for a chunk id (unlike hash(), not salted per process)."""
+    digest = hashlib.blake2b(chunk_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & (2**63 - 1)
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """Largest divisor of `dim` that is at most dim/4 (≥16x smaller than float32)."""
+    return next(m for m in range(max(1, dim // 4), 0, -1) if dim % m == 0)
+
+
+def _index_kind(index) -> str:
+    """Which of INDEX_TYPES a (possibly loaded) FAISS index is."""
+    if hasattr(index, "id_map"):
+        inner = faiss.downcast_index(index.index)
+        return "hnsw" if isinstance(inner, faiss.IndexHNSW) else "flat"
+    return "ivfpq" if isinstance(faiss.downcast_index(index), faiss.IndexIVFPQ) else "ivf"
+
+
 class FaissStore:
-    def __init__(self, dim: int, index_dir: Path, embed_model: str):
+    """FAISS vectors plus chunk metadata in SQLite (`metadata.sqlite`).
+
+    Chunk metadata, chunk text and per-file signatures live in separate tables
+    and are written row by row as chunks are added or removed, so `save()` only
+    commits the open transaction and writes the FAISS index.
+
+    The index starts as an exact flat scan. With `index_type` set to "ivf",
+    "ivfpq" or "hnsw" it is rebuilt as that approximate index (trained on the
+    stored vectors) once it holds `ann_min_vectors` vectors. `mmap=True` memory-maps
+    the saved index for searching; it is read into memory on the first update.
+    """
+
+    def __init__(
+        self,
+        dim: Optional[int],
+        index_dir: Path,
+        embed_model: str,
+        *,
+        index_type: str = "flat",
+        ann_min_vectors: int = ANN_MIN_VECTORS,
+        mmap: bool = False,
+    ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"index_type must be one of {INDEX_TYPES}, got {index_type!r}")
+        self.index_type = index_type
+        self.ann_min_vectors = ann_min_vectors
         self.index_dir = index_dir
         self.index_path = index_dir / "faiss.index"
-        self.meta_path = index_dir / "metadata.json"
+        self.db_path = index_dir / "metadata.sqlite"
         self.embed_model = embed_model
         self.index_dir.mkdir(exist_ok=True)
+        new_db = not self.db_path.exists()
+        # the watcher thread updates the store too; RepoIndexer serializes access
+        self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY, file TEXT NOT NULL, meta TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS chunks_file ON chunks(file);
+            CREATE TABLE IF NOT EXISTS contents (id INTEGER PRIMARY KEY, content TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS files (file TEXT PRIMARY KEY, sig TEXT);
+            """
+        )
+        legacy = [p for p in (index_dir / "metadata.json", index_dir / "manifest.json") if p.exists()]
+        if self.index_path.exists() and new_db and legacy:
+            # ids in JSON-era stores came from the salted hash() and can't be mapped
+            # back; rebuild once (unchanged chunks come from the embedding cache)
+            print("[FaissStore] Rebuilding legacy metadata.json store")
+            self.index_path.unlink()
+            for p in legacy:
+                p.unlink()
+        self._mmapped = False
         if self.index_path.exists():
+            if mmap:
+                self.index = faiss.read_index(
+                    str(self.index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+                self._mmapped = True
+            else:
+                self.index = faiss.read_index(str(self.index_path))
+            self._configure_search()
+        else:
+            # with an unknown dim the index is created by the first add()
+            self.index = faiss.IndexIDMap(faiss.IndexFlatIP(dim)) if dim else None
+        self._tombstones = self._count_tombstones()
+        # file -> {"sig": (mtime_ns, size), "ids": {chunk ids}}, so per-file lookups
+        # don't scan every chunk's metadata
+        self.files: dict[str, dict[str, Any]] = {
+            file: {"sig": tuple(json.loads(sig)) if sig else None, "ids": set()}
+            for file, sig in self.db.execute("SELECT file, sig FROM files")
+        }
+        for id_, file in self.db.execute("SELECT id, file FROM chunks"):
+            self.files.setdefault(file, {"sig": None, "ids": set()})["ids"].add(id_)
+
+    def __len__(self) -> int:
+        return sum(len(entry["ids"]) for entry in self.files.values())
+
+    def file_sig(self, file: str) -> Optional[tuple[int, int]]:
+        entry = self.files.get(file)
+        return tuple(entry["sig"]) if entry and entry["sig"] else None
+
+    def mark_file(self, file: str, sig: Optional[tuple[int, int]]):
+        """Record a file's signature (also for files that produced no chunks)."""
+        self.files.setdefault(file, {"sig": None, "ids": set()})["sig"] = sig
+        self.db.execute(
+            "INSERT OR REPLACE INTO files (file, sig) VALUES (?, ?)",
+            (file, json.dumps(list(sig)) if sig else None),
+        )
+
+    # ---------- index modes ----------
+    def _configure_search(self):
+        kind = _index_kind(self.index)
+        if kind in ("ivf", "ivfpq"):
+            faiss.extract_index_ivf(self.index).nprobe = IVF_NPROBE
+        elif kind == "hnsw":
+            faiss.downcast_index(self.index.index).hnsw.efSearch = HNSW_EF_SEARCH
+
+    def _writable_index(self):
+        """The index, read fully into memory if it was memory-mapped."""
+        if self._mmapped:
             self.index = faiss.read_index(str(self.index_path))
-            self.meta: dict[str, dict[str, Any]] = json.loads(self.meta_path.read_text())
+            self._mmapped = False
+            self._configure_search()
+        return self.index
+
+    def _stored_vectors(self):
+        """(vectors, ids) held by a flat or hnsw index."""
+        inner = faiss.downcast_index(self.index.index)
+        return inner.reconstruct_n(0, inner.ntotal), faiss.vector_to_array(self.index.id_map)
+
+    def _build_index(self, kind: str, vectors, ids):
+        dim, n = vectors.shape[1], len(vectors)
+        if kind == "flat":
+            index = faiss.IndexIDMap(faiss.IndexFlatIP(dim))
+        elif kind == "hnsw":
+            hnsw = faiss.IndexHNSWFlat(dim, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            hnsw.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            index = faiss.IndexIDMap2(hnsw)
         else:
-            self.index = faiss.IndexIDMap(faiss.IndexFlatIP(dim))
-            self.meta = {}
-
+            # ~4·sqrt(n) lists, with the ≥39 training points per list FAISS asks for
+            nlist = max(1, min(int(4 * np.sqrt(n)), n // 39))
+            codec = "Flat" if kind == "ivf" else f"PQ{_pq_subquantizers(dim)}"
+            index = faiss.index_factory(dim, f"IVF{nlist},{codec}", faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+        if n:
+            index.add_with_ids(vectors, ids)
+        self.index = index
+        self._tombstones = 0
+        self._configure_search()
+
+    def _maybe_build_ann(self):
+        if (
+            self.index_type != "flat"
+            and self.index is not None
+            and _index_kind(self.index) == "flat"
+            and self.index.ntotal >= self.ann_min_vectors
+            # PQ codebooks need at least 256 training vectors
+            and (self.index_type != "ivfpq" or self.index.ntotal >= 256)
+        ):
+            print(f"[FaissStore] Building {self.index_type} index over {self.index.ntotal} vectors")
+            self._writable_index()
+            self._build_index(self.index_type, *self._stored_vectors())
+
+    def _count_tombstones(self) -> int:
+        """Removed vectors still in an hnsw graph (their id label is -1)."""
+        if self.index is None or _index_kind(self.index) != "hnsw":
+            return 0
+        return int(np.count_nonzero(faiss.vector_to_array(self.index.id_map) == -1))
+
+    def _tombstone(self, id_ints):
+        """Relabel the vectors of `id_ints` to -1, which FAISS search reports as no
+        result, and rebuild the graph once too much of it is tombstoned."""
+        # a view on the index's own label array, so the relabel is saved with it
+        labels = faiss.rev_swig_ptr(self.index.id_map.data(), self.index.id_map.size())
+        dead = np.flatnonzero(np.isin(labels, id_ints))
+        labels[dead] = -1
+        self._tombstones += len(dead)
+        if self._tombstones > HNSW_MAX_TOMBSTONE_FRACTION * self.index.ntotal:
+            vectors, ids = self._stored_vectors()
+            live = ids != -1
+            print(f"[FaissStore] Rebuilding hnsw index without {self._tombstones} removed vectors")
+            self._build_index("hnsw", vectors[live], ids[live])
+
+    # ---------- updates ----------
     def add(self, ids, vectors, metas):
-        id_ints = np.array([abs(hash(x)) % 2**63 for x in ids], dtype="int64")
-        self.index.add_with_ids(vectors, id_ints)
-        self.meta.update({str(i): m for i, m in zip(id_ints, metas)})
+        if self.index is None:
+            self._build_index("flat", np.zeros((0, vectors.shape[1]), "float32"), None)
+        id_ints = np.array([chunk_id_int(x) for x in ids], dtype="int64")
+        # re-adding a chunk replaces it instead of leaving a duplicate vector behind
+        self._remove_id_ints(id_ints)
+        _, first = np.unique(id_ints, return_index=True)
+        first.sort()
+        self._writable_index().add_with_ids(vectors[first], id_ints[first])
+        rows, contents = [], []
+        for j in first:
+            id_, m = int(id_ints[j]), dict(metas[j])
+            contents.append((id_, m.pop("content", "")))
+            rows.append((id_, m["file"], json.dumps(m)))
+            self.files.setdefault(m["file"], {"sig": None, "ids": set()})["ids"].add(id_)
+            if "sig" in m and self.file_sig(m["file"]) != tuple(m["sig"]):
+                self.mark_file(m["file"], tuple(m["sig"]))
+        self.db.executemany("INSERT INTO chunks (id, file, meta) VALUES (?, ?, ?)", rows)
+        self.db.executemany("INSERT INTO contents (id, content) VALUES (?, ?)", contents)
 
     def remove(self, ids):
-        id_ints = np.array([abs(hash(x)) % 2**63 for x in ids], dtype="int64")
-        self.index.remove_ids(id_ints)
-        for i in id_ints:
-            self.meta.pop(str(i), None)
+        self._remove_id_ints(np.array([chunk_id_int(x) for x in ids], dtype="int64"))
+
+    def remove_file(self, file: str) -> bool:
+        """Drop every chunk of `file`; returns False if the file was not indexed."""
+        entry = self.files.pop(file, None)
+        if entry is None:
+            return False
+        self._remove_id_ints(np.array(sorted(entry["ids"]), dtype="int64"))
+        self.db.execute("DELETE FROM files WHERE file = ?", (file,))
+        return True
+
+    def _remove_id_ints(self, id_ints):
+        if self.index is None or len(id_ints) == 0:
+            return
+        rows = self._select("SELECT id, file FROM chunks", id_ints)
+        if not rows:
+            return
+        existing = np.array([id_ for id_, _ in rows], dtype="int64")
+        if _index_kind(self._writable_index()) == "hnsw":
+            self._tombstone(existing)
+        else:
+            self.index.remove_ids(existing)
+        for id_, file in rows:
+            entry = self.files.get(file)
+            if entry is not None:
+                entry["ids"].discard(id_)
+        params = [(int(i),) for i in existing]
+        self.db.executemany("DELETE FROM chunks WHERE id = ?", params)
+        self.db.executemany("DELETE FROM contents WHERE id = ?", params)
+
+    def _select(self, query: str, id_ints) -> list:
+        """Run `query ... WHERE id IN (id_ints)` in batches under SQLite's variable limit."""
+        rows = []
+        id_list = [int(i) for i in id_ints]
+        for start in range(0, len(id_list), 500):
+            batch = id_list[start : start + 500]
+            rows.extend(
+                self.db.execute(
+                    f"{query} WHERE id IN ({','.join('?' * len(batch))})", batch
+                )
+            )
+        return rows
 
     def save(self):
-        faiss.write_index(self.index, str(self.index_path))
-        self.meta_path.write_text(json.dumps(self.meta, indent=2))
+        self.db.commit()
+        if self.index is not None and not self._mmapped:
+            self._maybe_build_ann()
+            faiss.write_index(self.index, str(self.index_path))
 
     def search(self, vector, k):
-        D, I = self.index.search(vector, k)
+        if self.index is None:
+            return []
+        # tombstoned hnsw vectors take result slots: over-fetch until k live hits
+        fetch = k + min(self._tombstones, k)
+        while True:
+            D, I = self.index.search(vector, fetch)
+            found = [(float(score), int(idx)) for score, idx in zip(D[0], I[0]) if idx != -1]
+            if len(found) >= k or not self._tombstones or fetch >= self.index.ntotal:
+                break
+            fetch = min(2 * fetch, self.index.ntotal)
+        found = found[:k]
+        rows = {
+            id_: (meta, content)
+            for id_, meta, content in self._select(
+                "SELECT chunks.id, meta, content FROM chunks JOIN contents USING (id)",
+                [idx for _, idx in found],
+            )
+        }
         hits = []
-        for score, idx in zip(D[0], I[0]):
-            if idx == -1:
+        for score, idx in found:
+            if idx not in rows:
                 continue
-            hits.append({"score": float(score), **self.meta[str(idx)]})
+            meta, content = rows[idx]
+            hits.append({"score": score, **json.loads(meta), "content": content})
         return hits
 
 # ─────────────────────────────── Indexer ────────────────────────────────────
@@ -179,14 +574,30 @@ class RepoIndexer:
         index_dir: Path = None,
         embed_model: str = "text-embedding-3-small",
         openai_api_key: str = None,
+        index_type: str = "flat",
+        ann_min_vectors: int = ANN_MIN_VECTORS,
+        mmap_index: bool = False,
     ):
         self.root = Path(root)
         self.index_dir = index_dir or Path("vector_store")
         self.embed_model = embed_model
-        self.client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY_EMBEDDINGS"))
+        if embed_model == LOCAL_EMBED_MODEL:
+            self.client = LocalEmbeddingClient()
+        else:
+            self.client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY_EMBEDDINGS"))
         self._lock = threading.RLock()
-        dim = len(embed_texts(["probe"], self.client, self.embed_model)[0])
-        self.store = FaissStore(dim, self.index_dir, self.embed_model)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.embed_cache = EmbeddingCache(self.index_dir / "embedding_cache", self.embed_model)
+        self._query_vectors: OrderedDict[str, np.ndarray] = OrderedDict()
+        # dim comes from the cache (or the stored index); a fresh store learns it on first add
+        self.store = FaissStore(
+            self.embed_cache.dim,
+            self.index_dir,
+            self.embed_model,
+            index_type=index_type,
+            ann_min_vectors=ann_min_vectors,
+            mmap=mmap_index,
+        )
         self._sync_on_init()
         if watch:
             self._start_watcher()
@@ -194,7 +605,14 @@ class RepoIndexer:
     # ---------- public ----------
     def semantic_search(self, query: str, k: int = 5):
         with self._lock:
-            vec = embed_texts([query], self.client, self.embed_model)
+            vec = self._query_vectors.get(query)
+            if vec is None:
+                vec = embed_texts([query], self.client, self.embed_model)
+                self._query_vectors[query] = vec
+                if len(self._query_vectors) > QUERY_CACHE_SIZE:
+                    self._query_vectors.popitem(last=False)
+            else:
+                self._query_vectors.move_to_end(query)
             return self.store.search(vec, k=k)
 
     def update_file(self, path: str | Path):
@@ -227,21 +645,22 @@ class RepoIndexer:
 
     def _sync_on_init(self):
         with self._lock:
-            existing_files = {m["file"] for m in self.store.meta.values()}
-            current_files = {str(p.resolve()) for p in self.root.rglob("*.*")}
-            for dead in existing_files - current_files:
-                self._delete_file(Path(dead))
-            for p_str in current_files:
-                p = Path(p_str)
-                sig = _file_sig(p)
-                sig_in_meta: Optional[tuple[int, int]] = None
-                for m in self.store.meta.values():
-                    if m["file"] == p_str:
-                        sig_in_meta = tuple(m.get("sig", ())) or None
-                        break
-                if sig_in_meta != sig:
-                    self._reindex_file(p, sig)
-            self.store.save()
+            existing_files = set(self.store.files)
+            current_files = sorted({str(p.resolve()) for p in self.root.rglob("*.*")})
+            with ThreadPoolExecutor() as pool:
+                sigs = list(pool.map(_try_file_sig, current_files))
+            current = {p_str: sig for p_str, sig in zip(current_files, sigs) if sig}
+            dead_files = existing_files - set(current)
+            for dead in dead_files:
+                self.store.remove_file(dead)
+            changed: List[Tuple[Path, tuple[int, int]]] = [
+                (Path(p_str), sig)
+                for p_str, sig in current.items()
+                if self.store.file_sig(p_str) != sig
+            ]
+            if changed or dead_files:
+                self._reindex_files(changed)
+                self.store.save()  # once, after all files are in
 
     # ---------- helpers ----------
     # def _reindex_file(self, path: Path, sig: Optional[tuple[int, int]] = None):
@@ -259,18 +678,31 @@ class RepoIndexer:
     #         self.store.add(ids, vecs, metas)
 
     def _reindex_file(self, path: Path, sig: Optional[tuple[int, int]] = None):
-        norm_path = str(path.resolve())
-        new_chunks = chunk_file(path)
-        old_ids = [id_ for id_, m in self.store.meta.items() if m["file"] == norm_path]
-        if old_ids:
-            self.store.remove(old_ids)
-        if new_chunks:
-            ids = [c["id"] for c in new_chunks]
-            vecs = embed_texts([c["content"] for c in new_chunks], self.client, self.embed_model)
-            for c in new_chunks:
-                c["meta"]["sig"] = sig or _file_sig(path)
+        self._reindex_files([(path, sig or _file_sig(path))])
+
+    def _reindex_files(self, files: List[Tuple[Path, tuple[int, int]]]):
+        """Re-chunk files and embed their chunks together, in shared batches;
+        chunks whose text is already in the embedding cache are not re-embedded."""
+        new_chunks = []
+        if len(files) > 1:
+            with ThreadPoolExecutor() as pool:
+                chunk_lists = list(pool.map(chunk_file, [path for path, _ in files]))
+        else:
+            chunk_lists = [chunk_file(path) for path, _ in files]
+        for (path, sig), chunks in zip(files, chunk_lists):
+            norm_path = str(path.resolve())
+            self.store.remove_file(norm_path)
+            if not chunks:
+                # remember the signature so unchanged chunkless files are skipped next sync
+                self.store.mark_file(norm_path, sig)
+            for c in chunks:
+                c["meta"]["sig"] = sig
                 c["meta"]["content"] = c["content"]
                 c["meta"]["file"] = norm_path  # always store normalized path
+                new_chunks.append(c)
+        if new_chunks:
+            ids = [c["id"] for c in new_chunks]
+            vecs = self.embed_cache.embed([c["content"] for c in new_chunks], self.client)
             metas = [c["meta"] for c in new_chunks]
             self.store.add(ids, vecs, metas)
 
@@ -280,10 +712,7 @@ class RepoIndexer:
     #         self.store.remove(dead)
 
     def _delete_file(self, path: Path):
-        norm_path = str(path.resolve())
-        dead = [id_ for id_, m in self.store.meta.items() if m["file"] == norm_path]
-        if dead:
-            self.store.remove(dead)
+        self.store.remove_file(str(path.resolve()))
 
     # ---------- Watchdog ----------
     def _start_watcher(self):
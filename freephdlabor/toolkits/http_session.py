@@ -0,0 +1,70 @@
+"""
+Process-wide pooled HTTP session for tools that call web APIs.
+
+Bare `requests.get` opens a new TCP/TLS connection for every call. Tools that
+query Semantic Scholar, arXiv, etc. use `get_http_session()` instead: one
+keep-alive `requests.Session` whose adapters keep at most
+HTTP_POOL_MAXSIZE connections per host and retry rate-limited (429) and
+transient 5xx responses with exponential backoff, honoring Retry-After.
+"""
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Hosts (connection pools) kept alive at once
+HTTP_POOL_CONNECTIONS = 16
+# Concurrent connections per host; further requests wait for a free connection
+HTTP_POOL_MAXSIZE = 4
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 2.0  # sleeps 2s, 4s, 8s between retries (or Retry-After)
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_USER_AGENT = "freephdlabor/1.0 (research-tool)"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_http_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    retries: int = HTTP_RETRIES,
+    backoff_factor: float = HTTP_BACKOFF_FACTOR,
+) -> requests.Session:
+    """Build a keep-alive session with per-host connection limits and a retry policy."""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        # hand the final response back so callers keep their raise_for_status/429 handling
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=True,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = HTTP_USER_AGENT
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """The shared session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_http_session()
+    return _session
@@ -0,0 +1,252 @@
+"""
+Shared literature-search service for Semantic Scholar and arXiv.
+
+Citation search, paper search, LaTeX citation resolution and AI-Scientist's
+citation gathering all query the same two APIs, often with the same queries.
+They go through `get_literature_search()` instead of calling the APIs directly:
+
+- responses are kept in a persistent SQLite cache, keyed by the normalized
+  query (case and whitespace folded) and the requested fields/limit, and
+  reused for LITERATURE_SEARCH_CACHE_TTL_HOURS (default one week);
+- concurrent identical searches are coalesced into one request;
+- each API has one token-bucket rate limiter shared by all callers in the
+  process, replacing per-caller politeness sleeps;
+- requests use the pooled session from http_session (429/5xx retry).
+
+The cache lives at LITERATURE_SEARCH_CACHE (default
+~/.cache/freephdlabor/literature_search.sqlite3); subprocesses inherit the
+variable and share it. LITERATURE_SEARCH_S2_URL and LITERATURE_SEARCH_ARXIV_URL
+point the service at another endpoint, e.g. a LiteratureSearchStub in tests.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+from .http_session import get_http_session
+
+SEMANTIC_SCHOLAR_SEARCH_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+ARXIV_QUERY_URL = "http://export.arxiv.org/api/query"
+DEFAULT_S2_FIELDS = "title,authors,year,abstract,citationCount,venue,externalIds,url"
+DEFAULT_CACHE_PATH = os.path.join("~", ".cache", "freephdlabor", "literature_search.sqlite3")
+DEFAULT_CACHE_TTL_HOURS = 24 * 7
+
+# Requests per second. Semantic Scholar allows 1/s with an API key and shares a
+# much smaller pool between all keyless clients; arXiv asks for spaced-out calls.
+S2_RATE_WITH_KEY = 1.0
+S2_RATE_WITHOUT_KEY = 0.5
+ARXIV_RATE = 1.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per second in bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until it is available. Returns the time waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # reserve the token now so concurrent callers queue up behind each other
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class SearchCache:
+    """Persistent TTL cache of raw search responses, safe across threads and processes."""
+
+    def __init__(self, path: str, ttl_s: float):
+        self.path = os.path.expanduser(path)
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        # WAL lets the AI-Scientist subprocess read while this process writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._db:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS searches (
+                    key TEXT PRIMARY KEY, source TEXT NOT NULL, query TEXT NOT NULL,
+                    created REAL NOT NULL, payload TEXT NOT NULL);
+                CREATE INDEX IF NOT EXISTS searches_created ON searches(created);
+                """
+            )
+            self._db.execute("DELETE FROM searches WHERE created < ?", (time.time() - ttl_s,))
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload FROM searches WHERE key = ? AND created >= ?",
+                (key, time.time() - self.ttl_s),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, source: str, query: str, payload: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO searches (key, source, query, created, payload) VALUES (?, ?, ?, ?, ?)",
+                (key, source, query, time.time(), payload),
+            )
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def normalize_fields(fields: str) -> str:
+    return ",".join(sorted({f.strip() for f in fields.split(",") if f.strip()}))
+
+
+class LiteratureSearch:
+    """Cached, coalesced and rate-limited access to the Semantic Scholar and arXiv search APIs."""
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+        ttl_hours: float = DEFAULT_CACHE_TTL_HOURS,
+        semantic_scholar_url: str = SEMANTIC_SCHOLAR_SEARCH_URL,
+        arxiv_url: str = ARXIV_QUERY_URL,
+        s2_api_key: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+    ):
+        """
+        Args:
+            cache_path: SQLite cache file; None or a ttl_hours of 0 disables caching
+            ttl_hours: How long a cached response is reused
+            semantic_scholar_url: Semantic Scholar paper search endpoint
+            arxiv_url: arXiv API query endpoint
+            s2_api_key: Semantic Scholar API key (sent as X-API-KEY)
+            session: HTTP session to use (default: the shared pooled session)
+        """
+        self.cache = SearchCache(cache_path, ttl_hours * 3600) if cache_path and ttl_hours > 0 else None
+        self.semantic_scholar_url = semantic_scholar_url
+        self.arxiv_url = arxiv_url
+        self.s2_api_key = s2_api_key
+        self.session = session
+        self.limiters = {
+            "semantic_scholar": TokenBucket(S2_RATE_WITH_KEY if s2_api_key else S2_RATE_WITHOUT_KEY),
+            "arxiv": TokenBucket(ARXIV_RATE),
+        }
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def search_semantic_scholar(self, query: str, limit: int = 10, fields: str = DEFAULT_S2_FIELDS) -> Dict[str, Any]:
+        """Semantic Scholar paper search; returns the decoded JSON response ({"total", "data", ...}).
+
+        Raises requests.HTTPError when the request still fails after the session's retries.
+        """
+        params = {"query": normalize_query(query), "limit": int(limit), "fields": normalize_fields(fields)}
+        headers = {"X-API-KEY": self.s2_api_key} if self.s2_api_key else {}
+
+        def fetch() -> str:
+            response = self._get("semantic_scholar", self.semantic_scholar_url, params=params, headers=headers)
+            # validate before caching
+            return json.dumps(response.json())
+
+        return json.loads(self._cached("semantic_scholar", params, fetch))
+
+    def search_arxiv(
+        self,
+        query: str,
+        max_results: int = 10,
+        sort_by: Optional[str] = None,
+        sort_order: Optional[str] = None,
+    ) -> str:
+        """arXiv search over all fields; returns the Atom XML feed.
+
+        Raises requests.HTTPError when the request still fails after the session's retries.
+        """
+        params = {"search_query": f"all:{normalize_query(query)}", "start": 0, "max_results": int(max_results)}
+        if sort_by:
+            params["sortBy"] = sort_by
+        if sort_order:
+            params["sortOrder"] = sort_order
+
+        def fetch() -> str:
+            return self._get("arxiv", self.arxiv_url, params=params).text
+
+        return self._cached("arxiv", params, fetch)
+
+    def _get(self, source: str, url: str, **kwargs) -> requests.Response:
+        self.limiters[source].acquire()
+        session = self.session or get_http_session()
+        response = session.get(url, timeout=30, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _cached(self, source: str, params: Dict[str, Any], fetch: Callable[[], str]) -> str:
+        """Return the cached payload for `params`, or fetch it once however many threads ask."""
+        key = hashlib.sha256(json.dumps([source, params], sort_keys=True).encode("utf-8")).hexdigest()
+        if self.cache is not None:
+            payload = self.cache.get(key)
+            if payload is not None:
+                return payload
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            # a previous leader may have stored it between our cache miss and taking the lead
+            payload = self.cache.get(key) if self.cache is not None else None
+            if payload is None:
+                payload = fetch()
+                if self.cache is not None:
+                    query = params.get("query") or params.get("search_query", "")
+                    self.cache.put(key, source, query, payload)
+            future.set_result(payload)
+            return payload
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+
+_service: Optional[LiteratureSearch] = None
+_service_lock = threading.Lock()
+
+
+def get_literature_search() -> LiteratureSearch:
+    """The process-wide service, configured from the environment on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = LiteratureSearch(
+                    cache_path=os.environ.get("LITERATURE_SEARCH_CACHE", DEFAULT_CACHE_PATH) or None,
+                    ttl_hours=float(os.environ.get("LITERATURE_SEARCH_CACHE_TTL_HOURS", DEFAULT_CACHE_TTL_HOURS)),
+                    semantic_scholar_url=os.environ.get("LITERATURE_SEARCH_S2_URL", SEMANTIC_SCHOLAR_SEARCH_URL),
+                    arxiv_url=os.environ.get("LITERATURE_SEARCH_ARXIV_URL", ARXIV_QUERY_URL),
+                    s2_api_key=os.environ.get("S2_API_KEY"),
+                )
+    return _service
@@ -0,0 +1,180 @@
+"""
+Local stand-in for the Semantic Scholar and arXiv search APIs.
+
+Serves a fixed set of papers over HTTP in the response formats LiteratureSearch
+parses, so searches can be exercised without network access or rate limits:
+
+    with LiteratureSearchStub() as stub:
+        service = LiteratureSearch(
+            cache_path=None,
+            semantic_scholar_url=stub.semantic_scholar_url,
+            arxiv_url=stub.arxiv_url,
+        )
+        service.search_semantic_scholar("attention transformers")
+        assert len(stub.requests) == 1
+
+Whole processes can be pointed at it through LITERATURE_SEARCH_S2_URL and
+LITERATURE_SEARCH_ARXIV_URL (see `stub.env()`).
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+DEFAULT_PAPERS = [
+    {
+        "paperId": "204e3073870fae3d05bcbc2f6a8e263d9b72e776",
+        "title": "Attention Is All You Need",
+        "authors": [{"name": "Ashish Vaswani"}, {"name": "Noam Shazeer"}],
+        "year": 2017,
+        "venue": "Neural Information Processing Systems",
+        "abstract": "The dominant sequence transduction models are based on complex recurrent or "
+                    "convolutional neural networks. We propose the Transformer, based solely on attention.",
+        "citationCount": 100000,
+        "externalIds": {"ArXiv": "1706.03762"},
+        "url": "https://www.semanticscholar.org/paper/204e3073870fae3d05bcbc2f6a8e263d9b72e776",
+        "citationStyles": {"bibtex": "@inproceedings{Vaswani2017AttentionIA,\n title={Attention Is All You Need},\n "
+                                     "author={Ashish Vaswani and Noam Shazeer},\n year={2017}\n}"},
+    },
+    {
+        "paperId": "2c03df8b48bf3fa39054345bafabfeff15bfd11d",
+        "title": "Deep Residual Learning for Image Recognition",
+        "authors": [{"name": "Kaiming He"}, {"name": "X. Zhang"}],
+        "year": 2016,
+        "venue": "Computer Vision and Pattern Recognition",
+        "abstract": "We present a residual learning framework to ease the training of networks that "
+                    "are substantially deeper than those used previously.",
+        "citationCount": 150000,
+        "externalIds": {"ArXiv": "1512.03385"},
+        "url": "https://www.semanticscholar.org/paper/2c03df8b48bf3fa39054345bafabfeff15bfd11d",
+        "citationStyles": {"bibtex": "@inproceedings{He2016DeepRL,\n title={Deep Residual Learning for Image "
+                                     "Recognition},\n author={Kaiming He and X. Zhang},\n year={2016}\n}"},
+    },
+]
+
+S2_SEARCH_PATH = "/graph/v1/paper/search"
+ARXIV_QUERY_PATH = "/api/query"
+
+
+class LiteratureSearchStub:
+    """Threaded HTTP server answering Semantic Scholar and arXiv searches from `papers`.
+
+    A paper matches when any query word occurs in its title or abstract. Every
+    request is recorded in `requests` as (path, params); `fail_next` makes the
+    next requests return an error status (e.g. 429) to exercise retries.
+    """
+
+    def __init__(self, papers: Optional[List[Dict]] = None, host: str = "127.0.0.1", port: int = 0):
+        self.papers = papers if papers is not None else DEFAULT_PAPERS
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+        self._failures: List[int] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def semantic_scholar_url(self) -> str:
+        return self.base_url + S2_SEARCH_PATH
+
+    @property
+    def arxiv_url(self) -> str:
+        return self.base_url + ARXIV_QUERY_PATH
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point get_literature_search() at this stub."""
+        return {"LITERATURE_SEARCH_S2_URL": self.semantic_scholar_url, "LITERATURE_SEARCH_ARXIV_URL": self.arxiv_url}
+
+    def fail_next(self, status: int = 429, count: int = 1) -> None:
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def start(self) -> "LiteratureSearchStub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LiteratureSearchStub":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _matches(self, query: str) -> List[Dict]:
+        words = query.lower().replace("all:", " ").split()
+        return [
+            paper for paper in self.papers
+            if any(word in f"{paper['title']} {paper.get('abstract', '')}".lower() for word in words)
+        ]
+
+    def _s2_response(self, params: Dict[str, str]) -> Tuple[str, bytes]:
+        matches = self._matches(params.get("query", ""))
+        fields = [f for f in params.get("fields", "title").split(",") if f]
+        data = [
+            {"paperId": paper["paperId"], **{f: paper[f] for f in fields if f in paper}}
+            for paper in matches[: int(params.get("limit", 10))]
+        ]
+        body = {"total": len(matches), "offset": 0, "data": data}
+        return "application/json", json.dumps(body).encode("utf-8")
+
+    def _arxiv_response(self, params: Dict[str, str]) -> Tuple[str, bytes]:
+        matches = self._matches(params.get("search_query", ""))
+        entries = []
+        for paper in matches[: int(params.get("max_results", 10))]:
+            arxiv_id = paper.get("externalIds", {}).get("ArXiv", paper["paperId"])
+            authors = "".join(f"<author><name>{escape(a['name'])}</name></author>" for a in paper["authors"])
+            entries.append(
+                f"<entry><id>http://arxiv.org/abs/{arxiv_id}v1</id>"
+                f"<published>{paper['year']}-01-01T00:00:00Z</published>"
+                f"<title>{escape(paper['title'])}</title>"
+                f"<summary>{escape(paper.get('abstract', ''))}</summary>{authors}"
+                f'<link title="pdf" href="http://arxiv.org/pdf/{arxiv_id}v1" rel="related" type="application/pdf"/>'
+                f"</entry>"
+            )
+        feed = f'<?xml version="1.0" encoding="UTF-8"?><feed xmlns="http://www.w3.org/2005/Atom">{"".join(entries)}</feed>'
+        return "application/atom+xml", feed.encode("utf-8")
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with stub._lock:
+                    stub.requests.append((url.path, params))
+                    status = stub._failures.pop(0) if stub._failures else None
+                if status is not None:
+                    self._send(status, "application/json", json.dumps({"message": "stub failure"}).encode("utf-8"))
+                elif url.path == S2_SEARCH_PATH:
+                    self._send(200, *stub._s2_response(params))
+                elif url.path == ARXIV_QUERY_PATH:
+                    self._send(200, *stub._arxiv_response(params))
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def _send(self, status: int, content_type: str, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -1,45 +1,23 @@
 import json
 import os
-import time
 from typing import List, Dict, Union, Optional
 
-import backoff
-import requests
 from smolagents import Tool
 
-
-def on_backoff(details):
-    print(
-        f"Backing off {details['wait']:0.1f} seconds after {details['tries']} tries "
-        f"calling function {details['target'].__name__} at {time.strftime('%X')}"
-    )
+from .literature_search import get_literature_search
 
 
-@backoff.on_exception(
-    backoff.expo, requests.exceptions.HTTPError, on_backoff=on_backoff
-)
-def _search_semantic_scholar(query: str, result_limit: int, s2_api_key: str) -> Union[None, List[Dict]]:
-    """Helper function to search Semantic Scholar API"""
+def _search_semantic_scholar(query: str, result_limit: int) -> Union[None, List[Dict]]:
+    """Helper function to search Semantic Scholar API (cached and rate-limited)"""
     if not query:
         return None
     
-    rsp = requests.get(
-        "https://api.semanticscholar.org/graph/v1/paper/search",
-        headers={"X-API-KEY": s2_api_key},
-        params={
-            "query": query,
-            "limit": result_limit,
-            "fields": "title,authors,venue,year,abstract,citationStyles,citationCount",
-        },
+    results = get_literature_search().search_semantic_scholar(
+        query,
+        limit=result_limit,
+        fields="title,authors,venue,year,abstract,citationStyles,citationCount",
     )
-    print(f"Response Status Code: {rsp.status_code}")
-    print(
-        f"Response Content: {rsp.text[:500]}"
-    )  # Print the first 500 characters of the response content
-    rsp.raise_for_status()
-    results = rsp.json()
     total = results["total"]
-    time.sleep(1.0)
     if not total:
         return None
 
@@ -91,7 +69,7 @@ class PaperSearchTool(Tool):
             if not self.s2_api_key:
                 return json.dumps({"error": "S2_API_KEY not configured"})
             
-            papers = _search_semantic_scholar(query, result_limit, self.s2_api_key)
+            papers = _search_semantic_scholar(query, result_limit)
             
             if papers is None:
                 return json.dumps({"message": "No papers found", "papers": []})
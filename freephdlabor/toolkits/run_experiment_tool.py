@@ -71,6 +71,7 @@ class RunExperimentTool(Tool):
         # The tool is in freephdlabor/toolkits, so we go up two levels to the repo root
         # and then into external_tools/run_experiment_tool.
         repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        self.repo_root = repo_root
         self.ai_scientist_path = os.path.join(repo_root, "external_tools", "run_experiment_tool")
         # Convert workspace_dir to absolute path immediately to avoid issues when working directory changes
         self.workspace_dir = os.path.abspath(workspace_dir) if workspace_dir else None
@@ -277,6 +278,8 @@ class RunExperimentTool(Tool):
             
             # Pass environment variables to subprocess
             env = os.environ.copy()
+            # Let AI-Scientist-v2 share freephdlabor's literature search cache
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [self.repo_root, env.get("PYTHONPATH")]))
             
             # Create log directory in workspace if available
             log_dir = None
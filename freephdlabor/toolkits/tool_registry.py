@@ -0,0 +1,45 @@
+"""
+Process-wide registry of shared tool instances.
+
+Several agents carry the same stateless tools (citation/paper search, VLM
+document analysis, LaTeX compilation), configured identically: same
+working_dir, same raw model. Agents build them through `shared_tool` so each
+distinct configuration is constructed once per process and the instance is
+reused by every agent. Only use it for tools that keep no per-call state.
+"""
+
+import threading
+from typing import Any, Dict, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+_tools: Dict[Tuple, Any] = {}
+# re-entrant: a tool's constructor may itself ask for a shared tool
+_tools_lock = threading.RLock()
+
+
+def _config_key(value: Any) -> Any:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ("id", id(value))
+
+
+def shared_tool(tool_class: Type[T], **kwargs) -> T:
+    """Return the shared `tool_class(**kwargs)` instance, constructing it on first use.
+
+    Models and other objects are matched by identity, plain values by equality.
+    """
+    key = (tool_class,) + tuple(sorted((name, _config_key(value)) for name, value in kwargs.items()))
+    with _tools_lock:
+        tool = _tools.get(key)
+        if tool is None:
+            tool = _tools[key] = tool_class(**kwargs)
+    return tool
+
+
+def clear_shared_tools() -> None:
+    """Drop all shared instances (e.g. when switching workspaces in one process)."""
+    with _tools_lock:
+        _tools.clear()
@@ -14,12 +14,13 @@ Combines functionality from fetch_arxiv_papers and web search for academic sourc
 import json
 import os
 import re
-import time
 import requests
 import xml.etree.ElementTree as ET
 from typing import List, Dict, Any, Optional
 from smolagents import Tool
 
+from ..literature_search import get_literature_search
+
 
 class CitationSearchTool(Tool):
     name = "citation_search_tool"
@@ -79,8 +80,6 @@ class CitationSearchTool(Tool):
     def __init__(self):
         """Initialize CitationSearchTool."""
         super().__init__()
-        self.arxiv_base_url = "http://export.arxiv.org/api/query?"
-        self.semantic_scholar_base_url = "https://api.semanticscholar.org/graph/v1/paper/search"
         
     def forward(self, search_query: str, max_results: int = 10, search_source: str = "both") -> str:
         """
@@ -142,62 +141,27 @@ class CitationSearchTool(Tool):
             return json.dumps(error_result, indent=2)
     
     def _search_arxiv(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        """Search arXiv for papers."""
+        """Search arXiv for papers (cached and rate-limited by the literature search service)."""
         try:
-            # Add small delay to be respectful to arXiv API
-            time.sleep(1)
-            
-            url = f"{self.arxiv_base_url}search_query=all:{query}&start=0&max_results={max_results}&sortBy=submittedDate&sortOrder=descending"
-            
-            headers = {
-                "User-Agent": "Academic-Citation-Tool/1.0 (research-tool)"
-            }
-            
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+            response_text = get_literature_search().search_arxiv(
+                query, max_results, sort_by="submittedDate", sort_order="descending"
+            )
             
-            return self._parse_arxiv_response(response.text)
+            return self._parse_arxiv_response(response_text)
             
         except Exception as e:
             print(f"Warning: arXiv search failed: {e}")
             return []
     
     def _search_semantic_scholar(self, query: str, max_results: int) -> List[Dict[str, Any]]:
-        """Search Semantic Scholar for papers with rate limiting."""
+        """Search Semantic Scholar for papers (cached and rate-limited by the literature search service)."""
         try:
-            # Add delay to respect rate limits (Semantic Scholar allows ~100 requests/5 minutes)
-            time.sleep(2)  # 2 second delay between requests
-            
-            params = {
-                "query": query,
-                "limit": max_results,
-                "fields": "title,authors,year,abstract,citationCount,venue,externalIds,url"
-            }
-            
-            headers = {
-                "User-Agent": "Academic-Citation-Tool/1.0 (research-tool; contact@example.com)"
-            }
-            
-            response = requests.get(
-                self.semantic_scholar_base_url, 
-                params=params, 
-                headers=headers,
-                timeout=30
+            data = get_literature_search().search_semantic_scholar(
+                query,
+                limit=max_results,
+                fields="title,authors,year,abstract,citationCount,venue,externalIds,url"
             )
             
-            if response.status_code == 429:
-                print("Warning: Semantic Scholar rate limit hit, waiting and retrying...")
-                time.sleep(10)  # Wait 10 seconds before retry
-                response = requests.get(
-                    self.semantic_scholar_base_url, 
-                    params=params, 
-                    headers=headers,
-                    timeout=30
-                )
-            
-            response.raise_for_status()
-            data = response.json()
-            
             return self._parse_semantic_scholar_response(data)
             
         except requests.exceptions.HTTPError as e:
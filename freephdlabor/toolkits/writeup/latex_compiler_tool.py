@@ -69,7 +69,8 @@ class LaTeXCompilerTool(Tool):
         # Initialize citation search tool for automated resolution
         try:
             from .citation_search_tool import CitationSearchTool
-            self.citation_search_tool = CitationSearchTool()
+            from ..tool_registry import shared_tool
+            self.citation_search_tool = shared_tool(CitationSearchTool)
         except ImportError:
             self.citation_search_tool = None
         
@@ -264,68 +265,36 @@ class LaTeXCompilerTool(Tool):
 
         return files_to_process
 
-    def _search_citation_with_retry(self, description: str, max_attempts: int = 5) -> Optional[Dict[str, Any]]:
+    def _search_citation(self, description: str) -> Optional[Dict[str, Any]]:
         """
-        Search for citation with retry logic for transient failures.
+        Search for the best-matching citation for a [CITE:...] description.
 
-        Semantic Scholar API often returns 500 Internal Server Errors which are
-        transient. This method retries with exponential backoff to handle these
-        temporary failures, significantly improving citation resolution success rate.
+        Transient API failures are retried by the shared HTTP session and results
+        are cached by the literature search service, so repeated descriptions
+        (across files, compilations and agents) cost no further API calls.
 
         Args:
             description: Citation description to search for
-            max_attempts: Maximum number of retry attempts (default: 5)
 
         Returns:
-            Citation dict if found, None if all attempts fail
+            Citation dict if found, None otherwise
         """
-        import time
         import json
 
         if not self.citation_search_tool:
             return None
 
-        for attempt in range(max_attempts):
-            try:
-                search_result = self.citation_search_tool.forward(
-                    search_query=description,
-                    max_results=1,
-                    search_source="both"
-                )
-
-                # Parse search result
-                if search_result and '"success": true' in search_result.lower():
-                    result_data = json.loads(search_result)
-                    if result_data.get('citations'):
-                        return result_data['citations'][0]
-
-                # No results found - not a transient error, return None
-                return None
-
-            except Exception as e:
-                error_str = str(e).lower()
-                is_transient = (
-                    '500' in error_str or
-                    'internal server error' in error_str or
-                    'timeout' in error_str or
-                    'connection' in error_str or
-                    '503' in error_str
-                )
-
-                if is_transient and attempt < max_attempts - 1:
-                    # Exponential backoff: 2, 4, 8, 16, 32 seconds
-                    wait_time = 2 ** (attempt + 1)
-                    print(f"Warning: Citation search for '{description}' failed (attempt {attempt + 1}/{max_attempts}): {e}")
-                    print(f"         Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    # Non-transient error or final attempt failed
-                    if attempt == max_attempts - 1:
-                        print(f"Warning: Citation search for '{description}' failed after {max_attempts} attempts: {e}")
-                    return None
-
-        return None
+        try:
+            search_result = self.citation_search_tool.forward(
+                search_query=description,
+                max_results=1,
+                search_source="both"
+            )
+            citations = json.loads(search_result).get('citations') if search_result else None
+            return citations[0] if citations else None
+        except Exception as e:
+            print(f"Warning: Citation search for '{description}' failed: {e}")
+            return None
 
     def _resolve_citations_in_file(self, file_path: str, existing_citations: dict, references_bib_path: str) -> tuple[bool, List[str]]:
         """Resolve [CITE:...] tokens in a single file."""
@@ -364,8 +333,8 @@ class LaTeXCompilerTool(Tool):
                         fixes_applied.append(f"resolved '{description}' to existing citation '{existing_key}'")
                         changes_made = True
                     else:
-                        # Search for new citation with retry logic for transient failures
-                        citation = self._search_citation_with_retry(description, max_attempts=5)
+                        # Search for new citation
+                        citation = self._search_citation(description)
 
                         if citation:
                             # Successfully found citation
@@ -385,9 +354,9 @@ class LaTeXCompilerTool(Tool):
                                 fixes_applied.append(f"removed citation token '{description}' (failed to add to bib)")
                                 changes_made = True
                         else:
-                            # No citation found after all retries, remove token
+                            # No citation found, remove token
                             content = content[:match.start()] + content[match.end():]
-                            fixes_applied.append(f"removed citation token '{description}' (not found after retries)")
+                            fixes_applied.append(f"removed citation token '{description}' (not found)")
                             changes_made = True
 
                 if not changes_made:
@@ -655,9 +624,8 @@ class LaTeXCompilerTool(Tool):
         raw_latex_output = []  # Collect full pdflatex output for debugging
 
         try:
-            # Change to directory containing tex file
-            original_dir = os.getcwd()
-            os.chdir(tex_dir)
+            # Run the compiler passes from the directory containing the tex file
+            # (via cwd=, not os.chdir: the working directory is shared by all threads)
 
             # Find executables
             pdflatex_path = self._find_pdflatex_path()
@@ -692,7 +660,8 @@ class LaTeXCompilerTool(Tool):
                 capture_output=True,
                 text=True,
                 timeout=120,
-                env=env
+                env=env,
+                cwd=tex_dir
             )
 
             if result1.returncode != 0:
@@ -718,7 +687,8 @@ class LaTeXCompilerTool(Tool):
                     capture_output=True,
                     text=True,
                     timeout=60,
-                    env=env
+                    env=env,
+                    cwd=tex_dir
                 )
 
                 if result_bibtex.returncode != 0:
@@ -737,7 +707,8 @@ class LaTeXCompilerTool(Tool):
                     capture_output=True,
                     text=True,
                     timeout=120,
-                    env=env
+                    env=env,
+                    cwd=tex_dir
                 )
 
                 if result2.returncode != 0:
@@ -762,7 +733,8 @@ class LaTeXCompilerTool(Tool):
                     capture_output=True,
                     text=True,
                     timeout=120,
-                    env=env
+                    env=env,
+                    cwd=tex_dir
                 )
 
                 if result3.returncode != 0:
@@ -819,8 +791,6 @@ class LaTeXCompilerTool(Tool):
                 "log": log,
                 "raw_latex_log": "\n\n".join(raw_latex_output)
             }
-        finally:
-            os.chdir(original_dir)
     
     def _parse_latex_errors(self, output: str) -> List[str]:
         """Parse LaTeX compiler output for errors."""
@@ -24,6 +24,8 @@ import os
 from typing import Dict, Any, List, Optional
 from smolagents import Tool, ChatMessage
 
+from ...interpreters.virtual_cwd import current_cwd
+
 # No need to import LLM functions - model is passed to constructor
 
 
@@ -129,7 +131,7 @@ class LaTeXGeneratorTool(Tool):
         from ..model_utils import get_raw_model
         self.model = get_raw_model(model)
         # Convert to absolute path to prevent nested directory issues
-        self.working_dir = os.path.abspath(working_dir or os.getcwd())
+        self.working_dir = os.path.abspath(working_dir or current_cwd())
         # Load available citations from references.bib
         self.available_citations = self._load_citations()
     
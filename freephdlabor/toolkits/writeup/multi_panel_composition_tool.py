@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional, Union, Tuple
 from smolagents import Tool
 
+from ...interpreters.virtual_cwd import current_cwd
+
 # Handle matplotlib import with fallback
 try:
     import matplotlib
@@ -180,7 +182,7 @@ class MultiPanelCompositionTool(Tool):
             if self.working_dir:
                 output_dir = os.path.join(self.working_dir, "paper_workspace", "figures")
             else:
-                output_dir = os.path.join(os.getcwd(), "paper_workspace", "figures")
+                output_dir = os.path.join(current_cwd(), "paper_workspace", "figures")
             os.makedirs(output_dir, exist_ok=True)
             
             # Setup plotting style
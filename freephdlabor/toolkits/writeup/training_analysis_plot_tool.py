@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional, Union
 from smolagents import Tool
 
+from ...interpreters.virtual_cwd import current_cwd
+
 # Handle matplotlib import with fallback
 try:
     import matplotlib
@@ -148,7 +150,7 @@ class TrainingAnalysisPlotTool(Tool):
             if self.working_dir:
                 output_dir = os.path.join(self.working_dir, "paper_workspace", "figures")
             else:
-                output_dir = os.path.join(os.getcwd(), "paper_workspace", "figures")
+                output_dir = os.path.join(current_cwd(), "paper_workspace", "figures")
             os.makedirs(output_dir, exist_ok=True)
             
             # Setup plotting style
@@ -13,6 +13,7 @@ This tool provides comprehensive visual analysis including:
 Uses the VLM functionality from freephdlabor.llm for image and document analysis.
 """
 
+import importlib.util
 import json
 import os
 import re
@@ -22,12 +23,9 @@ from smolagents import Tool
 
 from ...llm import get_response_from_vlm, create_vlm_client
 
-# Try to import PyMuPDF for PDF processing
-try:
-    import fitz  # PyMuPDF
-    PYMUPDF_AVAILABLE = True
-except ImportError:
-    PYMUPDF_AVAILABLE = False
+# PyMuPDF is only needed for PDF analysis; check for it without importing it
+# (imported in _extract_pdf_content) to keep agent startup fast
+PYMUPDF_AVAILABLE = importlib.util.find_spec("fitz") is not None
 
 
 class VLMDocumentAnalysisTool(Tool):
@@ -341,6 +339,8 @@ class VLMDocumentAnalysisTool(Tool):
     
     def _extract_pdf_content(self, pdf_path: str) -> Dict[str, Any]:
         """Extract text and images from PDF using PyMuPDF."""
+        import fitz  # PyMuPDF
+
         doc = fitz.open(pdf_path)
         full_text = ""
         images = []
@@ -200,15 +200,34 @@ def create_model(model_name, reasoning_effort="medium", verbosity="medium", budg
             context_limit=context_limit,
         )
 
-from freephdlabor.agents.manager_agent import ManagerAgent
-from freephdlabor.agents.ideation_agent import IdeationAgent
-from freephdlabor.agents.experimentation_agent import ExperimentationAgent
-from freephdlabor.agents.writeup_agent import WriteupAgent
-from freephdlabor.interpreters import WorkspacePythonExecutor
-from freephdlabor.agents.reviewer_agent import ReviewerAgent
-from freephdlabor.agents.proofreading_agent import ProofreadingAgent
+RESOURCE_PREPARATION_AGENT_DESCRIPTION = """A comprehensive resource organization agent that prepares complete experimental documentation for WriteupAgent.
 
-def initialize_agent_system(model, workspace_dir, workspace_interpreter, essential_imports, enable_planning=False, planning_interval=3, interrupt_callback=None):
+Key Functions: Locates experiment results folders, creates writeup_subspace/ workspace, links experiment data using symlinks/copies, generates complete file structure analysis with descriptions of EVERY file found, creates comprehensive bibliography based on full experimental understanding.
+
+Key Tools: ExperimentLinkerTool, CitationSearchTool, VLMDocumentAnalysisTool, file editing tools.
+
+Approach: Comprehensive documentation of all experimental artifacts without selectivity. Creates complete file tree structure, reads actual content of every file (VLM for images), and provides complete resource inventory. WriteupAgent can then selectively choose what to use from the comprehensive documentation."""
+
+# Specialist agents managed by the ManagerAgent: (name, module, class, description).
+# Modules are imported only when the agent is built, so their toolkits (VLM,
+# LaTeX, plotting, ...) stay unloaded until the agent is first needed.
+SPECIALIST_AGENTS = [
+    ("ideation_agent", "freephdlabor.agents.ideation_agent", "IdeationAgent",
+     "A specialist agent for generating, refining, and evaluating research ideas."),
+    ("experimentation_agent", "freephdlabor.agents.experimentation_agent", "ExperimentationAgent",
+     "A specialist agent for running experiments and analyzing results using RunExperimentTool."),
+    ("resource_preparation_agent", "freephdlabor.agents.resource_preparation_agent", "ResourcePreparationAgent",
+     RESOURCE_PREPARATION_AGENT_DESCRIPTION),
+    ("writeup_agent", "freephdlabor.agents.writeup_agent", "WriteupAgent",
+     "A SPECIALIZED agent for LaTeX writing and compilation that expects pre-organized resources from ResourcePreparationAgent."),
+    ("reviewer_agent", "freephdlabor.agents.reviewer_agent", "ReviewerAgent",
+     "A specialist agent for peer-reviewing AI research paper."),
+    ("proofreading_agent", "freephdlabor.agents.proofreading_agent", "ProofreadingAgent",
+     "A specialist agent for proofreading and quality assurance of LaTeX files in academic papers."),
+]
+
+
+def initialize_agent_system(model, workspace_dir, workspace_interpreter, essential_imports, enable_planning=False, planning_interval=3, interrupt_callback=None, lazy_agents=True):
     """
     Initialize the complete multi-agent system with consistent configuration.
 
@@ -223,10 +242,16 @@ def initialize_agent_system(model, workspace_dir, workspace_interpreter, essenti
         enable_planning: Enable planning feature for research agents
         planning_interval: Interval for planning steps (e.g., 3 = replan every 3 steps)
         interrupt_callback: Setup Interrupt Callback
+        lazy_agents: Build each specialist agent (and import its toolkits) on first
+            delegation instead of up front, so the manager starts working sooner
 
     Returns:
-        ManagerAgent: Configured with pre-initialized specialist agents
+        ManagerAgent: Configured with the specialist agents (or lazy proxies for them)
     """
+    import importlib
+    from freephdlabor.agents.lazy_agent import LazyAgent
+    from freephdlabor.agents.manager_agent import ManagerAgent
+
     print("🔧 Initializing multi-agent system...")
 
     # Determine planning configuration
@@ -235,84 +260,33 @@ def initialize_agent_system(model, workspace_dir, workspace_interpreter, essenti
         planning_config = {"planning_interval": planning_interval}
         print(f"📋 Planning enabled: agents will replan every {planning_interval} steps")
 
-    # Create all agents with workspace-aware configuration
-    # Each agent overrides create_python_executor() to use WorkspacePythonExecutor
-    ideation_agent = IdeationAgent(
-        model=model,
-        workspace_dir=workspace_dir,
-        name="ideation_agent",
-        description="A specialist agent for generating, refining, and evaluating research ideas.",
-        additional_authorized_imports=essential_imports,
-        step_callbacks=[interrupt_callback],
-        **planning_config
-    )
-    print("✅ IdeationAgent initialized")
-    
-    experimentation_agent = ExperimentationAgent(
-        model=model,
-        workspace_dir=workspace_dir,
-        name="experimentation_agent",
-        description="A specialist agent for running experiments and analyzing results using RunExperimentTool.",
-        additional_authorized_imports=essential_imports,
-        step_callbacks=[interrupt_callback],
-        **planning_config
-    )
-    print("✅ ExperimentationAgent initialized")
-
-    # Initialize ResourcePreparationAgent (NEW - handles heavy preparatory work)
-    from freephdlabor.agents.resource_preparation_agent import ResourcePreparationAgent
-    resource_preparation_agent = ResourcePreparationAgent(
-        model=model,
-        workspace_dir=workspace_dir,
-        name="resource_preparation_agent",
-        description="""A comprehensive resource organization agent that prepares complete experimental documentation for WriteupAgent.
-
-Key Functions: Locates experiment results folders, creates writeup_subspace/ workspace, links experiment data using symlinks/copies, generates complete file structure analysis with descriptions of EVERY file found, creates comprehensive bibliography based on full experimental understanding.
-
-Key Tools: ExperimentLinkerTool, CitationSearchTool, VLMDocumentAnalysisTool, file editing tools.
-
-Approach: Comprehensive documentation of all experimental artifacts without selectivity. Creates complete file tree structure, reads actual content of every file (VLM for images), and provides complete resource inventory. WriteupAgent can then selectively choose what to use from the comprehensive documentation.""",
-        additional_authorized_imports=essential_imports,
-        step_callbacks=[interrupt_callback],
-        **planning_config
-    )
-    print("✅ ResourcePreparationAgent initialized")
-
-    writeup_agent = WriteupAgent(
-        model=model,
-        workspace_dir=workspace_dir,
-        name="writeup_agent",
-        description="A SPECIALIZED agent for LaTeX writing and compilation that expects pre-organized resources from ResourcePreparationAgent.",
-        additional_authorized_imports=essential_imports,
-        step_callbacks=[interrupt_callback],
-        **planning_config
-    )
-    print("✅ WriteupAgent initialized")
-
-    reviewer_agent = ReviewerAgent(
-        model=model,
-        workspace_dir=workspace_dir,
-        name="reviewer_agent",
-        description="A specialist agent for peer-reviewing AI research paper.",
-        additional_authorized_imports=essential_imports,
-        step_callbacks=[interrupt_callback],
-        **planning_config
-    )
-    print("✅ Reviewer initialized")
+    def agent_factory(name, module_name, class_name, description):
+        def build():
+            agent_class = getattr(importlib.import_module(module_name), class_name)
+            # Each agent overrides create_python_executor() to use WorkspacePythonExecutor
+            return agent_class(
+                model=model,
+                workspace_dir=workspace_dir,
+                name=name,
+                description=description,
+                additional_authorized_imports=essential_imports,
+                step_callbacks=[interrupt_callback],
+                **planning_config
+            )
+        return build
 
-    proofreading_agent = ProofreadingAgent(
-        model=model,
-        workspace_dir=workspace_dir,
-        name="proofreading_agent",
-        description="A specialist agent for proofreading and quality assurance of LaTeX files in academic papers.",
-        additional_authorized_imports=essential_imports,
-        step_callbacks=[interrupt_callback],
-        **planning_config
-    )
-    print("✅ ProofreadingAgent initialized")
+    managed_agents = []
+    for name, module_name, class_name, description in SPECIALIST_AGENTS:
+        build = agent_factory(name, module_name, class_name, description)
+        if lazy_agents:
+            managed_agents.append(LazyAgent(name, description, build))
+        else:
+            managed_agents.append(build())
+            print(f"✅ {class_name} initialized")
+    if lazy_agents:
+        print(f"⏳ Specialist agents will be built on first delegation: {', '.join(a.name for a in managed_agents)}")
 
-    # Create ManagerAgent with pre-initialized agents (including NEW ResourcePreparationAgent)
-    managed_agents = [ideation_agent, experimentation_agent, resource_preparation_agent, writeup_agent, reviewer_agent, proofreading_agent]
+    # Create ManagerAgent with the specialist agents
     manager = ManagerAgent(
         model=model,
         interpreter=workspace_interpreter,
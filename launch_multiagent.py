@@ -119,6 +119,10 @@ def main():
         os.environ['RUN_EXPERIMENT_VLM_MODEL'] = exp_config.get('vlm_model', 'gpt-5')
         os.environ['RUN_EXPERIMENT_REPORT_MODEL'] = exp_config.get('report_model', 'gpt-5')
         os.environ['RUN_EXPERIMENT_REASONING_EFFORT'] = exp_config.get('reasoning_effort', 'high')
+        if exp_config.get('llm_cache_dir'):
+            os.environ['RUN_EXPERIMENT_LLM_CACHE_DIR'] = os.path.abspath(exp_config['llm_cache_dir'])
+            os.environ['RUN_EXPERIMENT_LLM_CACHE_MODE'] = exp_config.get('llm_cache_mode', 'deterministic')
+            os.environ['RUN_EXPERIMENT_LLM_CACHE_MAX_MB'] = str(exp_config.get('llm_cache_max_mb', 512))
         print(f"🔬 RunExperimentTool config: {exp_config.get('code_model', 'gpt-5')} with reasoning_effort={exp_config.get('reasoning_effort', 'high')}")
 
     # Handle resume mode or create new workspace
@@ -166,6 +170,7 @@ def main():
     print(f"📝 Task: {task[:100]}{'...' if len(task) > 100 else ''}")
 
     # Create the ManagerAgent
+    manager = None
     try:
         # Essential imports for tool-centric agents (no direct ML library access)
         essential_imports = [
@@ -198,7 +203,8 @@ def main():
             essential_imports=essential_imports,
             enable_planning=args.enable_planning,
             planning_interval=args.planning_interval,
-            interrupt_callback=interrupt_callback
+            interrupt_callback=interrupt_callback,
+            lazy_agents=not args.eager_agents
         )
         
         print("\n" + "=" * 50)
@@ -223,6 +229,11 @@ def main():
         traceback.print_exc()
         return 1
 
+    finally:
+        # Dispatched agent tasks that were never gathered must not start after the run
+        if manager is not None:
+            manager.dispatcher.shutdown()
+
     return 0
 
 